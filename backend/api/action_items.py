@@ -2,13 +2,18 @@
 Action Items API endpoints
 Track action items from client meetings
 """
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from typing import Dict, Optional
 from pydantic import BaseModel
+from api.etag import conditional_get
+from api.ndjson import ndjson_response, wants_ndjson
+from api.responses import FastJSONRoute
 from db.adapters.action_items import ActionItemAdapter
+from db.projection import parse_fields
+from db.transcode import render_list, transcoding_enabled
 from services.auth import verify_token
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 class ActionItemCreate(BaseModel):
@@ -33,37 +38,61 @@ class ActionItemUpdate(BaseModel):
     notes: Optional[str] = None
 
 
-@router.get("/")
+@router.get("/", dependencies=[Depends(conditional_get('action-items'))])
 async def get_all_action_items(
+    request: Request,
     status: Optional[str] = None,
     responsible_party: Optional[str] = None,
     meeting_id: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     token: Dict = Depends(verify_token)
 ):
-    """Get all action items with optional filtering (requires authentication)"""
+    """
+    Get all action items with optional filtering (requires authentication)
+    Pass limit (and the previous response's next_cursor) to page through results
+    (pages come in table order; only unpaged results are sorted)
+    Pass fields=title,status to return only those attributes (plus id)
+    Send Accept: application/x-ndjson to stream one item per line as pages arrive
+    """
     adapter = ActionItemAdapter()
-
-    # Filter by specific criteria if provided
-    if status:
-        action_items = await adapter.get_by_status(status)
-    elif responsible_party:
-        action_items = await adapter.get_by_responsible_party(responsible_party)
-    elif meeting_id:
-        action_items = await adapter.get_by_meeting_id(meeting_id)
+    selected = parse_fields(fields)
+    next_cursor = None
+
+    # Filter by specific criteria if provided (the planner picks the matching index)
+    filters = {
+        'status': status,
+        'responsible_party': responsible_party,
+        'meeting_id': meeting_id
+    }
+    if wants_ndjson(request) and not (limit or cursor):
+        return ndjson_response(adapter.iter_all(fields=selected, **filters))
+    if limit or cursor:
+        action_items, next_cursor = await adapter.get_page(limit, cursor, fields=selected, **filters)
+    elif transcoding_enabled() and not any(v is not None for v in filters.values()):
+        # Unfiltered full listing: encode straight from the wire format
+        items = await adapter.get_all_raw(fields=selected)
+        return Response(render_list("action_items", items), media_type="application/json")
     else:
-        action_items = await adapter.get_all()
+        action_items = await adapter.find(fields=selected, **filters)
 
     return {
         "action_items": action_items,
-        "total": len(action_items)
+        "total": len(action_items),
+        "next_cursor": next_cursor
     }
 
 
-@router.get("/{action_item_id}")
-async def get_action_item(action_item_id: int, token: Dict = Depends(verify_token)):
+@router.get("/{action_item_id}", dependencies=[Depends(conditional_get('action-items'))])
+async def get_action_item(
+    action_item_id: int,
+    fields: Optional[str] = None,
+    token: Dict = Depends(verify_token)
+):
     """Get specific action item details (requires authentication)"""
     adapter = ActionItemAdapter()
-    action_item = await adapter.get_by_id(action_item_id)
+    action_item = await adapter.get_by_id(action_item_id, fields=parse_fields(fields))
 
     if not action_item:
         raise HTTPException(status_code=404, detail="Action item not found")
@@ -80,8 +109,7 @@ async def create_action_item(
     adapter = ActionItemAdapter()
 
     # Get next ID
-    all_items = await adapter.get_all()
-    next_id = max([item['id'] for item in all_items], default=0) + 1
+    next_id = await adapter.next_id()
 
     # Create action item
     new_item = {
@@ -115,11 +143,6 @@ async def update_action_item(
     """Update action item (requires authentication)"""
     adapter = ActionItemAdapter()
 
-    # Check if action item exists
-    existing = await adapter.get_by_id(action_item_id)
-    if not existing:
-        raise HTTPException(status_code=404, detail="Action item not found")
-
     # Build updates dict from non-None fields
     updates = {}
     if update.title is not None:
@@ -151,11 +174,6 @@ async def delete_action_item(action_item_id: int, token: Dict = Depends(verify_t
     """Delete an action item (requires authentication)"""
     adapter = ActionItemAdapter()
 
-    # Check if action item exists
-    existing = await adapter.get_by_id(action_item_id)
-    if not existing:
-        raise HTTPException(status_code=404, detail="Action item not found")
-
     success = await adapter.delete(action_item_id)
 
     if not success:
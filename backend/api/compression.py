@@ -0,0 +1,222 @@
+"""
+Response compression middleware
+Negotiates Accept-Encoding (zstd, br, gzip), skips small bodies, reuses compressed bytes for
+responses with an ETag, and compresses streamed NDJSON chunk by chunk
+
+brotli and zstandard are used when installed; gzip is always available.
+"""
+import gzip
+import hashlib
+import os
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from db.cache import LRUTTLCache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional
+    zstandard = None
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/')
+
+
+class _GzipStream:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, chunk: bytes) -> bytes:
+        # Sync flush so each NDJSON chunk reaches the client right away
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliStream:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdStream:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+def available_codecs() -> Dict[str, Tuple[Callable[[bytes], bytes], Callable[[], object]]]:
+    """Available encodings: name -> (one-shot compress, streaming compressor factory)"""
+    gzip_level = int(os.environ.get('COMPRESSION_GZIP_LEVEL', '6'))
+    codecs = {
+        'gzip': (lambda body: gzip.compress(body, gzip_level, mtime=0), lambda: _GzipStream(gzip_level)),
+    }
+    if brotli is not None:
+        quality = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', '5'))
+        codecs['br'] = (lambda body: brotli.compress(body, quality=quality), lambda: _BrotliStream(quality))
+    if zstandard is not None:
+        level = int(os.environ.get('COMPRESSION_ZSTD_LEVEL', '3'))
+        codecs['zstd'] = (lambda body: zstandard.ZstdCompressor(level=level).compress(body), lambda: _ZstdStream(level))
+    return codecs
+
+
+# Server preference when the client weights encodings equally
+PREFERENCE = ('zstd', 'br', 'gzip')
+
+
+def negotiate(accept_encoding: str, available: List[str]) -> Optional[str]:
+    """Pick the best encoding the client accepts (q > 0), or None for identity"""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(','):
+        name, _, params = part.strip().partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            weights[name.strip()] = q
+
+    candidates = [
+        (weights.get(name, weights.get('*', 0.0)), -PREFERENCE.index(name), name)
+        for name in PREFERENCE if name in available
+    ]
+    best = max(candidates, default=None)
+    return best[2] if best and best[0] > 0 else None
+
+
+class CompressionMiddleware:
+    """
+    Compress JSON/NDJSON/text responses according to Accept-Encoding
+
+    Bodies under COMPRESSION_MIN_BYTES are sent as-is. Compressed bytes for
+    responses carrying an ETag are cached, keyed by ETag, encoding and a digest
+    of the body actually sent (one ETag can label bodies from instances that
+    had not caught up yet), so a repeated poll that isn't a 304 only pays for
+    serialization and hashing. Compressed responses get a weak ETag, which
+    If-None-Match still matches.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.codecs = available_codecs()
+        self.minimum_size = int(os.environ.get('COMPRESSION_MIN_BYTES', '1024'))
+        self.cache = LRUTTLCache(
+            'compressed-responses',
+            maxsize=int(os.environ.get('COMPRESSION_CACHE_SIZE', '256')),
+            ttl=float(os.environ.get('COMPRESSION_CACHE_TTL', '300'))
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get('accept-encoding', ''), list(self.codecs))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _Responder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _Responder:
+    """Per-request send wrapper: decides after seeing the headers and first body chunk"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start: Optional[Message] = None
+        self.stream = None
+        self.passthrough = False
+
+    @staticmethod
+    def _compressible(status: int, headers: MutableHeaders) -> bool:
+        if status < 200 or status in (204, 304):
+            return False
+        if 'content-encoding' in headers:
+            return False
+        return headers.get('content-type', '').startswith(COMPRESSIBLE_TYPES)
+
+    def _mark_encoded(self, headers: MutableHeaders) -> None:
+        headers['Content-Encoding'] = self.encoding
+        headers.add_vary_header('Accept-Encoding')
+        etag = headers.get('etag')
+        if etag and not etag.startswith('W/'):
+            headers['ETag'] = 'W/' + etag
+
+    async def send(self, message: Message) -> None:
+        if message['type'] == 'http.response.start':
+            self.start = message
+            return
+
+        if message['type'] != 'http.response.body' or self.passthrough:
+            await self._send(message)
+            return
+
+        if self.stream is not None:
+            chunk = self.stream.compress(message.get('body', b''))
+            if not message.get('more_body', False):
+                chunk += self.stream.finish()
+            await self._send({'type': 'http.response.body', 'body': chunk, 'more_body': message.get('more_body', False)})
+            return
+
+        # First body message: decide how to send this response
+        start, self.start = self.start, None
+        headers = MutableHeaders(raw=start['headers'])
+        body = message.get('body', b'')
+        more_body = message.get('more_body', False)
+        compressible = self._compressible(start['status'], headers)
+
+        if not compressible or (not more_body and len(body) < self.middleware.minimum_size):
+            if compressible:
+                headers.add_vary_header('Accept-Encoding')
+            self.passthrough = True
+            await self._send(start)
+            await self._send(message)
+            return
+
+        compress, make_stream = self.middleware.codecs[self.encoding]
+        if more_body:
+            # Streaming (NDJSON): compress each chunk as it is produced
+            self.stream = make_stream()
+            del headers['content-length']
+            self._mark_encoded(headers)
+            await self._send(start)
+            await self._send({'type': 'http.response.body', 'body': self.stream.compress(body), 'more_body': True})
+            return
+
+        etag = headers.get('etag')
+        key = None
+        if etag and start['status'] == 200:
+            key = (etag, self.encoding, hashlib.blake2b(body, digest_size=16).digest())
+        compressed = self.middleware.cache.get(key) if key else None
+        if compressed is None:
+            compressed = compress(body)
+            if key:
+                self.middleware.cache.set(key, compressed)
+
+        headers['Content-Length'] = str(len(compressed))
+        self._mark_encoded(headers)
+        await self._send(start)
+        await self._send({'type': 'http.response.body', 'body': compressed})
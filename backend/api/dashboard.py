@@ -1,113 +1,149 @@
 """
 Dashboard API endpoints
-Provides project overview, health, and key metrics
+Provides project overview, health, and key metrics in one round trip
 """
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from typing import Dict, Any
-from datetime import datetime
-from db.database import get_db
-from db.models import ProjectPhase, Deliverable, Metric
+import asyncio
+from fastapi import APIRouter, Depends, Query
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from api.etag import conditional_get
+from api.metrics import metric_key
+from api.responses import FastJSONRoute
+from db.adapters.action_items import ActionItemAdapter
+from db.adapters.deliverables import DeliverableAdapter
+from db.adapters.metrics import MetricAdapter
+from services.auth import verify_token
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
+OPEN_DELIVERABLE_STATUSES = ("NOT_STARTED", "IN_PROGRESS")
+OPEN_ACTION_ITEM_STATUSES = ("pending", "in_progress")
+ACTION_ITEM_FIELDS = ["title", "status", "priority", "responsible_party", "target_date", "updated_at"]
 
-@router.get("/")
-async def get_dashboard(db: AsyncSession = Depends(get_db)) -> Dict[str, Any]:
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse a stored ISO date/datetime; naive values are taken as UTC"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _current_phase(view: Dict[int, Dict[str, Any]]) -> Optional[int]:
+    """Earliest month with unfinished deliverables (the last month once everything is done)"""
+    months = sorted(month for month, phase in view.items() if phase['summary']['total'])
+    for month in months:
+        summary = view[month]['summary']
+        if summary['completed'] < summary['total']:
+            return month
+    return months[-1] if months else None
+
+
+def _project_health(completion_pct: float, days_remaining: int, overdue: int) -> str:
+    """ON_TRACK / AT_RISK / DELAYED from phase progress and overdue deliverables"""
+    if overdue or (completion_pct < 10 and days_remaining < 5):
+        return "DELAYED"
+    if completion_pct < 20 and days_remaining < 10:
+        return "AT_RISK"
+    return "ON_TRACK"
+
+
+def _last_updated(records: List[Dict[str, Any]], today: datetime) -> str:
+    """Latest updated_at among the records shown (start of today if none), so it only moves with the data"""
+    stamps = [_parse_date(record.get('updated_at')) for record in records]
+    return max((stamp for stamp in stamps if stamp), default=today).isoformat()
+
+
+async def _open_action_items() -> List[Dict[str, Any]]:
+    adapter = ActionItemAdapter()
+    by_status = await asyncio.gather(*[
+        adapter.find(fields=ACTION_ITEM_FIELDS, status=status) for status in OPEN_ACTION_ITEM_STATUSES
+    ])
+    return [item for items in by_status for item in items]
+
+
+@router.get("/", dependencies=[Depends(conditional_get('deliverables', 'metrics', 'action-items', daily=True))])
+async def get_dashboard(
+    action_items_limit: int = Query(5, ge=0, le=50),
+    token: Dict = Depends(verify_token)
+):
     """
-    Get main dashboard data including:
+    Get main dashboard data (requires authentication):
     - Project health
-    - Current phase
+    - Current phase and days remaining
     - Completion percentage
     - Key metrics
     - Next milestone
+    - Open action items (soonest target date first, up to action_items_limit)
     """
-    # Get current phase
-    result = await db.execute(
-        select(ProjectPhase)
-        .where(ProjectPhase.status == "IN_PROGRESS")
-        .order_by(ProjectPhase.phase_number)
+    view, metrics, action_items = await asyncio.gather(
+        DeliverableAdapter().get_view(),
+        MetricAdapter().get_all(),
+        _open_action_items()
     )
-    current_phase = result.scalars().first()
+    # The ETag only changes with the data and at UTC midnight, so everything
+    # date-relative below works on UTC dates rather than the current time
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
 
-    if not current_phase:
-        # Default to first phase if none in progress
-        result = await db.execute(
-            select(ProjectPhase).order_by(ProjectPhase.phase_number).limit(1)
-        )
-        current_phase = result.scalars().first()
-
-    # Calculate days remaining
-    days_remaining = (current_phase.end_date - datetime.now()).days if current_phase else 0
-
-    # Get next milestone (earliest incomplete deliverable)
-    result = await db.execute(
-        select(Deliverable)
-        .where(Deliverable.status.in_(["NOT_STARTED", "IN_PROGRESS"]))
-        .order_by(Deliverable.due_date)
-        .limit(1)
-    )
-    next_milestone = result.scalars().first()
-
-    # Get key metrics
-    result = await db.execute(select(Metric))
-    all_metrics = result.scalars().all()
+    # Current phase and its progress come from the per-month rollups
+    phase = _current_phase(view)
+    summary = view[phase]['summary'] if phase else {}
+    completion_pct = summary.get('completion_percentage', 0)
+    phase_end = _parse_date(summary.get('latest_due_date'))
+    days_remaining = max(0, (phase_end.date() - today.date()).days) if phase_end else 0
 
-    metrics_dict = {}
-    for metric in all_metrics:
-        metrics_dict[metric.metric_name] = {
-            "current": float(metric.value),
-            "target": float(metric.target_value) if metric.target_value else 0,
-            "unit": metric.unit
-        }
+    # Next milestone: earliest-due unfinished deliverable
+    open_deliverables = [
+        (_parse_date(d.get('due_date')), d)
+        for phase_view in view.values() for d in phase_view['deliverables']
+        if d.get('status') in OPEN_DELIVERABLE_STATUSES
+    ]
+    open_deliverables.sort(key=lambda pair: (pair[0] is None, pair[0] or today))
+    next_milestone = open_deliverables[0][1] if open_deliverables else None
+    overdue = sum(1 for due, _ in open_deliverables if due and due.date() < today.date())
 
-    # Calculate overall project health
-    completion_pct = float(current_phase.completion_percentage) if current_phase else 0
-
-    if completion_pct < 20 and days_remaining < 10:
-        project_health = "AT_RISK"
-    elif completion_pct < 10 and days_remaining < 5:
-        project_health = "DELAYED"
-    else:
-        project_health = "ON_TRACK"
+    action_items.sort(key=lambda item: (item.get('target_date') or '9999', item.get('id', 0)))
 
     return {
-        "projectHealth": project_health,
-        "currentPhase": f"MONTH_{current_phase.phase_number}" if current_phase else "MONTH_1",
-        "daysRemaining": max(0, days_remaining),
+        "projectHealth": _project_health(completion_pct, days_remaining, overdue),
+        "currentPhase": f"MONTH_{phase or 1}",
+        "daysRemaining": days_remaining,
         "completionPercentage": completion_pct,
         "metrics": {
-            "drawingParsingAccuracy": metrics_dict.get("Drawing Parsing Accuracy", {}).get("current", 0),
-            "timeReductionAchieved": metrics_dict.get("Time Reduction", {}).get("current", 0),
-            "estimatorSatisfaction": metrics_dict.get("Estimator Satisfaction", {}).get("current", 0),
-            "estimatorEngagement": {
-                "activeUsers": 0,
-                "feedbackSubmitted": 0,
-                "lastActivityTime": None
+            metric_key(metric): {
+                "current": metric.get('current', 0),
+                "target": metric.get('target', 0),
+                "unit": metric.get('unit', '')
             }
+            for metric in metrics
         },
         "nextMilestone": {
-            "name": next_milestone.name if next_milestone else "No upcoming milestones",
-            "dueDate": next_milestone.due_date.isoformat() if next_milestone else None,
-            "status": next_milestone.status if next_milestone else "NOT_STARTED",
-            "blockers": next_milestone.blockers if next_milestone and next_milestone.blockers else []
+            "name": next_milestone.get('name') if next_milestone else "No upcoming milestones",
+            "dueDate": next_milestone.get('due_date') if next_milestone else None,
+            "status": next_milestone.get('status') if next_milestone else "NOT_STARTED",
+            "blockers": (next_milestone.get('blockers') or []) if next_milestone else []
+        },
+        "openActionItems": {
+            "total": len(action_items),
+            "highPriority": sum(1 for item in action_items if item.get('priority') == 'high'),
+            "items": action_items[:action_items_limit]
         },
-        "lastUpdated": datetime.utcnow().isoformat()
+        "lastUpdated": _last_updated(
+            [d for phase_view in view.values() for d in phase_view['deliverables']] + metrics + action_items,
+            today
+        )
     }
 
 
 @router.get("/overview")
-async def get_project_overview(db: AsyncSession = Depends(get_db)):
-    """Get high-level project overview from SOW"""
-    # Get project phases to determine start/end dates
-    result = await db.execute(
-        select(ProjectPhase).order_by(ProjectPhase.phase_number)
-    )
-    phases = result.scalars().all()
-
-    start_date = phases[0].start_date if phases else datetime(2025, 10, 14)
-    end_date = phases[-1].end_date if phases else datetime(2026, 1, 14)
+async def get_project_overview(token: Dict = Depends(verify_token)):
+    """Get high-level project overview from SOW (requires authentication)"""
+    # SOW dates; the portal has no phase table to derive them from
+    start_date = datetime(2025, 10, 14)
+    end_date = datetime(2026, 1, 14)
 
     return {
         "projectName": "AI-Native Estimation Assistant",
@@ -2,13 +2,16 @@
 Deliverables API endpoints
 Track project deliverables by month
 """
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Dict, Any
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import List, Dict, Optional
 from pydantic import BaseModel
-from db.adapters.deliverables import DeliverableAdapter
+from api.etag import conditional_get
+from api.responses import FastJSONRoute
+from db.adapters.deliverables import MONTHS, DeliverableAdapter
+from db.projection import parse_fields
 from services.auth import verify_token
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 class DeliverableUpdate(BaseModel):
@@ -19,19 +22,34 @@ class DeliverableUpdate(BaseModel):
     comments: str = ""
 
 
-@router.get("/")
-async def get_all_deliverables(token: Dict = Depends(verify_token)):
-    """Get all deliverables across all months (requires authentication)"""
+@router.get("/", dependencies=[Depends(conditional_get('deliverables'))])
+async def get_all_deliverables(
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    token: Dict = Depends(verify_token)
+):
+    """
+    Get all deliverables across all months (requires authentication)
+    Pass limit (and the previous response's next_cursor) to page through results
+    (pages come in table order; only unpaged results are sorted)
+    Pass fields=name,status to return only those attributes (plus id and month)
+    """
     adapter = DeliverableAdapter()
-    deliverables = await adapter.get_all()
+    # month is always needed for grouping
+    selected = parse_fields(fields)
+    if selected and 'month' not in selected:
+        selected.append('month')
+
+    if not (limit or cursor):
+        # Pre-grouped view: one read, no regrouping
+        view = await adapter.get_view(MONTHS, fields=selected)
+        return {f"month{month}": view[month]['deliverables'] for month in MONTHS}
+
+    deliverables, next_cursor = await adapter.get_page(limit, cursor, fields=selected)
 
     # Group by phase
-    by_month = {
-        "month1": [],
-        "month2": [],
-        "month3": [],
-        "month4": []
-    }
+    by_month = {f"month{month}": [] for month in MONTHS}
 
     for d in deliverables:
         month = d.get('month', 1)
@@ -39,29 +57,41 @@ async def get_all_deliverables(token: Dict = Depends(verify_token)):
         if month_key in by_month:
             by_month[month_key].append(d)
 
+    # Only paged requests carry a cursor; the unpaged view above stays month1..month4
+    by_month["next_cursor"] = next_cursor
+
     return by_month
 
 
-@router.get("/month/{month}")
-async def get_deliverables_by_month(month: int, token: Dict = Depends(verify_token)):
-    """Get deliverables for a specific phase (1-4) - requires authentication"""
-    if month not in [1, 2, 3, 4]:
+@router.get("/month/{month}", dependencies=[Depends(conditional_get('deliverables'))])
+async def get_deliverables_by_month(
+    month: int,
+    fields: Optional[str] = None,
+    token: Dict = Depends(verify_token)
+):
+    """Get deliverables and the completion rollup for a specific phase (1-4) - requires authentication"""
+    if month not in MONTHS:
         raise HTTPException(status_code=400, detail="Phase must be 1, 2, 3, or 4")
 
     adapter = DeliverableAdapter()
-    deliverables = await adapter.get_by_month(month)
+    view = await adapter.get_view([month], fields=parse_fields(fields))
 
     return {
         "month": month,
-        "deliverables": deliverables
+        "deliverables": view[month]['deliverables'],
+        "summary": view[month]['summary']
     }
 
 
-@router.get("/{deliverable_id}")
-async def get_deliverable(deliverable_id: int, token: Dict = Depends(verify_token)):
+@router.get("/{deliverable_id}", dependencies=[Depends(conditional_get('deliverables'))])
+async def get_deliverable(
+    deliverable_id: int,
+    fields: Optional[str] = None,
+    token: Dict = Depends(verify_token)
+):
     """Get specific deliverable details (requires authentication)"""
     adapter = DeliverableAdapter()
-    deliverable = await adapter.get_by_id(deliverable_id)
+    deliverable = await adapter.get_by_id(deliverable_id, fields=parse_fields(fields))
 
     if not deliverable:
         raise HTTPException(status_code=404, detail="Deliverable not found")
@@ -78,11 +108,6 @@ async def update_deliverable(
     """Update deliverable status and details (requires authentication)"""
     adapter = DeliverableAdapter()
 
-    # Check if deliverable exists
-    existing = await adapter.get_by_id(deliverable_id)
-    if not existing:
-        raise HTTPException(status_code=404, detail="Deliverable not found")
-
     # Update fields
     updates = {
         'status': update.status,
@@ -0,0 +1,67 @@
+"""
+Conditional GET support for polled endpoints
+Strong ETags derived from per-table version counters, so a matching If-None-Match is
+answered with 304 before any data is read
+"""
+import hashlib
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Dict
+from fastapi import Depends, HTTPException, Request, Response
+from db.versions import get_versions
+from services.auth import verify_token
+
+logger = logging.getLogger(__name__)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison, as RFC 9110 specifies for If-None-Match"""
+    if if_none_match.strip() == '*':
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return etag in (tag[2:] if tag.startswith('W/') else tag for tag in candidates)
+
+
+def make_etag(request: Request, versions: Dict[str, int]) -> str:
+    """ETag for this URL (and representation) at these table versions"""
+    parts = [
+        os.environ.get('ETAG_SALT', ''),
+        request.url.path,
+        request.url.query,
+        request.headers.get('accept', ''),
+        ",".join(f"{name}={versions[name]}" for name in sorted(versions)),
+    ]
+    return '"' + hashlib.sha256("|".join(parts).encode()).hexdigest()[:32] + '"'
+
+
+def conditional_get(*tables: str, daily: bool = False):
+    """
+    Dependency that tags a GET with an ETag and short-circuits with 304 when unchanged
+
+    tables are the version counter names (adapter cache names) the response is
+    built from. daily=True also changes the ETag at each UTC midnight, for
+    responses with date-relative fields (e.g. days remaining). Auth runs first,
+    so a 304 is never served to an unauthenticated client.
+
+    Usage:
+        @router.get("/", dependencies=[Depends(conditional_get('meetings'))])
+    """
+    async def dependency(request: Request, response: Response, token: Dict = Depends(verify_token)):
+        try:
+            versions = await get_versions(tables)
+        except Exception as e:
+            # No ETag is better than a wrong one
+            logger.warning(f"Skipping ETag for {request.url.path}: {e}")
+            return
+
+        if daily:
+            versions = {**versions, '@day': datetime.now(timezone.utc).toordinal()}
+        etag = make_etag(request, versions)
+        if etag_matches(request.headers.get('if-none-match', ''), etag):
+            raise HTTPException(status_code=304, headers={'ETag': etag})
+        response.headers['ETag'] = etag
+        # Let browsers keep the body but revalidate on every poll
+        response.headers['Cache-Control'] = 'private, no-cache'
+
+    return dependency
@@ -2,8 +2,12 @@
 Health check endpoints
 """
 from fastapi import APIRouter
+from api.responses import FastJSONRoute
+from db.cache import cache_stats
+from db.snapshot import snapshot_stats
+from services.auth import get_token_cache
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 @router.get("/health")
@@ -14,3 +18,13 @@ async def health_check():
         "service": "TurboTech Portal API",
         "version": "1.0.0"
     }
+
+
+@router.get("/health/cache")
+async def cache_health():
+    """Item cache hit/miss counters, table snapshot versions and token cache counters for this instance"""
+    return {
+        "caches": cache_stats(),
+        "snapshots": snapshot_stats(),
+        "tokens": get_token_cache().stats()
+    }
@@ -2,13 +2,18 @@
 Meetings API endpoints
 Track client meetings and summaries
 """
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from typing import List, Dict, Optional
 from pydantic import BaseModel
+from api.etag import conditional_get
+from api.ndjson import ndjson_response, wants_ndjson
+from api.responses import FastJSONRoute
 from db.adapters.meetings import MeetingAdapter
+from db.projection import parse_fields
+from db.transcode import render_list, transcoding_enabled
 from services.auth import verify_token
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 class MeetingCreate(BaseModel):
@@ -32,30 +37,55 @@ class MeetingUpdate(BaseModel):
     notes: Optional[str] = None
 
 
-@router.get("/")
+@router.get("/", dependencies=[Depends(conditional_get('meetings'))])
 async def get_all_meetings(
+    request: Request,
     meeting_date: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     token: Dict = Depends(verify_token)
 ):
-    """Get all meetings with optional date filtering (requires authentication)"""
+    """
+    Get all meetings with optional date filtering (requires authentication)
+    Pass limit (and the previous response's next_cursor) to page through results
+    (pages come in table order; only unpaged results are sorted)
+    Pass fields=title,meeting_date to return only those attributes (plus id)
+    Send Accept: application/x-ndjson to stream one item per line as pages arrive
+    """
     adapter = MeetingAdapter()
-
-    if meeting_date:
-        meetings = await adapter.get_by_date(meeting_date)
+    selected = parse_fields(fields)
+    next_cursor = None
+
+    if wants_ndjson(request) and not (limit or cursor):
+        return ndjson_response(adapter.iter_all(fields=selected, meeting_date=meeting_date))
+    if limit or cursor:
+        meetings, next_cursor = await adapter.get_page(limit, cursor, fields=selected, meeting_date=meeting_date)
+    elif meeting_date:
+        meetings = await adapter.get_by_date(meeting_date, fields=selected)
+    elif transcoding_enabled():
+        # Full listing: encode straight from the wire format
+        items = await adapter.get_all_raw(fields=selected)
+        return Response(render_list("meetings", items), media_type="application/json")
     else:
-        meetings = await adapter.get_all()
+        meetings = await adapter.get_all(fields=selected)
 
     return {
         "meetings": meetings,
-        "total": len(meetings)
+        "total": len(meetings),
+        "next_cursor": next_cursor
     }
 
 
-@router.get("/{meeting_id}")
-async def get_meeting(meeting_id: int, token: Dict = Depends(verify_token)):
+@router.get("/{meeting_id}", dependencies=[Depends(conditional_get('meetings'))])
+async def get_meeting(
+    meeting_id: int,
+    fields: Optional[str] = None,
+    token: Dict = Depends(verify_token)
+):
     """Get specific meeting details (requires authentication)"""
     adapter = MeetingAdapter()
-    meeting = await adapter.get_by_id(meeting_id)
+    meeting = await adapter.get_by_id(meeting_id, fields=parse_fields(fields))
 
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
@@ -72,8 +102,7 @@ async def create_meeting(
     adapter = MeetingAdapter()
 
     # Get next ID
-    all_meetings = await adapter.get_all()
-    next_id = max([m['id'] for m in all_meetings], default=0) + 1
+    next_id = await adapter.next_id()
 
     # Create meeting
     new_meeting = {
@@ -104,11 +133,6 @@ async def update_meeting(
     """Update meeting (requires authentication)"""
     adapter = MeetingAdapter()
 
-    # Check if meeting exists
-    existing = await adapter.get_by_id(meeting_id)
-    if not existing:
-        raise HTTPException(status_code=404, detail="Meeting not found")
-
     # Build updates dict from non-None fields
     updates = {}
     if update.title is not None:
@@ -140,11 +164,6 @@ async def delete_meeting(meeting_id: int, token: Dict = Depends(verify_token)):
     """Delete a meeting (requires authentication)"""
     adapter = MeetingAdapter()
 
-    # Check if meeting exists
-    existing = await adapter.get_by_id(meeting_id)
-    if not existing:
-        raise HTTPException(status_code=404, detail="Meeting not found")
-
     success = await adapter.delete(meeting_id)
 
     if not success:
@@ -2,13 +2,17 @@
 Metrics API endpoints
 Track and retrieve project metrics
 """
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Dict, Any
+from datetime import datetime, timedelta
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import Dict, Any, Optional
 from pydantic import BaseModel
+from api.etag import conditional_get
+from api.responses import FastJSONRoute
 from db.adapters.metrics import MetricAdapter
+from db.timeseries import utc_naive
 from services.auth import verify_token
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 class MetricRecord(BaseModel):
@@ -18,7 +22,14 @@ class MetricRecord(BaseModel):
     notes: str = ""
 
 
-@router.get("/")
+def metric_key(metric: Dict[str, Any]) -> str:
+    """camelCase key for a metric in API responses, from its name (or id)"""
+    name = metric.get('name', '')
+    key = name.replace(" ", "").replace("-", "")
+    return key[0].lower() + key[1:] if key else str(metric['id'])
+
+
+@router.get("/", dependencies=[Depends(conditional_get('metrics'))])
 async def get_all_metrics(token: Dict = Depends(verify_token)):
     """Get all current metrics (requires authentication)"""
     adapter = MetricAdapter()
@@ -27,11 +38,7 @@ async def get_all_metrics(token: Dict = Depends(verify_token)):
     # Format metrics for frontend (convert to dict by camelCase name)
     metrics_dict = {}
     for metric in metrics:
-        name = metric.get('name', '')
-        key = name.replace(" ", "").replace("-", "")
-        key = key[0].lower() + key[1:] if key else str(metric['id'])  # camelCase
-
-        metrics_dict[key] = {
+        metrics_dict[metric_key(metric)] = {
             "id": metric['id'],
             "name": metric.get('name'),
             "current": metric.get('current', 0),
@@ -45,34 +52,48 @@ async def get_all_metrics(token: Dict = Depends(verify_token)):
 
 
 @router.get("/history/{metric_name}")
-async def get_metric_history(metric_name: str, token: Dict = Depends(verify_token)):
-    """Get historical data for a specific metric (requires authentication)"""
-    # TODO: Implement time-series tracking in DynamoDB
+async def get_metric_history(
+    metric_name: str,
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    resolution: str = Query("auto", pattern="^(auto|raw|hour|day)$"),
+    token: Dict = Depends(verify_token)
+):
+    """
+    Get historical values for a metric (requires authentication)
+    metric_name is the metric's key from GET /api/metrics/ (or its name or id)
+    Pass from/to (ISO 8601, default: the last 30 days) and resolution=raw|hour|day;
+    the default, auto, reads the coarsest rollup that still charts the range
+    """
+    adapter = MetricAdapter()
+    metric = next(
+        (m for m in await adapter.get_all() if metric_name in (metric_key(m), m.get('name'), str(m['id']))),
+        None
+    )
+    if not metric:
+        raise HTTPException(status_code=404, detail="Metric not found")
+
+    end = utc_naive(end) if end else datetime.utcnow()
+    start = utc_naive(start) if start else end - timedelta(days=30)
+    history = await adapter.history(metric['id'], start, end, resolution)
+    points = history['points']
+
     return {
-        "metric": metric_name,
-        "data": [],
-        "timeline": []
+        "metric": metric_key(metric),
+        "resolution": history['resolution'],
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "data": [point['value'] if 'value' in point else point['avg'] for point in points],
+        "timeline": [point['timestamp'] for point in points],
+        "points": points
     }
 
 
 @router.post("/{metric_id}")
 async def update_metric(metric_id: int, metric: MetricRecord, token: Dict = Depends(verify_token)):
-    """Update a metric value (requires authentication)"""
+    """Record a new value for a metric; it becomes current and is added to its history (requires authentication)"""
     adapter = MetricAdapter()
-
-    # Check if metric exists
-    existing = await adapter.get_by_id(metric_id)
-    if not existing:
-        raise HTTPException(status_code=404, detail=f"Metric ID {metric_id} not found")
-
-    # Update the metric value
-    updates = {
-        'current': metric.value
-    }
-    if metric.notes:
-        updates['notes'] = metric.notes
-
-    updated = await adapter.update(metric_id, updates)
+    updated = await adapter.record(metric_id, metric.value, metric.notes)
 
     return {
         "recorded": True,
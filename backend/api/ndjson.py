@@ -0,0 +1,42 @@
+"""
+Newline-delimited JSON streaming for list endpoints
+Clients sending Accept: application/x-ndjson get one item per line, written as DynamoDB pages arrive
+"""
+import json
+from typing import Any, AsyncIterator, Dict, List
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+NDJSON = "application/x-ndjson"
+
+
+def wants_ndjson(request: Request) -> bool:
+    """True when the client asked for NDJSON"""
+    return NDJSON in request.headers.get('accept', '')
+
+
+def _json_default(obj):
+    # Number/string sets (e.g. read_by)
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+async def _lines(pages: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[bytes]:
+    async for items in pages:
+        if items:
+            yield "".join(
+                json.dumps(item, default=_json_default, ensure_ascii=False, separators=(',', ':')) + "\n"
+                for item in items
+            ).encode('utf-8')
+
+
+def ndjson_response(pages: AsyncIterator[List[Dict[str, Any]]]) -> StreamingResponse:
+    """
+    Stream pages of items as NDJSON (unsorted: items come in DynamoDB order)
+
+    Usage:
+        if wants_ndjson(request):
+            return ndjson_response(adapter.iter_all(fields=selected))
+    """
+    return StreamingResponse(_lines(pages), media_type=NDJSON)
@@ -0,0 +1,147 @@
+"""
+Pre-encoded JSON payloads for endpoints that serve editable content
+Each payload is serialized, hashed and compressed once per load instead of on every request
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+from fastapi import Request, Response
+from api.compression import available_codecs, negotiate
+from api.etag import etag_matches
+from api.responses import dumps
+
+logger = logging.getLogger(__name__)
+
+
+class PrecompiledPayload:
+    """
+    One response body, held as JSON bytes plus every compressed variant worth sending
+
+    Each variant is a different representation, so each gets its own strong ETag
+    (the identity one, or that one with -<encoding> appended).
+    """
+
+    def __init__(self, content: Any):
+        self.body = dumps(content)
+        self.digest = hashlib.sha256(self.body).hexdigest()[:32]
+        self.etag = self.etag_for(None)
+        self.encoded: Dict[str, bytes] = {}
+        if len(self.body) >= int(os.environ.get('COMPRESSION_MIN_BYTES', '1024')):
+            for encoding, (compress, _) in available_codecs().items():
+                data = compress(self.body)
+                if len(data) < len(self.body):
+                    self.encoded[encoding] = data
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        return f'"{self.digest}-{encoding}"' if encoding else f'"{self.digest}"'
+
+    def respond(self, request: Request, cache_control: str) -> Response:
+        """304, or the best pre-compressed variant the client accepts"""
+        encoding = negotiate(request.headers.get('accept-encoding', ''), list(self.encoded))
+        headers = {'ETag': self.etag_for(encoding), 'Cache-Control': cache_control, 'Vary': 'Accept-Encoding'}
+        if etag_matches(request.headers.get('if-none-match', ''), headers['ETag']):
+            return Response(status_code=304, headers=headers)
+
+        if encoding is None:
+            return Response(self.body, media_type='application/json', headers=headers)
+        headers['Content-Encoding'] = encoding
+        return Response(self.encoded[encoding], media_type='application/json', headers=headers)
+
+
+class PayloadFile:
+    """
+    JSON content compiled into named PrecompiledPayloads
+
+    build(data, updated_at) maps the parsed content to {name: content}. The packaged
+    file is the cold-start default. With `shared` set, the meta-table document of
+    that name (db/content.py, published with scripts/publish_content.py) replaces
+    it: every check_seconds the document's revision is polled and the payloads are
+    rebuilt when it changes, so every instance picks up new content without a
+    redeploy. Without a published document the file's mtime is polled instead,
+    which is useful in local development. check_seconds <= 0 disables polling.
+    Content that fails to load keeps the previous payloads in service.
+
+    Usage:
+        payloads = PayloadFile(path, build, check_seconds=30, shared='jerry')
+        return (await payloads.get('status')).respond(request, cache_control)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        build: Callable[[Dict[str, Any], str], Dict[str, Any]],
+        check_seconds: float,
+        shared: Optional[str] = None
+    ):
+        self.path = path
+        self.build = build
+        self.check_seconds = check_seconds
+        self.shared = shared
+        self.payloads: Dict[str, PrecompiledPayload] = {}
+        self.mtime: Optional[float] = None
+        self.revision: Optional[int] = None
+        self.checked_at = 0.0
+        self._lock = threading.Lock()
+        self._checking: Optional[asyncio.Lock] = None
+
+    def compile(self, data: Dict[str, Any], updated_at: str) -> Dict[str, PrecompiledPayload]:
+        """Payloads for parsed content (raises if build can't handle it)"""
+        return {name: PrecompiledPayload(content) for name, content in self.build(data, updated_at).items()}
+
+    def load(self) -> None:
+        """(Re)compile every payload from the packaged file"""
+        with self._lock:
+            mtime = os.stat(self.path).st_mtime
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            self.payloads = self.compile(data, datetime.fromtimestamp(mtime).isoformat())
+            self.mtime = mtime
+            self.revision = None
+        logger.info(f"Compiled {len(self.payloads)} payloads from {self.path}")
+
+    async def _load_shared(self) -> bool:
+        """Recompile from the published document if its revision changed; False if none is published"""
+        from db.content import get_content, get_content_revision
+
+        revision = await get_content_revision(self.shared)
+        if revision is None:
+            return False
+        if revision != self.revision:
+            content = await get_content(self.shared)
+            payloads = await asyncio.to_thread(self.compile, content['data'], content['updated_at'])
+            with self._lock:
+                self.payloads = payloads
+                self.revision = content['revision']
+            logger.info(f"Compiled {len(payloads)} payloads from '{self.shared}' revision {content['revision']}")
+        return True
+
+    async def _reload_if_changed(self) -> None:
+        if not self.payloads:
+            await asyncio.to_thread(self.load)
+            self.checked_at = 0.0
+        if self.check_seconds <= 0 or time.monotonic() - self.checked_at < self.check_seconds:
+            return
+        if self._checking is None:
+            self._checking = asyncio.Lock()
+        async with self._checking:
+            if time.monotonic() - self.checked_at < self.check_seconds:
+                return  # another request just checked
+            self.checked_at = time.monotonic()
+            try:
+                if self.shared and await self._load_shared():
+                    return
+                if self.revision is not None or os.stat(self.path).st_mtime != self.mtime:
+                    await asyncio.to_thread(self.load)
+            except Exception as e:
+                logger.error(f"Keeping previous payloads; failed to reload {self.shared or self.path}: {e}")
+
+    async def get(self, name: str) -> PrecompiledPayload:
+        """Current payload, reloading first if the content changed"""
+        await self._reload_if_changed()
+        return self.payloads[name]
@@ -0,0 +1,95 @@
+"""
+Fast JSON responses for the API
+Serializes with orjson and skips FastAPI's jsonable_encoder pass for routes without a response_model
+"""
+import functools
+import inspect
+import json
+from decimal import Decimal
+from typing import Any
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import JSONResponse, Response
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+_SUB_RESPONSE = '_fast_json_sub_response'
+
+
+def _default(obj: Any) -> Any:
+    """Types the adapters can emit beyond what orjson handles natively"""
+    if isinstance(obj, (set, frozenset)):
+        # read_by and other DynamoDB sets; sorted so identical data encodes identically
+        try:
+            return sorted(obj)
+        except TypeError:
+            return list(obj)
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode='json')
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content as compact UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (the app's default_response_class)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _respond_directly(endpoint, status_code):
+    signature = inspect.signature(endpoint)
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        # Headers/status set by dependencies on FastAPI's injected Response
+        sub_response = kwargs.pop(_SUB_RESPONSE)
+        result = await endpoint(*args, **kwargs)
+        if isinstance(result, Response):
+            # Streaming/pre-encoded responses keep dependency headers (e.g. ETag) too
+            result.headers.raw.extend(sub_response.headers.raw)
+            return result
+        response = FastJSONResponse(result, status_code=sub_response.status_code or status_code or 200)
+        response.headers.raw.extend(sub_response.headers.raw)
+        return response
+
+    wrapper.__signature__ = signature.replace(parameters=[
+        *signature.parameters.values(),
+        inspect.Parameter(_SUB_RESPONSE, inspect.Parameter.KEYWORD_ONLY, annotation=Response)
+    ])
+    return wrapper
+
+
+class FastJSONRoute(APIRoute):
+    """
+    Route that hands plain return values straight to FastJSONResponse
+
+    FastAPI otherwise walks every returned dict with jsonable_encoder before the
+    response class sees it. Routes with a response_model or a return annotation
+    keep FastAPI's validation path.
+
+    Usage:
+        router = APIRouter(route_class=FastJSONRoute)
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        response_model = kwargs.get('response_model')
+        if (
+            (response_model is None or isinstance(response_model, DefaultPlaceholder))
+            and inspect.iscoroutinefunction(endpoint)
+            and inspect.signature(endpoint).return_annotation is inspect.Signature.empty
+        ):
+            endpoint = _respond_directly(endpoint, kwargs.get('status_code'))
+        super().__init__(path, endpoint, **kwargs)
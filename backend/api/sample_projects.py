@@ -2,33 +2,49 @@
 Sample Projects API endpoints
 Retrieve training dataset projects and statistics
 """
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import Optional, Dict
+from api.etag import conditional_get
+from api.responses import FastJSONRoute
 from db.adapters.sample_projects import SampleProjectAdapter
+from db.projection import parse_fields
 from services.auth import verify_token
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
-@router.get("/")
+@router.get("/", dependencies=[Depends(conditional_get('sample-projects'))])
 async def get_all_projects(
     delivery_method: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     token: Dict = Depends(verify_token)
 ):
     """
     Get all sample projects (requires authentication)
     Optionally filter by delivery_method: DATA, DESIGN_BUILD, PLAN_SPEC_BID
+    Pass limit (and the previous response's next_cursor) to page through results
+    (pages come in table order; only unpaged results are sorted)
+    Pass fields=name,delivery_method to return only those attributes (plus id)
     """
     adapter = SampleProjectAdapter()
-    projects = await adapter.get_all(delivery_method=delivery_method)
+    selected = parse_fields(fields)
+    next_cursor = None
+
+    if limit or cursor:
+        projects, next_cursor = await adapter.get_page(limit, cursor, fields=selected, delivery_method=delivery_method)
+    else:
+        projects = await adapter.get_all(delivery_method=delivery_method, fields=selected)
 
     return {
         "projects": projects,
-        "total": len(projects)
+        "total": len(projects),
+        "next_cursor": next_cursor
     }
 
 
-@router.get("/stats")
+@router.get("/stats", dependencies=[Depends(conditional_get('sample-projects'))])
 async def get_statistics(token: Dict = Depends(verify_token)):
     """Get aggregate statistics across all sample projects (requires authentication)"""
     adapter = SampleProjectAdapter()
@@ -37,11 +53,15 @@ async def get_statistics(token: Dict = Depends(verify_token)):
     return stats
 
 
-@router.get("/{project_id}")
-async def get_project(project_id: int, token: Dict = Depends(verify_token)):
+@router.get("/{project_id}", dependencies=[Depends(conditional_get('sample-projects'))])
+async def get_project(
+    project_id: int,
+    fields: Optional[str] = None,
+    token: Dict = Depends(verify_token)
+):
     """Get a specific sample project by ID (requires authentication)"""
     adapter = SampleProjectAdapter()
-    project = await adapter.get_by_id(project_id)
+    project = await adapter.get_by_id(project_id, fields=parse_fields(fields))
 
     if not project:
         raise HTTPException(status_code=404, detail=f"Project ID {project_id} not found")
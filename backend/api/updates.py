@@ -2,13 +2,17 @@
 Communication/Updates API endpoints
 Post and retrieve project updates
 """
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from typing import Optional, Dict
 from pydantic import BaseModel
+from api.etag import conditional_get
+from api.ndjson import ndjson_response, wants_ndjson
+from api.responses import FastJSONRoute
 from db.adapters.updates import UpdateAdapter
+from db.projection import parse_fields
 from services.auth import verify_token
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 class UpdateCreate(BaseModel):
@@ -20,15 +24,37 @@ class UpdateCreate(BaseModel):
     author_email: str  # Email of the user creating the update
 
 
-@router.get("/")
-async def get_updates(type_filter: Optional[str] = None, token: Dict = Depends(verify_token)):
-    """Get all project updates (most recent first)"""
+@router.get("/", dependencies=[Depends(conditional_get('updates'))])
+async def get_updates(
+    request: Request,
+    type_filter: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    token: Dict = Depends(verify_token)
+):
+    """
+    Get all project updates (most recent first)
+    Pass limit (and the previous response's next_cursor) to page through results
+    (pages come in table order; only unpaged results are sorted)
+    Pass fields=title,priority to return only those attributes (plus id)
+    Send Accept: application/x-ndjson to stream one item per line as pages arrive
+    """
     adapter = UpdateAdapter()
-    updates = await adapter.get_all(update_type=type_filter)
+    selected = parse_fields(fields)
+    next_cursor = None
+
+    if wants_ndjson(request) and not (limit or cursor):
+        return ndjson_response(adapter.iter_all(update_type=type_filter, fields=selected))
+    if limit or cursor:
+        updates, next_cursor = await adapter.get_page(limit, cursor, fields=selected, update_type=type_filter)
+    else:
+        updates = await adapter.get_all(update_type=type_filter, fields=selected)
 
     return {
         "updates": updates,
-        "total": len(updates)
+        "total": len(updates),
+        "next_cursor": next_cursor
     }
 
 
@@ -38,8 +64,7 @@ async def create_update(update: UpdateCreate, token: Dict = Depends(verify_token
     adapter = UpdateAdapter()
 
     # Get next ID
-    all_updates = await adapter.get_all()
-    next_id = max([u.get('id', 0) for u in all_updates], default=0) + 1
+    next_id = await adapter.next_id()
 
     # Create new update
     new_update = {
@@ -88,21 +113,7 @@ async def acknowledge_update(update_id: int, user_email: str, token: Dict = Depe
     acknowledgements.append(user_name)
 
     # Update the update with new acknowledgements
-    from boto3.dynamodb.conditions import Attr
-    import boto3
-    import os
-
-    dynamodb = boto3.resource('dynamodb')
-    table_name = os.environ.get('UPDATES_TABLE', 'turbotech-dev-updates')
-    table = dynamodb.Table(table_name)
-
-    table.update_item(
-        Key={'id': update_id},
-        UpdateExpression="SET acknowledgements = :acks",
-        ExpressionAttributeValues={
-            ':acks': acknowledgements
-        }
-    )
+    await adapter.set_acknowledgements(update_id, acknowledgements)
 
     return {
         "update_id": update_id,
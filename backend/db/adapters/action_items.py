@@ -2,143 +2,130 @@
 DynamoDB Adapter for Action Items
 Provides SQLAlchemy-like interface for action_items table
 """
-import boto3
-import os
 from datetime import datetime
-from decimal import Decimal
-from typing import List, Dict, Any, Optional
-from boto3.dynamodb.conditions import Key, Attr
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
+from db.cache import get_cache
+from db.conditions import ItemNotFoundError, write_existing
+from db.convert import parse_number, to_dynamodb, to_python
+from db.executor import run_blocking
+from db.ids import get_allocator, put_new_item
+from db.pagination import fetch_page, iter_pages
+from db.planner import IndexSpec, execute, plan_query
+from db.projection import apply_projection, select_fields
+from db.scan import parallel_scan, parallel_scan_raw
+from db.session import get_table
+from db.versions import bump_version
 
 
 class ActionItemAdapter:
     """Adapter for Action Items DynamoDB table"""
 
+    INDEXES = [
+        IndexSpec(None, 'id'),
+        IndexSpec('StatusIndex', 'status'),
+        IndexSpec('ResponsiblePartyIndex', 'responsible_party'),
+        IndexSpec('MeetingIdIndex', 'meeting_id'),
+    ]
+    SORT_FIELDS = ('id',)
+
     def __init__(self):
-        """Initialize DynamoDB connection"""
-        self.dynamodb = boto3.resource('dynamodb')
-        table_name = os.environ.get('ACTION_ITEMS_TABLE', 'turbotech-dev-action-items')
-        self.table = self.dynamodb.Table(table_name)
-
-    def _decimal_to_python(self, obj):
-        """Convert DynamoDB Decimal types to Python types"""
-        if isinstance(obj, list):
-            return [self._decimal_to_python(i) for i in obj]
-        elif isinstance(obj, dict):
-            return {k: self._decimal_to_python(v) for k, v in obj.items()}
-        elif isinstance(obj, Decimal):
-            return int(obj) if obj % 1 == 0 else float(obj)
-        return obj
-
-    def _python_to_dynamodb(self, obj):
-        """Convert Python types to DynamoDB types (float -> Decimal)"""
-        if isinstance(obj, float):
-            return Decimal(str(obj))
-        elif isinstance(obj, int):
-            return Decimal(str(obj))
-        elif isinstance(obj, dict):
-            return {k: self._python_to_dynamodb(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._python_to_dynamodb(i) for i in obj]
-        return obj
-
-    async def get_all(self) -> List[Dict[str, Any]]:
-        """Get all action items"""
-        response = self.table.scan()
-        items = response.get('Items', [])
+        """Attach to the shared DynamoDB table handle"""
+        self.table = get_table('ACTION_ITEMS_TABLE', 'turbotech-dev-action-items')
+        self.cache = get_cache('action-items')
 
-        # Handle pagination if needed
-        while 'LastEvaluatedKey' in response:
-            response = self.table.scan(ExclusiveStartKey=response['LastEvaluatedKey'])
-            items.extend(response.get('Items', []))
+    async def get_all(self, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Get all action items"""
+        items = await parallel_scan(self.table, **apply_projection({}, fields, self.SORT_FIELDS))
 
         # Sort by id
         items.sort(key=lambda x: x.get('id', 0))
-        return [self._decimal_to_python(item) for item in items]
+        return [to_python(item) for item in items]
 
-    async def get_by_status(self, status: str) -> List[Dict[str, Any]]:
-        """Get action items by status"""
-        response = self.table.query(
-            IndexName='StatusIndex',
-            KeyConditionExpression=Key('status').eq(status)
-        )
-        items = response.get('Items', [])
-
-        # Handle pagination if needed
-        while 'LastEvaluatedKey' in response:
-            response = self.table.query(
-                IndexName='StatusIndex',
-                KeyConditionExpression=Key('status').eq(status),
-                ExclusiveStartKey=response['LastEvaluatedKey']
-            )
-            items.extend(response.get('Items', []))
+    async def get_all_raw(self, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Get all action items as wire-format items (for db.transcode), sorted by id"""
+        items = await parallel_scan_raw(self.table, **apply_projection({}, fields, self.SORT_FIELDS))
+        items.sort(key=lambda x: parse_number(x['id']['N']) if 'id' in x else 0)
+        return items
 
+    async def find(self, fields: Optional[List[str]] = None, **filters) -> List[Dict[str, Any]]:
+        """Get action items matching equality filters, using the best available index"""
+        items = await execute(plan_query(self.table, self.INDEXES, **filters).project(fields, self.SORT_FIELDS))
         items.sort(key=lambda x: x.get('id', 0))
-        return [self._decimal_to_python(item) for item in items]
+        return [to_python(item) for item in items]
+
+    async def get_by_status(self, status: str) -> List[Dict[str, Any]]:
+        """Get action items by status"""
+        return await self.find(status=status)
 
     async def get_by_responsible_party(self, responsible_party: str) -> List[Dict[str, Any]]:
         """Get action items by responsible party"""
-        response = self.table.query(
-            IndexName='ResponsiblePartyIndex',
-            KeyConditionExpression=Key('responsible_party').eq(responsible_party)
-        )
-        items = response.get('Items', [])
-
-        # Handle pagination if needed
-        while 'LastEvaluatedKey' in response:
-            response = self.table.query(
-                IndexName='ResponsiblePartyIndex',
-                KeyConditionExpression=Key('responsible_party').eq(responsible_party),
-                ExclusiveStartKey=response['LastEvaluatedKey']
-            )
-            items.extend(response.get('Items', []))
-
-        items.sort(key=lambda x: x.get('id', 0))
-        return [self._decimal_to_python(item) for item in items]
+        return await self.find(responsible_party=responsible_party)
 
     async def get_by_meeting_id(self, meeting_id: int) -> List[Dict[str, Any]]:
         """Get action items by meeting ID"""
-        response = self.table.query(
-            IndexName='MeetingIdIndex',
-            KeyConditionExpression=Key('meeting_id').eq(meeting_id)
-        )
-        items = response.get('Items', [])
+        return await self.find(meeting_id=meeting_id)
+
+    async def iter_all(self, fields: Optional[List[str]] = None, **filters) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield action items page by page in DynamoDB order (for streaming responses)"""
+        plan = plan_query(self.table, self.INDEXES, **filters).project(fields, self.SORT_FIELDS)
+        async for items in iter_pages(plan.operation, **plan.kwargs):
+            yield [to_python(item) for item in items]
+
+    async def get_page(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        **filters
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get one page of action items (optionally filtered) and the cursor for the next (in table order)"""
+        plan = plan_query(self.table, self.INDEXES, **filters).project(fields, self.SORT_FIELDS)
+        items, next_cursor = await fetch_page(plan.operation, plan.scope, limit, cursor, **plan.kwargs)
+        return [to_python(item) for item in items], next_cursor
+
+    async def get_by_id(self, action_item_id: int, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Get a specific action item by ID"""
+        cached = self.cache.get(action_item_id)
+        if cached is not None:
+            return select_fields(cached, fields)
 
-        # Handle pagination if needed
-        while 'LastEvaluatedKey' in response:
-            response = self.table.query(
-                IndexName='MeetingIdIndex',
-                KeyConditionExpression=Key('meeting_id').eq(meeting_id),
-                ExclusiveStartKey=response['LastEvaluatedKey']
-            )
-            items.extend(response.get('Items', []))
+        response = await run_blocking(
+            self.table.get_item,
+            **apply_projection({'Key': {'id': action_item_id}}, fields)
+        )
+        item = response.get('Item')
+        if not item:
+            return None
 
-        items.sort(key=lambda x: x.get('id', 0))
-        return [self._decimal_to_python(item) for item in items]
+        item = to_python(item)
+        if not fields:
+            self.cache.set(action_item_id, item)
+        return item
 
-    async def get_by_id(self, action_item_id: int) -> Optional[Dict[str, Any]]:
-        """Get a specific action item by ID"""
-        response = self.table.get_item(Key={'id': action_item_id})
-        item = response.get('Item')
-        return self._decimal_to_python(item) if item else None
+    async def next_id(self) -> int:
+        """Allocate a unique ID for a new action item"""
+        return await get_allocator('action-items', self.table).next_id()
 
     async def create(self, action_item: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a new action item"""
+        """Create a new action item (the id changes if it is already taken)"""
         # Convert Python types to DynamoDB types
-        action_item = self._python_to_dynamodb(action_item)
+        action_item = to_dynamodb(action_item)
 
         # Add timestamps
         now = datetime.utcnow().isoformat()
         action_item['created_at'] = now
         action_item['updated_at'] = now
 
-        # Put item
-        self.table.put_item(Item=action_item)
-        return self._decimal_to_python(action_item)
+        # Put item (under a fresh id if this one is taken)
+        action_item = await put_new_item(get_allocator('action-items', self.table), action_item)
+        self.cache.invalidate(action_item['id'])
+        await bump_version('action-items')
+        return to_python(action_item)
 
     async def update(self, action_item_id: int, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update an action item"""
-        # Convert float/int values to Decimal for DynamoDB
-        updates = self._python_to_dynamodb(updates)
+        # Convert float values to Decimal for DynamoDB
+        updates = to_dynamodb(updates)
 
         # Build update expression
         update_expression = "SET "
@@ -161,7 +148,9 @@ class ActionItemAdapter:
         expression_attribute_names['#updated_at'] = 'updated_at'
         expression_attribute_values[':updated_at'] = datetime.utcnow().isoformat()
 
-        response = self.table.update_item(
+        response = await write_existing(
+            self.table.update_item,
+            "Action item not found",
             Key={'id': action_item_id},
             UpdateExpression=update_expression,
             ExpressionAttributeNames=expression_attribute_names,
@@ -169,12 +158,19 @@ class ActionItemAdapter:
             ReturnValues="ALL_NEW"
         )
 
-        return self._decimal_to_python(response.get('Attributes', {}))
+        updated = to_python(response.get('Attributes', {}))
+        self.cache.set(action_item_id, updated)
+        await bump_version('action-items')
+        return updated
 
     async def delete(self, action_item_id: int) -> bool:
         """Delete an action item"""
         try:
-            self.table.delete_item(Key={'id': action_item_id})
+            await write_existing(self.table.delete_item, "Action item not found", Key={'id': action_item_id})
+            self.cache.invalidate(action_item_id)
+            await bump_version('action-items')
             return True
+        except ItemNotFoundError:
+            raise
         except Exception:
             return False
@@ -1,87 +1,188 @@
 """
 DynamoDB Adapter for Deliverables
 Provides SQLAlchemy-like interface for deliverables table
+
+Alongside the table, each month (phase) has a materialized view item in the meta table
+holding that month's deliverables pre-sorted plus its completion rollup. Writes refresh
+only the month(s) they touch; get_view reads any set of months with one BatchGetItem.
+The items are built at deploy/seed time (rebuild_view); a read that finds one missing
+builds just that month from MonthIndex.
+A month's view is a single item, so it must stay under DynamoDB's 400KB item limit
+(comfortably several hundred deliverables).
 """
-import boto3
-import os
+import asyncio
+import logging
 from datetime import datetime
-from decimal import Decimal
-from typing import List, Dict, Any, Optional
-from boto3.dynamodb.conditions import Key, Attr
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Iterable, List, Dict, Any, Optional, Tuple
+from db.aggregates import delete_aggregate, get_aggregate, get_aggregates, replace_aggregate
+from db.cache import get_cache
+from db.conditions import ItemNotFoundError, write_existing
+from db.convert import to_dynamodb, to_python
+from db.executor import run_blocking
+from db.pagination import fetch_page
+from db.planner import IndexSpec, execute, plan_query
+from db.projection import apply_projection, select_fields
+from db.scan import parallel_scan
+from db.session import get_table
+from db.snapshot import get_snapshot
+from db.versions import bump_version
+
+logger = logging.getLogger(__name__)
+
+# Months (phases) the API serves; writes to any other month still keep a view item for it
+MONTHS = (1, 2, 3, 4)
+VIEW_PREFIX = 'deliverables-month-'
+VIEW_ATTEMPTS = 5
+
+
+def view_name(month: int) -> str:
+    return f"{VIEW_PREFIX}{month}"
+
+
+def summarize(deliverables: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Completion rollup for one month's deliverables (DynamoDB types, stored with the view)"""
+    total = len(deliverables)
+    completion = sum((Decimal(str(d.get('completion_percentage', 0))) for d in deliverables), Decimal(0))
+    status_counts: Dict[str, int] = {}
+    for d in deliverables:
+        status = d.get('status', 'NOT_STARTED')
+        status_counts[status] = status_counts.get(status, 0) + 1
+    summary = {
+        'total': total,
+        'completed': status_counts.get('COMPLETED', 0),
+        'completion_percentage': (
+            (completion / total).quantize(Decimal('0.1'), rounding=ROUND_HALF_UP) if total else Decimal(0)
+        ),
+        'status_counts': status_counts,
+    }
+    due_dates = [d['due_date'] for d in deliverables if d.get('due_date')]
+    if due_dates:
+        summary['latest_due_date'] = max(due_dates)
+    return summary
 
 
 class DeliverableAdapter:
     """Adapter for Deliverables DynamoDB table"""
 
+    INDEXES = [
+        IndexSpec(None, 'id'),
+        IndexSpec('MonthIndex', 'month'),
+    ]
+    SORT_FIELDS = ('id',)
+
     def __init__(self):
-        """Initialize DynamoDB connection"""
-        self.dynamodb = boto3.resource('dynamodb')
-        table_name = os.environ.get('DELIVERABLES_TABLE', 'turbotech-dev-deliverables')
-        self.table = self.dynamodb.Table(table_name)
-
-    def _decimal_to_python(self, obj):
-        """Convert DynamoDB Decimal types to Python types"""
-        if isinstance(obj, list):
-            return [self._decimal_to_python(i) for i in obj]
-        elif isinstance(obj, dict):
-            return {k: self._decimal_to_python(v) for k, v in obj.items()}
-        elif isinstance(obj, Decimal):
-            return int(obj) if obj % 1 == 0 else float(obj)
-        return obj
-
-    async def get_all(self) -> List[Dict[str, Any]]:
-        """Get all deliverables"""
-        response = self.table.scan()
-        items = response.get('Items', [])
-
-        # Handle pagination if needed
-        while 'LastEvaluatedKey' in response:
-            response = self.table.scan(ExclusiveStartKey=response['LastEvaluatedKey'])
-            items.extend(response.get('Items', []))
+        """Attach to the shared DynamoDB table handle"""
+        self.table = get_table('DELIVERABLES_TABLE', 'turbotech-dev-deliverables')
+        self.cache = get_cache('deliverables')
+        self.snapshot = get_snapshot('deliverables', self._load_all)
+
+    async def _load_all(self) -> List[Dict[str, Any]]:
+        """Read the whole table for the snapshot"""
+        items = await parallel_scan(self.table)
+        items.sort(key=lambda x: x.get('id', 0))
+        return [to_python(item) for item in items]
+
+    async def get_all(self, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Get all deliverables (from the in-memory snapshot when enabled)"""
+        if self.snapshot:
+            items = await self.snapshot.get()
+            return [select_fields(item, fields, self.SORT_FIELDS) for item in items]
+
+        items = await parallel_scan(self.table, **apply_projection({}, fields, self.SORT_FIELDS))
 
         # Sort by id
         items.sort(key=lambda x: x.get('id', 0))
-        return [self._decimal_to_python(item) for item in items]
+        return [to_python(item) for item in items]
 
-    async def get_by_month(self, month: int) -> List[Dict[str, Any]]:
-        """Get deliverables for a specific month (phase_id)"""
-        response = self.table.scan(
-            FilterExpression=Attr('phase_id').eq(month)
+    async def get_page(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get one page of deliverables and the cursor for the next (in table order)"""
+        items, next_cursor = await fetch_page(
+            self.table.scan, "deliverables", limit, cursor,
+            **apply_projection({}, fields, self.SORT_FIELDS)
         )
-        items = response.get('Items', [])
+        return [to_python(item) for item in items], next_cursor
 
-        # Handle pagination if needed
-        while 'LastEvaluatedKey' in response:
-            response = self.table.scan(
-                FilterExpression=Attr('phase_id').eq(month),
-                ExclusiveStartKey=response['LastEvaluatedKey']
-            )
-            items.extend(response.get('Items', []))
-
-        # Sort by id or due_date if available
+    async def find(self, fields: Optional[List[str]] = None, **filters) -> List[Dict[str, Any]]:
+        """Get deliverables matching equality filters, using the best available index"""
+        items = await execute(plan_query(self.table, self.INDEXES, **filters).project(fields, self.SORT_FIELDS))
         items.sort(key=lambda x: x.get('id', 0))
-        return [self._decimal_to_python(item) for item in items]
+        return [to_python(item) for item in items]
+
+    async def get_by_month(self, month: int, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Get deliverables for a specific month (one read of its view item)"""
+        view = await self.get_view([month], fields=fields)
+        return view[month]['deliverables']
 
-    async def get_by_id(self, deliverable_id: int) -> Optional[Dict[str, Any]]:
+    async def get_view(
+        self,
+        months: Iterable[int] = MONTHS,
+        fields: Optional[List[str]] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Deliverables grouped by month with each month's rollup, in one BatchGetItem
+
+        Returns {month: {'deliverables': [...sorted by id], 'summary': {...}}}; a month
+        with no deliverables has an empty list and a zero summary.
+        """
+        months = list(months)
+        names = [view_name(month) for month in months]
+        views = await get_aggregates(names)
+        for month, name in zip(months, names):
+            if views[name] is None:
+                views[name] = await self._build_month(month)
+
+        grouped = {}
+        for month, name in zip(months, names):
+            view = to_python(views[name] or {})
+            grouped[month] = {
+                'deliverables': [
+                    select_fields(item, fields, self.SORT_FIELDS) for item in view.get('deliverables', [])
+                ],
+                'summary': view.get('summary') or to_python(summarize([])),
+            }
+        return grouped
+
+    async def _build_month(self, month: int) -> Dict[str, Any]:
+        """
+        A month view that is missing (never rebuilt, or dropped after lost races), from
+        one MonthIndex query; stored only if still missing, so it can't clobber a refresh
+        """
+        logger.info(f"Deliverables view for month {month} is missing; building it from MonthIndex")
+        deliverables = await execute(plan_query(self.table, self.INDEXES, month=month))
+        deliverables.sort(key=lambda d: d.get('id', 0))
+        values = {'month': month, 'deliverables': deliverables, 'summary': summarize(deliverables)}
+        await replace_aggregate(view_name(month), values, None)
+        return values
+
+    async def get_by_id(self, deliverable_id: int, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         """Get a specific deliverable by ID"""
-        response = self.table.get_item(Key={'id': deliverable_id})
+        cached = self.cache.get(deliverable_id)
+        if cached is not None:
+            return select_fields(cached, fields)
+
+        response = await run_blocking(
+            self.table.get_item,
+            **apply_projection({'Key': {'id': deliverable_id}}, fields)
+        )
         item = response.get('Item')
-        return self._decimal_to_python(item) if item else None
-
-    def _python_to_dynamodb(self, obj):
-        """Convert Python types to DynamoDB types (float -> Decimal)"""
-        if isinstance(obj, float):
-            return Decimal(str(obj))
-        elif isinstance(obj, dict):
-            return {k: self._python_to_dynamodb(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._python_to_dynamodb(i) for i in obj]
-        return obj
+        if not item:
+            return None
+
+        item = to_python(item)
+        if not fields:
+            self.cache.set(deliverable_id, item)
+        return item
 
     async def update(self, deliverable_id: int, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update a deliverable"""
         # Convert float values to Decimal for DynamoDB
-        updates = self._python_to_dynamodb(updates)
+        updates = to_dynamodb(updates)
 
         # Build update expression
         update_expression = "SET "
@@ -100,19 +201,33 @@ class DeliverableAdapter:
             expression_attribute_values[attr_value] = value
 
         # Always update updated_at
+        now = datetime.utcnow().isoformat()
         update_expression += ", #updated_at = :updated_at"
         expression_attribute_names['#updated_at'] = 'updated_at'
-        expression_attribute_values[':updated_at'] = datetime.utcnow().isoformat()
+        expression_attribute_values[':updated_at'] = now
 
-        response = self.table.update_item(
+        # ALL_OLD rather than ALL_NEW: the previous month says which view item to take it out of,
+        # and since every SET targets a top-level attribute, old + updates is exactly the new item
+        response = await write_existing(
+            self.table.update_item,
+            "Deliverable not found",
             Key={'id': deliverable_id},
             UpdateExpression=update_expression,
             ExpressionAttributeNames=expression_attribute_names,
             ExpressionAttributeValues=expression_attribute_values,
-            ReturnValues="ALL_NEW"
+            ReturnValues="ALL_OLD"
         )
 
-        return self._decimal_to_python(response.get('Attributes', {}))
+        previous = response.get('Attributes', {})
+        current = {**previous, **updates, 'updated_at': now}
+        await self._refresh_view(deliverable_id, previous, current, now)
+
+        updated = to_python(current)
+        self.cache.set(deliverable_id, updated)
+        await bump_version('deliverables')
+        if self.snapshot:
+            self.snapshot.invalidate()
+        return updated
 
     async def create(self, deliverable: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new deliverable"""
@@ -121,14 +236,124 @@ class DeliverableAdapter:
         deliverable['created_at'] = now
         deliverable['updated_at'] = now
 
-        # Put item
-        self.table.put_item(Item=deliverable)
-        return self._decimal_to_python(deliverable)
+        # Convert Python types to DynamoDB types
+        deliverable = to_dynamodb(deliverable)
+
+        # Put item (ALL_OLD: replacing a deliverable may move it out of another month's view)
+        response = await run_blocking(self.table.put_item, Item=deliverable, ReturnValues="ALL_OLD")
+        await self._refresh_view(deliverable['id'], response.get('Attributes'), deliverable, now)
+
+        self.cache.invalidate(deliverable['id'])
+        await bump_version('deliverables')
+        if self.snapshot:
+            self.snapshot.invalidate()
+        return to_python(deliverable)
 
     async def delete(self, deliverable_id: int) -> bool:
         """Delete a deliverable"""
         try:
-            self.table.delete_item(Key={'id': deliverable_id})
+            response = await write_existing(
+                self.table.delete_item,
+                "Deliverable not found",
+                Key={'id': deliverable_id},
+                ReturnValues="ALL_OLD"
+            )
+            await self._refresh_view(
+                deliverable_id, response.get('Attributes'), None, datetime.utcnow().isoformat()
+            )
+            self.cache.invalidate(deliverable_id)
+            await bump_version('deliverables')
+            if self.snapshot:
+                self.snapshot.invalidate()
             return True
+        except ItemNotFoundError:
+            raise
         except Exception:
             return False
+
+    async def _refresh_view(
+        self,
+        deliverable_id: int,
+        previous: Optional[Dict[str, Any]],
+        current: Optional[Dict[str, Any]],
+        written_at: str
+    ) -> None:
+        """Bring the view items of the month(s) a write touched up to date (None: absent before/after)"""
+        months = {item['month'] for item in (previous, current) if item and 'month' in item}
+        await asyncio.gather(*[
+            self._refresh_month(
+                month, deliverable_id, current if current and current.get('month') == month else None, written_at
+            )
+            for month in months
+        ])
+
+    async def _refresh_month(
+        self,
+        month: int,
+        deliverable_id: int,
+        entry: Optional[Dict[str, Any]],
+        written_at: str
+    ) -> None:
+        """Put `entry` into (or, for None, take the deliverable out of) one month's view item"""
+        name = view_name(month)
+        for _ in range(VIEW_ATTEMPTS):
+            view = await get_aggregate(name, consistent=True)
+            if view is None:
+                # Not built yet: start from the month's current contents
+                revision = None
+                deliverables = await execute(plan_query(self.table, self.INDEXES, month=month))
+            else:
+                revision = view['revision']
+                deliverables = view.get('deliverables', [])
+
+            existing = next((d for d in deliverables if d.get('id') == deliverable_id), None)
+            if existing is not None and existing.get('updated_at', '') > written_at:
+                return  # a later write to this deliverable already refreshed the view
+
+            deliverables = [d for d in deliverables if d.get('id') != deliverable_id]
+            if entry is not None:
+                deliverables.append(entry)
+            deliverables.sort(key=lambda d: d.get('id', 0))
+
+            values = {'month': month, 'deliverables': deliverables, 'summary': summarize(deliverables)}
+            if await replace_aggregate(name, values, revision):
+                return
+
+        # Lost every race: drop the item so the next read rebuilds the month rather than serving it stale
+        logger.warning(f"Deliverables view for month {month} kept changing; dropping it for a rebuild")
+        await delete_aggregate(name)
+
+    async def rebuild_view(self) -> Dict[str, Any]:
+        """
+        Recompute every month's view item from the table (deploy/seed step and drift repair;
+        see scripts/rebuild_aggregates.py)
+
+        Each month is re-read from MonthIndex after its current revision and replaced under
+        that revision, like a refresh, so a rebuild can run alongside writes: a refresh
+        landing in between makes the replace retry, and refreshes still in flight see the
+        bumped revision and reapply themselves on top of the rebuilt item.
+        """
+        months = set(MONTHS)
+        items = await parallel_scan(
+            self.table, ProjectionExpression='#month', ExpressionAttributeNames={'#month': 'month'}
+        )
+        months.update(item.get('month', 1) for item in items)
+
+        rebuilt = {}
+        for month in sorted(months):
+            name = view_name(month)
+            for _ in range(VIEW_ATTEMPTS):
+                view = await get_aggregate(name, consistent=True)
+                deliverables = await execute(plan_query(self.table, self.INDEXES, month=month))
+                deliverables.sort(key=lambda d: d.get('id', 0))
+                summary = summarize(deliverables)
+                values = {'month': month, 'deliverables': deliverables, 'summary': summary}
+                if await replace_aggregate(name, values, view['revision'] if view else None):
+                    rebuilt[f"month{month}"] = to_python(summary)
+                    break
+            else:
+                logger.warning(f"Deliverables view for month {month} kept changing during the rebuild")
+
+        if rebuilt:
+            await bump_version('deliverables')
+        return rebuilt
@@ -2,102 +2,116 @@
 DynamoDB Adapter for Meetings
 Provides SQLAlchemy-like interface for meetings table
 """
-import boto3
-import os
 from datetime import datetime
-from decimal import Decimal
-from typing import List, Dict, Any, Optional
-from boto3.dynamodb.conditions import Key, Attr
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
+from db.cache import get_cache
+from db.conditions import ItemNotFoundError, write_existing
+from db.convert import to_dynamodb, to_python
+from db.executor import run_blocking
+from db.ids import get_allocator, put_new_item
+from db.pagination import fetch_page, iter_pages
+from db.planner import IndexSpec, execute, plan_query
+from db.projection import apply_projection, select_fields
+from db.scan import parallel_scan, parallel_scan_raw
+from db.session import get_table
+from db.versions import bump_version
 
 
 class MeetingAdapter:
     """Adapter for Meetings DynamoDB table"""
 
+    INDEXES = [
+        IndexSpec(None, 'id'),
+        IndexSpec('MeetingDateIndex', 'meeting_date'),
+    ]
+    SORT_FIELDS = ('id', 'meeting_date')
+
     def __init__(self):
-        """Initialize DynamoDB connection"""
-        self.dynamodb = boto3.resource('dynamodb')
-        table_name = os.environ.get('MEETINGS_TABLE', 'turbotech-dev-meetings')
-        self.table = self.dynamodb.Table(table_name)
-
-    def _decimal_to_python(self, obj):
-        """Convert DynamoDB Decimal types to Python types"""
-        if isinstance(obj, list):
-            return [self._decimal_to_python(i) for i in obj]
-        elif isinstance(obj, dict):
-            return {k: self._decimal_to_python(v) for k, v in obj.items()}
-        elif isinstance(obj, Decimal):
-            return int(obj) if obj % 1 == 0 else float(obj)
-        return obj
-
-    def _python_to_dynamodb(self, obj):
-        """Convert Python types to DynamoDB types (float -> Decimal)"""
-        if isinstance(obj, float):
-            return Decimal(str(obj))
-        elif isinstance(obj, int):
-            return Decimal(str(obj))
-        elif isinstance(obj, dict):
-            return {k: self._python_to_dynamodb(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._python_to_dynamodb(i) for i in obj]
-        return obj
-
-    async def get_all(self) -> List[Dict[str, Any]]:
-        """Get all meetings"""
-        response = self.table.scan()
-        items = response.get('Items', [])
+        """Attach to the shared DynamoDB table handle"""
+        self.table = get_table('MEETINGS_TABLE', 'turbotech-dev-meetings')
+        self.cache = get_cache('meetings')
 
-        # Handle pagination if needed
-        while 'LastEvaluatedKey' in response:
-            response = self.table.scan(ExclusiveStartKey=response['LastEvaluatedKey'])
-            items.extend(response.get('Items', []))
+    async def get_all(self, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Get all meetings"""
+        items = await parallel_scan(self.table, **apply_projection({}, fields, self.SORT_FIELDS))
 
         # Sort by meeting_date descending (most recent first)
         items.sort(key=lambda x: x.get('meeting_date', ''), reverse=True)
-        return [self._decimal_to_python(item) for item in items]
+        return [to_python(item) for item in items]
 
-    async def get_by_date(self, meeting_date: str) -> List[Dict[str, Any]]:
+    async def get_all_raw(self, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Get all meetings as wire-format items (for db.transcode), newest first"""
+        items = await parallel_scan_raw(self.table, **apply_projection({}, fields, self.SORT_FIELDS))
+        items.sort(key=lambda x: x.get('meeting_date', {}).get('S', ''), reverse=True)
+        return items
+
+    async def get_by_date(self, meeting_date: str, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """Get meetings by date"""
-        response = self.table.query(
-            IndexName='MeetingDateIndex',
-            KeyConditionExpression=Key('meeting_date').eq(meeting_date)
-        )
-        items = response.get('Items', [])
+        plan = plan_query(self.table, self.INDEXES, meeting_date=meeting_date)
+        items = await execute(plan.project(fields, self.SORT_FIELDS))
+        return [to_python(item) for item in items]
+
+    async def iter_all(self, fields: Optional[List[str]] = None, meeting_date: Optional[str] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield meetings page by page in DynamoDB order (for streaming responses)"""
+        plan = plan_query(self.table, self.INDEXES, meeting_date=meeting_date).project(fields, self.SORT_FIELDS)
+        async for items in iter_pages(plan.operation, **plan.kwargs):
+            yield [to_python(item) for item in items]
+
+    async def get_page(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        meeting_date: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get one page of meetings (optionally for a date) and the cursor for the next (in table order)"""
+        plan = plan_query(self.table, self.INDEXES, meeting_date=meeting_date).project(fields, self.SORT_FIELDS)
+        items, next_cursor = await fetch_page(plan.operation, plan.scope, limit, cursor, **plan.kwargs)
+        return [to_python(item) for item in items], next_cursor
+
+    async def get_by_id(self, meeting_id: int, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Get a specific meeting by ID"""
+        cached = self.cache.get(meeting_id)
+        if cached is not None:
+            return select_fields(cached, fields)
 
-        # Handle pagination if needed
-        while 'LastEvaluatedKey' in response:
-            response = self.table.query(
-                IndexName='MeetingDateIndex',
-                KeyConditionExpression=Key('meeting_date').eq(meeting_date),
-                ExclusiveStartKey=response['LastEvaluatedKey']
-            )
-            items.extend(response.get('Items', []))
+        response = await run_blocking(
+            self.table.get_item,
+            **apply_projection({'Key': {'id': meeting_id}}, fields)
+        )
+        item = response.get('Item')
+        if not item:
+            return None
 
-        return [self._decimal_to_python(item) for item in items]
+        item = to_python(item)
+        if not fields:
+            self.cache.set(meeting_id, item)
+        return item
 
-    async def get_by_id(self, meeting_id: int) -> Optional[Dict[str, Any]]:
-        """Get a specific meeting by ID"""
-        response = self.table.get_item(Key={'id': meeting_id})
-        item = response.get('Item')
-        return self._decimal_to_python(item) if item else None
+    async def next_id(self) -> int:
+        """Allocate a unique ID for a new meeting"""
+        return await get_allocator('meetings', self.table).next_id()
 
     async def create(self, meeting: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a new meeting"""
+        """Create a new meeting (the id changes if it is already taken)"""
         # Convert Python types to DynamoDB types
-        meeting = self._python_to_dynamodb(meeting)
+        meeting = to_dynamodb(meeting)
 
         # Add timestamps
         now = datetime.utcnow().isoformat()
         meeting['created_at'] = now
         meeting['updated_at'] = now
 
-        # Put item
-        self.table.put_item(Item=meeting)
-        return self._decimal_to_python(meeting)
+        # Put item (under a fresh id if this one is taken)
+        meeting = await put_new_item(get_allocator('meetings', self.table), meeting)
+        self.cache.invalidate(meeting['id'])
+        await bump_version('meetings')
+        return to_python(meeting)
 
     async def update(self, meeting_id: int, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update a meeting"""
-        # Convert float/int values to Decimal for DynamoDB
-        updates = self._python_to_dynamodb(updates)
+        # Convert float values to Decimal for DynamoDB
+        updates = to_dynamodb(updates)
 
         # Build update expression
         update_expression = "SET "
@@ -120,7 +134,9 @@ class MeetingAdapter:
         expression_attribute_names['#updated_at'] = 'updated_at'
         expression_attribute_values[':updated_at'] = datetime.utcnow().isoformat()
 
-        response = self.table.update_item(
+        response = await write_existing(
+            self.table.update_item,
+            "Meeting not found",
             Key={'id': meeting_id},
             UpdateExpression=update_expression,
             ExpressionAttributeNames=expression_attribute_names,
@@ -128,12 +144,19 @@ class MeetingAdapter:
             ReturnValues="ALL_NEW"
         )
 
-        return self._decimal_to_python(response.get('Attributes', {}))
+        updated = to_python(response.get('Attributes', {}))
+        self.cache.set(meeting_id, updated)
+        await bump_version('meetings')
+        return updated
 
     async def delete(self, meeting_id: int) -> bool:
         """Delete a meeting"""
         try:
-            self.table.delete_item(Key={'id': meeting_id})
+            await write_existing(self.table.delete_item, "Meeting not found", Key={'id': meeting_id})
+            self.cache.invalidate(meeting_id)
+            await bump_version('meetings')
             return True
+        except ItemNotFoundError:
+            raise
         except Exception:
             return False
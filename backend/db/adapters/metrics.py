@@ -1,59 +1,63 @@
 """
 DynamoDB Adapter for Metrics
+The metrics table holds each metric's definition and latest value; every recorded
+value is also appended to the metric's time series (db/timeseries.py) for history
 """
-import boto3
-import os
 from datetime import datetime
-from decimal import Decimal
 from typing import List, Dict, Any, Optional
+from db.cache import get_cache
+from db.conditions import write_existing
+from db.convert import to_dynamodb, to_python
+from db.executor import run_blocking
+from db.scan import parallel_scan
+from db.session import get_table
+from db.snapshot import get_snapshot
+from db.timeseries import choose_resolution, get_timeseries
+from db.versions import bump_version
 
 
 class MetricAdapter:
     """Adapter for Metrics DynamoDB table"""
 
     def __init__(self):
-        """Initialize DynamoDB connection"""
-        self.dynamodb = boto3.resource('dynamodb')
-        table_name = os.environ.get('METRICS_TABLE', 'turbotech-dev-metrics')
-        self.table = self.dynamodb.Table(table_name)
-
-    def _decimal_to_python(self, obj):
-        """Convert DynamoDB Decimal types to Python types"""
-        if isinstance(obj, list):
-            return [self._decimal_to_python(i) for i in obj]
-        elif isinstance(obj, dict):
-            return {k: self._decimal_to_python(v) for k, v in obj.items()}
-        elif isinstance(obj, Decimal):
-            return int(obj) if obj % 1 == 0 else float(obj)
-        return obj
-
-    def _python_to_dynamodb(self, obj):
-        """Convert Python types to DynamoDB types (float -> Decimal)"""
-        if isinstance(obj, float):
-            return Decimal(str(obj))
-        elif isinstance(obj, dict):
-            return {k: self._python_to_dynamodb(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._python_to_dynamodb(i) for i in obj]
-        return obj
+        """Attach to the shared DynamoDB table handle"""
+        self.table = get_table('METRICS_TABLE', 'turbotech-dev-metrics')
+        self.cache = get_cache('metrics')
+        self.snapshot = get_snapshot('metrics', self._load_all)
+        self.samples = get_timeseries('METRIC_SAMPLES_TABLE', 'turbotech-dev-metric-samples')
+
+    async def _load_all(self) -> List[Dict[str, Any]]:
+        """Read the whole table (also the snapshot loader)"""
+        items = await parallel_scan(self.table)
 
-    async def get_all(self) -> List[Dict[str, Any]]:
-        """Get all metrics"""
-        response = self.table.scan()
-        items = response.get('Items', [])
         items.sort(key=lambda x: x.get('id', 0))
-        return [self._decimal_to_python(item) for item in items]
+        return [to_python(item) for item in items]
+
+    async def get_all(self) -> List[Dict[str, Any]]:
+        """Get all metrics (from the in-memory snapshot when enabled)"""
+        if self.snapshot:
+            return list(await self.snapshot.get())
+        return await self._load_all()
 
     async def get_by_id(self, metric_id: int) -> Optional[Dict[str, Any]]:
         """Get a specific metric by ID"""
-        response = self.table.get_item(Key={'id': metric_id})
+        cached = self.cache.get(metric_id)
+        if cached is not None:
+            return cached
+
+        response = await run_blocking(self.table.get_item, Key={'id': metric_id})
         item = response.get('Item')
-        return self._decimal_to_python(item) if item else None
+        if not item:
+            return None
+
+        item = to_python(item)
+        self.cache.set(metric_id, item)
+        return item
 
     async def update(self, metric_id: int, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update a metric"""
         # Convert Python types to DynamoDB types
-        updates = self._python_to_dynamodb(updates)
+        updates = to_dynamodb(updates)
 
         update_expression = "SET "
         expression_attribute_values = {}
@@ -75,7 +79,9 @@ class MetricAdapter:
         expression_attribute_names['#updated_at'] = 'updated_at'
         expression_attribute_values[':updated_at'] = datetime.utcnow().isoformat()
 
-        response = self.table.update_item(
+        response = await write_existing(
+            self.table.update_item,
+            f"Metric ID {metric_id} not found",
             Key={'id': metric_id},
             UpdateExpression=update_expression,
             ExpressionAttributeNames=expression_attribute_names,
@@ -83,7 +89,42 @@ class MetricAdapter:
             ReturnValues="ALL_NEW"
         )
 
-        return self._decimal_to_python(response.get('Attributes', {}))
+        updated = to_python(response.get('Attributes', {}))
+        self.cache.set(metric_id, updated)
+        await bump_version('metrics')
+        if self.snapshot:
+            self.snapshot.invalidate()
+        return updated
+
+    async def record(self, metric_id: int, value: float, notes: str = "") -> Dict[str, Any]:
+        """Set a metric's current value and append it to the metric's history"""
+        updates = {'current': value}
+        if notes:
+            updates['notes'] = notes
+        updated = await self.update(metric_id, updates)
+
+        # Same timestamp as the metric's updated_at; notes travel with the sample
+        attrs = {'notes': notes} if notes else {}
+        await self.samples.append(str(metric_id), value, datetime.fromisoformat(updated['updated_at']), **attrs)
+        return updated
+
+    async def history(
+        self,
+        metric_id: int,
+        start: datetime,
+        end: datetime,
+        resolution: str = 'auto'
+    ) -> Dict[str, Any]:
+        """
+        Recorded values of a metric in [start, end)
+
+        resolution is raw, hour, day or auto (the coarsest rollup that still gives
+        enough points to chart the range).
+        """
+        if resolution == 'auto':
+            resolution = choose_resolution(start, end)
+        points = await self.samples.read(str(metric_id), start, end, resolution)
+        return {'resolution': resolution, 'points': points}
 
     async def create(self, metric: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new metric"""
@@ -91,5 +132,9 @@ class MetricAdapter:
         metric['created_at'] = now
         metric['updated_at'] = now
 
-        self.table.put_item(Item=metric)
-        return self._decimal_to_python(metric)
+        await run_blocking(self.table.put_item, Item=metric)
+        self.cache.invalidate(metric['id'])
+        await bump_version('metrics')
+        if self.snapshot:
+            self.snapshot.invalidate()
+        return to_python(metric)
@@ -1,82 +1,197 @@
 """
 DynamoDB Adapter for Sample Projects
 """
-import boto3
-import os
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from db.aggregates import (
+    add_deltas, diff_deltas, get_aggregate, put_aggregate, transact_write, transaction_condition_failed
+)
+from db.cache import get_cache
+from db.conditions import ItemNotFoundError, write_existing
+from db.convert import to_dynamodb, to_python
+from db.executor import run_blocking
+from db.pagination import fetch_page
+from db.planner import IndexSpec, execute, plan_query
+from db.projection import apply_projection, select_fields
+from db.scan import parallel_scan
+from db.session import get_table
+from db.snapshot import get_snapshot
+from db.versions import bump_version
+
+STATS = 'sample-projects'
+DELIVERY_METHOD_PREFIX = 'delivery_method#'
+# Attributes whose changes move the stats aggregate
+STATS_FIELDS = ('size_mb', 'document_counts', 'delivery_method')
+UPDATE_ATTEMPTS = 3
 
 
 class SampleProjectAdapter:
     """Adapter for Sample Projects DynamoDB table"""
 
+    INDEXES = [
+        IndexSpec(None, 'id'),
+        IndexSpec('DeliveryMethodIndex', 'delivery_method'),
+    ]
+    SORT_FIELDS = ('id',)
+
     def __init__(self):
-        """Initialize DynamoDB connection"""
-        self.dynamodb = boto3.resource('dynamodb')
-        table_name = os.environ.get('SAMPLE_PROJECTS_TABLE', 'turbotech-dev-sample-projects')
-        self.table = self.dynamodb.Table(table_name)
-
-    def _decimal_to_python(self, obj):
-        """Convert DynamoDB Decimal types to Python types"""
-        if isinstance(obj, list):
-            return [self._decimal_to_python(i) for i in obj]
-        elif isinstance(obj, dict):
-            return {k: self._decimal_to_python(v) for k, v in obj.items()}
-        elif isinstance(obj, Decimal):
-            return int(obj) if obj % 1 == 0 else float(obj)
-        return obj
-
-    def _python_to_dynamodb(self, obj):
-        """Convert Python types to DynamoDB types (float -> Decimal)"""
-        if isinstance(obj, float):
-            return Decimal(str(obj))
-        elif isinstance(obj, dict):
-            return {k: self._python_to_dynamodb(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._python_to_dynamodb(i) for i in obj]
-        return obj
-
-    async def get_all(self, delivery_method: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get all sample projects or filter by delivery method"""
-        if delivery_method:
-            # Use GSI to filter by delivery method
-            response = self.table.query(
-                IndexName='DeliveryMethodIndex',
-                KeyConditionExpression='delivery_method = :dm',
-                ExpressionAttributeValues={':dm': delivery_method}
-            )
-            items = response.get('Items', [])
-        else:
-            # Scan all projects
-            response = self.table.scan()
-            items = response.get('Items', [])
+        """Attach to the shared DynamoDB table handle"""
+        self.table = get_table('SAMPLE_PROJECTS_TABLE', 'turbotech-dev-sample-projects')
+        self.cache = get_cache('sample-projects')
+        self.snapshot = get_snapshot('sample-projects', self._load_all)
+
+    async def get_all(
+        self,
+        delivery_method: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Get all sample projects or filter by delivery method (from the snapshot when enabled)"""
+        if self.snapshot:
+            items = await self.snapshot.get()
+            return [
+                select_fields(item, fields, self.SORT_FIELDS)
+                for item in items
+                if delivery_method is None or item.get('delivery_method') == delivery_method
+            ]
 
+        plan = plan_query(self.table, self.INDEXES, delivery_method=delivery_method)
+        items = await execute(plan.project(fields, self.SORT_FIELDS))
         items.sort(key=lambda x: x.get('id', 0))
-        return [self._decimal_to_python(item) for item in items]
+        return [to_python(item) for item in items]
 
-    async def get_by_id(self, project_id: int) -> Optional[Dict[str, Any]]:
+    async def _load_all(self) -> List[Dict[str, Any]]:
+        """Read the whole table for the snapshot"""
+        items = await parallel_scan(self.table)
+        items.sort(key=lambda x: x.get('id', 0))
+        return [to_python(item) for item in items]
+
+    async def get_page(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        delivery_method: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get one page of sample projects (optionally by delivery method) and the cursor for the next (in table order)"""
+        plan = plan_query(self.table, self.INDEXES, delivery_method=delivery_method).project(fields, self.SORT_FIELDS)
+        items, next_cursor = await fetch_page(plan.operation, plan.scope, limit, cursor, **plan.kwargs)
+        return [to_python(item) for item in items], next_cursor
+
+    async def get_by_id(self, project_id: int, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         """Get a specific project by ID"""
-        response = self.table.get_item(Key={'id': project_id})
+        cached = self.cache.get(project_id)
+        if cached is not None:
+            return select_fields(cached, fields)
+
+        response = await run_blocking(
+            self.table.get_item,
+            **apply_projection({'Key': {'id': project_id}}, fields)
+        )
         item = response.get('Item')
-        return self._decimal_to_python(item) if item else None
+        if not item:
+            return None
+
+        item = to_python(item)
+        if not fields:
+            self.cache.set(project_id, item)
+        return item
+
+    @staticmethod
+    def _stats_contribution(project: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """What one stored project adds to the stats aggregate (nothing for None)"""
+        if project is None:
+            return {}
+        counts = project.get('document_counts') or {}
+        return {
+            'total_projects': 1,
+            'total_documents': sum(Decimal(str(count)) for count in counts.values()),
+            'total_size_mb': Decimal(str(project.get('size_mb', 0))),
+            DELIVERY_METHOD_PREFIX + project.get('delivery_method', 'UNKNOWN'): 1,
+        }
+
+    async def _write_with_stats(
+        self,
+        write: Dict[str, Any],
+        previous: Optional[Dict[str, Any]],
+        current: Dict[str, Any]
+    ) -> None:
+        """
+        Apply a conditional project write and the matching stats deltas in one transaction
+
+        Deltas only apply to a built aggregate, so while it is missing the write can't
+        commit: the aggregate is built from the table first (which can't miss a
+        concurrent write for the same reason) and the transaction retried. A failed
+        condition on the project write itself propagates to the caller.
+        """
+        from botocore.exceptions import ClientError
+
+        deltas = diff_deltas(self._stats_contribution(previous), self._stats_contribution(current))
+        for _ in range(UPDATE_ATTEMPTS):
+            try:
+                await transact_write([write, add_deltas(STATS, deltas)])
+                return
+            except ClientError as e:
+                if transaction_condition_failed(e, 0) or not transaction_condition_failed(e, 1):
+                    raise
+            await self.rebuild_stats(only_if_missing=True)
+        raise RuntimeError("Sample project stats aggregate could not be built; retry")
 
     async def create(self, project: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a new sample project"""
+        """Create a new sample project (replacing one with the same id) and update the stats aggregate"""
+        from botocore.exceptions import ClientError
+
         now = datetime.utcnow().isoformat()
         project['created_at'] = now
         project['updated_at'] = now
 
         # Convert Python types to DynamoDB types
-        project = self._python_to_dynamodb(project)
+        project = to_dynamodb(project)
 
-        self.table.put_item(Item=project)
-        return self._decimal_to_python(project)
+        previous = None
+        for _ in range(UPDATE_ATTEMPTS):
+            write = {'Put': {'TableName': self.table.name, 'Item': project, **self._unchanged_since(previous)}}
+            try:
+                await self._write_with_stats(write, previous, project)
+                break
+            except ClientError as e:
+                if not transaction_condition_failed(e):
+                    raise
+            # Replacing an existing project: count the difference, not a second project
+            previous = await self._read_current(project['id'])
+        else:
+            raise RuntimeError(f"Project ID {project['id']} kept changing during create; retry")
+
+        self.cache.invalidate(project['id'])
+        await bump_version('sample-projects')
+        if self.snapshot:
+            self.snapshot.invalidate()
+        return to_python(project)
+
+    async def _read_current(self, project_id: int) -> Optional[Dict[str, Any]]:
+        response = await run_blocking(self.table.get_item, Key={'id': project_id}, ConsistentRead=True)
+        return response.get('Item')
+
+    @staticmethod
+    def _unchanged_since(previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Condition that the stored project is still the version the deltas were computed from"""
+        if previous is None:
+            return {'ConditionExpression': 'attribute_not_exists(id)'}
+        if 'updated_at' not in previous:
+            return {
+                'ConditionExpression': 'attribute_exists(id) AND attribute_not_exists(#seen)',
+                'ExpressionAttributeNames': {'#seen': 'updated_at'},
+            }
+        return {
+            'ConditionExpression': '#seen = :seen',
+            'ExpressionAttributeNames': {'#seen': 'updated_at'},
+            'ExpressionAttributeValues': {':seen': previous['updated_at']},
+        }
 
     async def update(self, project_id: int, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update a sample project"""
         # Convert Python types to DynamoDB types
-        updates = self._python_to_dynamodb(updates)
+        updates = to_dynamodb(updates)
 
         update_expression = "SET "
         expression_attribute_values = {}
@@ -98,35 +213,109 @@ class SampleProjectAdapter:
         expression_attribute_names['#updated_at'] = 'updated_at'
         expression_attribute_values[':updated_at'] = datetime.utcnow().isoformat()
 
-        response = self.table.update_item(
-            Key={'id': project_id},
-            UpdateExpression=update_expression,
-            ExpressionAttributeNames=expression_attribute_names,
-            ExpressionAttributeValues=expression_attribute_values,
-            ReturnValues="ALL_NEW"
-        )
+        if not any(field in updates for field in STATS_FIELDS):
+            # Stats unaffected: plain conditional update
+            response = await write_existing(
+                self.table.update_item,
+                f"Project ID {project_id} not found",
+                Key={'id': project_id},
+                UpdateExpression=update_expression,
+                ExpressionAttributeNames=expression_attribute_names,
+                ExpressionAttributeValues=expression_attribute_values,
+                ReturnValues="ALL_NEW"
+            )
+            updated = to_python(response.get('Attributes', {}))
+        else:
+            updated = await self._update_with_stats(
+                project_id, updates, update_expression, expression_attribute_names, expression_attribute_values
+            )
 
-        return self._decimal_to_python(response.get('Attributes', {}))
+        self.cache.set(project_id, updated)
+        await bump_version('sample-projects')
+        if self.snapshot:
+            self.snapshot.invalidate()
+        return updated
 
-    async def get_stats(self) -> Dict[str, Any]:
-        """Get aggregate statistics across all sample projects"""
-        all_projects = await self.get_all()
+    async def _update_with_stats(
+        self,
+        project_id: int,
+        updates: Dict[str, Any],
+        update_expression: str,
+        names: Dict[str, str],
+        values: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Update a project and its stats deltas atomically, retrying if it changed since it was read"""
+        from botocore.exceptions import ClientError
+
+        for _ in range(UPDATE_ATTEMPTS):
+            previous = await self._read_current(project_id)
+            if previous is None:
+                raise ItemNotFoundError(f"Project ID {project_id} not found", {'id': project_id})
 
-        total_size_mb = sum(p.get('size_mb', 0) for p in all_projects)
-        total_docs = sum(sum(p.get('document_counts', {}).values()) for p in all_projects)
+            condition = self._unchanged_since(previous)
+            current = {**previous, **updates, 'updated_at': values[':updated_at']}
+            write = {
+                'Update': {
+                    'TableName': self.table.name,
+                    'Key': {'id': project_id},
+                    'UpdateExpression': update_expression,
+                    'ConditionExpression': condition['ConditionExpression'],
+                    'ExpressionAttributeNames': {**names, **condition['ExpressionAttributeNames']},
+                    'ExpressionAttributeValues': {**values, **condition.get('ExpressionAttributeValues', {})},
+                }
+            }
+            try:
+                await self._write_with_stats(write, previous, current)
+            except ClientError as e:
+                if not transaction_condition_failed(e):
+                    raise
+                continue
+            return to_python(current)
 
-        # Count by delivery method
-        delivery_methods = {}
-        for project in all_projects:
-            dm = project.get('delivery_method', 'UNKNOWN')
-            if dm not in delivery_methods:
-                delivery_methods[dm] = 0
-            delivery_methods[dm] += 1
+        raise RuntimeError(f"Project ID {project_id} kept changing during update; retry")
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get aggregate statistics across all sample projects (one GetItem on the stats aggregate)"""
+        stats = await get_aggregate(STATS)
+        if stats is None:
+            # Never built (first read after deploy): compute it once from the table
+            await self.rebuild_stats(only_if_missing=True)
+            stats = await get_aggregate(STATS)
+        stats = to_python(stats or {})
 
+        total_size_mb = stats.get('total_size_mb', 0)
         return {
-            'total_projects': len(all_projects),
-            'total_documents': total_docs,
+            'total_projects': stats.get('total_projects', 0),
+            'total_documents': stats.get('total_documents', 0),
             'total_size_mb': total_size_mb,
             'total_size_gb': round(total_size_mb / 1024, 2),
-            'delivery_methods': delivery_methods
+            'delivery_methods': {
+                attr[len(DELIVERY_METHOD_PREFIX):]: count
+                for attr, count in sorted(stats.items())
+                if attr.startswith(DELIVERY_METHOD_PREFIX) and count
+            }
         }
+
+    async def rebuild_stats(self, only_if_missing: bool = False) -> Dict[str, Any]:
+        """
+        Recompute the stats aggregate from a full scan (drift repair; see scripts/rebuild_aggregates.py)
+
+        only_if_missing=True builds a missing aggregate and is safe alongside writes,
+        since no project write commits while the aggregate is missing. A full rebuild
+        should run while nothing else is writing projects: deltas applied between the
+        scan and the put are lost.
+        """
+        items = await parallel_scan(
+            self.table,
+            ConsistentRead=True,
+            ProjectionExpression='#size, #docs, #method',
+            ExpressionAttributeNames={'#size': 'size_mb', '#docs': 'document_counts', '#method': 'delivery_method'}
+        )
+        totals: Dict[str, Any] = {'total_projects': 0, 'total_documents': 0, 'total_size_mb': 0}
+        for item in items:
+            for attr, value in self._stats_contribution(item).items():
+                totals[attr] = totals.get(attr, 0) + value
+
+        if await put_aggregate(STATS, totals, only_if_missing=only_if_missing):
+            await bump_version('sample-projects')
+        return to_python(totals)
@@ -1,60 +1,91 @@
 """
 DynamoDB Adapter for Updates (Communication Hub)
 """
-import boto3
-import os
 from datetime import datetime
-from decimal import Decimal
-from typing import List, Dict, Any, Optional
-from boto3.dynamodb.conditions import Key, Attr
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
+from db.cache import get_cache
+from db.conditions import ItemNotFoundError, write_existing
+from db.convert import to_python
+from db.executor import run_blocking
+from db.ids import get_allocator, put_new_item
+from db.pagination import fetch_page, iter_pages
+from db.planner import IndexSpec, execute, plan_query
+from db.projection import apply_projection, select_fields
+from db.session import get_table
+from db.versions import bump_version
 
 
 class UpdateAdapter:
     """Adapter for Updates DynamoDB table"""
 
+    INDEXES = [
+        IndexSpec(None, 'id'),
+        IndexSpec('CreatedAtIndex', 'created_at'),
+        IndexSpec('TypeIndex', 'update_type', 'created_at'),
+    ]
+    SORT_FIELDS = ('id', 'created_at')
+
     def __init__(self):
-        """Initialize DynamoDB connection"""
-        self.dynamodb = boto3.resource('dynamodb')
-        table_name = os.environ.get('UPDATES_TABLE', 'turbotech-dev-updates')
-        self.table = self.dynamodb.Table(table_name)
-
-    def _decimal_to_python(self, obj):
-        """Convert DynamoDB Decimal types to Python types"""
-        if isinstance(obj, list):
-            return [self._decimal_to_python(i) for i in obj]
-        elif isinstance(obj, dict):
-            return {k: self._decimal_to_python(v) for k, v in obj.items()}
-        elif isinstance(obj, Decimal):
-            return int(obj) if obj % 1 == 0 else float(obj)
-        return obj
-
-    async def get_all(self, update_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Attach to the shared DynamoDB table handle"""
+        self.table = get_table('UPDATES_TABLE', 'turbotech-dev-updates')
+        self.cache = get_cache('updates')
+
+    async def get_all(
+        self,
+        update_type: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
         """Get all updates, optionally filtered by type"""
-        if update_type:
-            # Query by type using GSI
-            response = self.table.query(
-                IndexName='TypeIndex',
-                KeyConditionExpression=Key('update_type').eq(update_type),
-                ScanIndexForward=False  # Descending order (newest first)
-            )
-        else:
-            # Scan all updates
-            response = self.table.scan()
-
-        items = response.get('Items', [])
+        plan = plan_query(self.table, self.INDEXES, update_type=update_type)
+        items = await execute(plan.project(fields, self.SORT_FIELDS))
 
         # Sort by created_at descending (newest first)
         items.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-        return [self._decimal_to_python(item) for item in items]
+        return [to_python(item) for item in items]
+
+    async def iter_all(self, update_type: Optional[str] = None, fields: Optional[List[str]] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield updates page by page in DynamoDB order (for streaming responses)"""
+        plan = plan_query(self.table, self.INDEXES, update_type=update_type).project(fields, self.SORT_FIELDS)
+        async for items in iter_pages(plan.operation, **plan.kwargs):
+            yield [to_python(item) for item in items]
 
-    async def get_by_id(self, update_id: int) -> Optional[Dict[str, Any]]:
+    async def get_page(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        update_type: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get one page of updates (optionally by type) and the cursor for the next (in table order)"""
+        plan = plan_query(self.table, self.INDEXES, update_type=update_type).project(fields, self.SORT_FIELDS)
+        items, next_cursor = await fetch_page(plan.operation, plan.scope, limit, cursor, **plan.kwargs)
+        return [to_python(item) for item in items], next_cursor
+
+    async def get_by_id(self, update_id: int, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         """Get a specific update by ID"""
-        response = self.table.get_item(Key={'id': update_id})
+        cached = self.cache.get(update_id)
+        if cached is not None:
+            return select_fields(cached, fields)
+
+        response = await run_blocking(
+            self.table.get_item,
+            **apply_projection({'Key': {'id': update_id}}, fields)
+        )
         item = response.get('Item')
-        return self._decimal_to_python(item) if item else None
+        if not item:
+            return None
+
+        item = to_python(item)
+        if not fields:
+            self.cache.set(update_id, item)
+        return item
+
+    async def next_id(self) -> int:
+        """Allocate a unique ID for a new update"""
+        return await get_allocator('updates', self.table).next_id()
 
     async def create(self, update: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a new update"""
+        """Create a new update (the id changes if it is already taken)"""
         now = datetime.utcnow().isoformat()
         update['created_at'] = now
         update['updated_at'] = now
@@ -63,12 +94,16 @@ class UpdateAdapter:
         if 'read_by' not in update:
             update['read_by'] = []
 
-        self.table.put_item(Item=update)
-        return self._decimal_to_python(update)
+        update = await put_new_item(get_allocator('updates', self.table), update)
+        self.cache.invalidate(update['id'])
+        await bump_version('updates')
+        return to_python(update)
 
     async def acknowledge(self, update_id: int, user_id: int) -> Dict[str, Any]:
         """Add user to read_by list"""
-        response = self.table.update_item(
+        response = await write_existing(
+            self.table.update_item,
+            "Update not found",
             Key={'id': update_id},
             UpdateExpression="ADD read_by :user_id",
             ExpressionAttributeValues={
@@ -77,12 +112,32 @@ class UpdateAdapter:
             ReturnValues="ALL_NEW"
         )
 
-        return self._decimal_to_python(response.get('Attributes', {}))
+        updated = to_python(response.get('Attributes', {}))
+        self.cache.set(update_id, updated)
+        await bump_version('updates')
+        return updated
+
+    async def set_acknowledgements(self, update_id: int, acknowledgements: List[str]) -> None:
+        """Replace the acknowledgements list on an update"""
+        await run_blocking(
+            self.table.update_item,
+            Key={'id': update_id},
+            UpdateExpression="SET acknowledgements = :acks",
+            ExpressionAttributeValues={
+                ':acks': acknowledgements
+            }
+        )
+        self.cache.invalidate(update_id)
+        await bump_version('updates')
 
     async def delete(self, update_id: int) -> bool:
         """Delete an update"""
         try:
-            self.table.delete_item(Key={'id': update_id})
+            await write_existing(self.table.delete_item, "Update not found", Key={'id': update_id})
+            self.cache.invalidate(update_id)
+            await bump_version('updates')
             return True
+        except ItemNotFoundError:
+            raise
         except Exception:
             return False
@@ -1,56 +1,55 @@
 """
 DynamoDB Adapter for Users
 """
-import boto3
-import os
 from datetime import datetime
-from decimal import Decimal
-from typing import List, Dict, Any, Optional
-from boto3.dynamodb.conditions import Key
+from typing import Dict, Any, Optional
+from db.cache import get_cache
+from db.conditions import write_existing
+from db.convert import to_python
+from db.executor import run_blocking
+from db.planner import IndexSpec, execute, plan_query
+from db.session import get_table
+from db.versions import bump_version
 
 
 class UserAdapter:
     """Adapter for Users DynamoDB table"""
 
+    INDEXES = [
+        IndexSpec(None, 'id'),
+        IndexSpec('Auth0IdIndex', 'auth0_id'),
+        IndexSpec('EmailIndex', 'email'),
+    ]
+
     def __init__(self):
-        """Initialize DynamoDB connection"""
-        self.dynamodb = boto3.resource('dynamodb')
-        table_name = os.environ.get('USERS_TABLE', 'turbotech-dev-users')
-        self.table = self.dynamodb.Table(table_name)
-
-    def _decimal_to_python(self, obj):
-        """Convert DynamoDB Decimal types to Python types"""
-        if isinstance(obj, list):
-            return [self._decimal_to_python(i) for i in obj]
-        elif isinstance(obj, dict):
-            return {k: self._decimal_to_python(v) for k, v in obj.items()}
-        elif isinstance(obj, Decimal):
-            return int(obj) if obj % 1 == 0 else float(obj)
-        return obj
+        """Attach to the shared DynamoDB table handle"""
+        self.table = get_table('USERS_TABLE', 'turbotech-dev-users')
+        self.cache = get_cache('users')
 
     async def get_by_id(self, user_id: int) -> Optional[Dict[str, Any]]:
         """Get a user by ID"""
-        response = self.table.get_item(Key={'id': user_id})
+        cached = self.cache.get(user_id)
+        if cached is not None:
+            return cached
+
+        response = await run_blocking(self.table.get_item, Key={'id': user_id})
         item = response.get('Item')
-        return self._decimal_to_python(item) if item else None
+        if not item:
+            return None
+
+        item = to_python(item)
+        self.cache.set(user_id, item)
+        return item
 
     async def get_by_auth0_id(self, auth0_id: str) -> Optional[Dict[str, Any]]:
         """Get a user by Auth0 ID"""
-        response = self.table.query(
-            IndexName='Auth0IdIndex',
-            KeyConditionExpression=Key('auth0_id').eq(auth0_id)
-        )
-        items = response.get('Items', [])
-        return self._decimal_to_python(items[0]) if items else None
+        items = await execute(plan_query(self.table, self.INDEXES, auth0_id=auth0_id))
+        return to_python(items[0]) if items else None
 
     async def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """Get a user by email"""
-        response = self.table.query(
-            IndexName='EmailIndex',
-            KeyConditionExpression=Key('email').eq(email)
-        )
-        items = response.get('Items', [])
-        return self._decimal_to_python(items[0]) if items else None
+        items = await execute(plan_query(self.table, self.INDEXES, email=email))
+        return to_python(items[0]) if items else None
 
     async def create(self, user: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new user"""
@@ -58,8 +57,10 @@ class UserAdapter:
         user['created_at'] = now
         user['updated_at'] = now
 
-        self.table.put_item(Item=user)
-        return self._decimal_to_python(user)
+        await run_blocking(self.table.put_item, Item=user)
+        self.cache.invalidate(user['id'])
+        await bump_version('users')
+        return to_python(user)
 
     async def update(self, user_id: int, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update a user"""
@@ -83,7 +84,9 @@ class UserAdapter:
         expression_attribute_names['#updated_at'] = 'updated_at'
         expression_attribute_values[':updated_at'] = datetime.utcnow().isoformat()
 
-        response = self.table.update_item(
+        response = await write_existing(
+            self.table.update_item,
+            "User not found",
             Key={'id': user_id},
             UpdateExpression=update_expression,
             ExpressionAttributeNames=expression_attribute_names,
@@ -91,4 +94,7 @@ class UserAdapter:
             ReturnValues="ALL_NEW"
         )
 
-        return self._decimal_to_python(response.get('Attributes', {}))
+        updated = to_python(response.get('Attributes', {}))
+        self.cache.set(user_id, updated)
+        await bump_version('users')
+        return updated
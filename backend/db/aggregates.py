@@ -0,0 +1,150 @@
+"""
+Aggregate items maintained incrementally alongside base-table writes
+Each aggregate is one meta-table item (pk = 'aggregate#<name>') updated with atomic ADD deltas
+in the same TransactWriteItems as the write that changes it, so reads are a single GetItem
+
+Aggregates too rich for counters (pre-grouped views) are small documents rewritten whole
+under a revision check instead (replace_aggregate), and several can be read in one BatchGetItem.
+
+Writes made behind the adapters (bulk loads, manual edits) make an aggregate drift;
+each adapter exposes a rebuild that recomputes it from the base table.
+"""
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+from db.conditions import is_condition_failure
+from db.executor import run_blocking
+from db.ids import get_meta_table
+from db.session import get_client
+
+# botocore is imported on first use (routers importing this module load at startup)
+if TYPE_CHECKING:
+    from botocore.exceptions import ClientError
+
+Number = Union[int, Decimal]
+
+
+def aggregate_key(name: str) -> Dict[str, str]:
+    return {'pk': f'aggregate#{name}'}
+
+
+def diff_deltas(old: Dict[str, Number], new: Dict[str, Number]) -> Dict[str, Number]:
+    """Per-attribute change from old contributions to new ones, without zero entries"""
+    deltas = {}
+    for attr in set(old) | set(new):
+        delta = new.get(attr, 0) - old.get(attr, 0)
+        if delta:
+            deltas[attr] = delta
+    return deltas
+
+
+def add_deltas(name: str, deltas: Dict[str, Number]) -> Optional[Dict[str, Any]]:
+    """
+    TransactWriteItems entry that ADDs deltas to an aggregate (None when nothing changes)
+
+    It is conditional on the aggregate existing: ADD on a missing item would create
+    one holding only these deltas, which would then pass for a built aggregate. The
+    caller builds the aggregate when this condition cancels the transaction.
+    """
+    deltas = {attr: value for attr, value in deltas.items() if value}
+    if not deltas:
+        return None
+    names = {f'#a{i}': attr for i, attr in enumerate(deltas)}
+    values = {f':v{i}': value for i, value in enumerate(deltas.values())}
+    return {
+        'Update': {
+            'TableName': get_meta_table().name,
+            'Key': aggregate_key(name),
+            'UpdateExpression': 'ADD ' + ', '.join(f'#a{i} :v{i}' for i in range(len(deltas))),
+            'ConditionExpression': 'attribute_exists(pk)',
+            'ExpressionAttributeNames': names,
+            'ExpressionAttributeValues': values,
+        }
+    }
+
+
+def transaction_condition_failed(error: "ClientError", index: int = 0) -> bool:
+    """True if a TransactWriteItems was cancelled by the condition on item `index`"""
+    if error.response['Error']['Code'] != 'TransactionCanceledException':
+        return is_condition_failure(error)
+    reasons = error.response.get('CancellationReasons', [])
+    return len(reasons) > index and reasons[index].get('Code') == 'ConditionalCheckFailed'
+
+
+async def transact_write(items: List[Optional[Dict[str, Any]]]) -> None:
+    """Run the non-None entries as one transaction (through the resource client, so Python values work)"""
+    await run_blocking(get_client().transact_write_items, TransactItems=[item for item in items if item])
+
+
+async def get_aggregate(name: str, consistent: bool = False) -> Optional[Dict[str, Any]]:
+    """The aggregate's attributes (without pk), or None if it was never built"""
+    response = await run_blocking(get_meta_table().get_item, Key=aggregate_key(name), ConsistentRead=consistent)
+    item = response.get('Item')
+    if item is None:
+        return None
+    item.pop('pk', None)
+    return item
+
+
+async def get_aggregates(names: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Several aggregates in one BatchGetItem: {name: attributes without pk, or None if never built}"""
+    table_name = get_meta_table().name
+    request = {table_name: {'Keys': [aggregate_key(name) for name in names]}}
+    found = {}
+    while request:
+        response = await run_blocking(get_client().batch_get_item, RequestItems=request)
+        for item in response.get('Responses', {}).get(table_name, []):
+            found[item.pop('pk')] = item
+        # Throttled keys come back unprocessed; ask again for just those
+        request = response.get('UnprocessedKeys')
+    return {name: found.get(aggregate_key(name)['pk']) for name in names}
+
+
+async def replace_aggregate(name: str, values: Dict[str, Any], revision: Optional[int]) -> bool:
+    """
+    Rewrite a whole aggregate document if it is still at `revision` (None: only if it doesn't exist)
+
+    The stored revision is bumped on every replace. Returns False when another writer
+    got there first, in which case the caller re-reads and reapplies its change.
+    """
+    if revision is None:
+        condition = {'ConditionExpression': 'attribute_not_exists(pk)'}
+    else:
+        condition = {
+            'ConditionExpression': '#revision = :revision',
+            'ExpressionAttributeNames': {'#revision': 'revision'},
+            'ExpressionAttributeValues': {':revision': revision},
+        }
+    from botocore.exceptions import ClientError
+
+    item = {**aggregate_key(name), **values, 'revision': 0 if revision is None else revision + 1}
+    try:
+        await run_blocking(get_meta_table().put_item, Item=item, **condition)
+    except ClientError as e:
+        if is_condition_failure(e):
+            return False
+        raise
+    return True
+
+
+async def delete_aggregate(name: str) -> None:
+    """Drop an aggregate so the next read rebuilds it from the base table"""
+    await run_blocking(get_meta_table().delete_item, Key=aggregate_key(name))
+
+
+async def put_aggregate(name: str, values: Dict[str, Any], only_if_missing: bool = False) -> bool:
+    """
+    Replace an aggregate with freshly computed values
+
+    only_if_missing=True leaves an existing aggregate alone (returns False), so a
+    first-read build can't overwrite deltas a concurrent write already applied.
+    """
+    from botocore.exceptions import ClientError
+
+    kwargs = {'ConditionExpression': 'attribute_not_exists(pk)'} if only_if_missing else {}
+    try:
+        await run_blocking(get_meta_table().put_item, Item={**aggregate_key(name), **values}, **kwargs)
+    except ClientError as e:
+        if only_if_missing and is_condition_failure(e):
+            return False
+        raise
+    return True
@@ -0,0 +1,163 @@
+"""
+Read-through item cache for adapter get_by_id lookups
+In-process LRU with TTL; adapters invalidate entries on create/update/delete
+
+Each process (Lambda instance) has its own cache. Entries remember the table
+version (db/versions.py) current when their read started; once this instance
+sees a newer version, e.g. while computing an ETag, older entries are misses.
+Writes by other instances therefore show up as soon as their version bump is
+seen, and at most ITEM_CACHE_TTL seconds later otherwise.
+"""
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class ItemCache:
+    """Interface for item caches; also the no-op implementation (ITEM_CACHE_BACKEND=none)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached item, or None"""
+        self.misses += 1
+        return None
+
+    def set(self, key: Hashable, item: Dict[str, Any]) -> None:
+        """Store an item"""
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop one item"""
+
+    def clear(self) -> None:
+        """Drop every item"""
+
+    def observe_version(self, version: int) -> None:
+        """The table is now at `version`: entries read before it are stale"""
+
+    def __len__(self) -> int:
+        return 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            'backend': type(self).__name__,
+            'size': len(self),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+class LRUTTLCache(ItemCache):
+    """Size-bounded LRU cache whose entries expire ttl seconds after being stored"""
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        super().__init__(name)
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version = 0
+        self._items: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        # key -> table version when a miss sent the caller to the table
+        self._reads: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None or entry[0] < time.monotonic() or entry[2] < self.version:
+                if entry is not None:
+                    del self._items[key]
+                self.misses += 1
+                self._reads[key] = self.version
+                self._reads.move_to_end(key)
+                while len(self._reads) > self.maxsize:
+                    self._reads.popitem(last=False)
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            item = entry[1]
+        # Callers may mutate what they get back
+        return copy.deepcopy(item)
+
+    def set(self, key: Hashable, item: Dict[str, Any]) -> None:
+        item = copy.deepcopy(item)
+        with self._lock:
+            # A read that started before a newer version was seen is stored as already stale
+            version = self._reads.pop(key, self.version)
+            self._items[key] = (time.monotonic() + self.ttl, item, version)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def observe_version(self, version: int) -> None:
+        with self._lock:
+            self.version = max(self.version, version)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+_caches: Dict[str, ItemCache] = {}
+_lock = threading.Lock()
+
+
+def get_cache(name: str) -> ItemCache:
+    """
+    Get the process-wide item cache for a table
+
+    ITEM_CACHE_BACKEND selects the implementation ('memory' or 'none');
+    ITEM_CACHE_SIZE and ITEM_CACHE_TTL size the in-memory one.
+    """
+    cache = _caches.get(name)
+    if cache is None:
+        with _lock:
+            cache = _caches.get(name)
+            if cache is None:
+                backend = os.environ.get('ITEM_CACHE_BACKEND', 'memory')
+                if backend == 'none':
+                    cache = ItemCache(name)
+                else:
+                    cache = LRUTTLCache(
+                        name,
+                        maxsize=int(os.environ.get('ITEM_CACHE_SIZE', '1024')),
+                        ttl=float(os.environ.get('ITEM_CACHE_TTL', '10'))
+                    )
+                _caches[name] = cache
+    return cache
+
+
+def observe_version(name: str, version: int) -> None:
+    """Tell the cache for a table (if this process has one) that the table is at `version`"""
+    cache = _caches.get(name)
+    if cache is not None:
+        cache.observe_version(version)
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Counters for every cache created in this process"""
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+
+def clear_all() -> None:
+    """Empty every cache (used by benchmarks and scripts that write behind the adapters)"""
+    for cache in _caches.values():
+        cache.clear()
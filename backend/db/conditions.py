@@ -0,0 +1,45 @@
+"""
+Conditional writes for the DynamoDB adapters
+Folds the "does it exist?" check into the write itself, so update/delete take one round trip
+"""
+from typing import TYPE_CHECKING, Any, Callable, Dict
+from db.executor import run_blocking
+
+# botocore is imported on first use; main.py imports ItemNotFoundError at startup
+if TYPE_CHECKING:
+    from botocore.exceptions import ClientError
+
+ITEM_EXISTS = "attribute_exists(id)"
+
+
+class ItemNotFoundError(LookupError):
+    """Raised when a conditional update/delete targets an item that does not exist"""
+
+    def __init__(self, message: str, key: Any = None):
+        super().__init__(message)
+        self.key = key
+
+
+def is_condition_failure(error: "ClientError") -> bool:
+    return error.response['Error']['Code'] == 'ConditionalCheckFailedException'
+
+
+async def write_existing(
+    operation: Callable[..., Dict[str, Any]],
+    not_found: str,
+    **kwargs
+) -> Dict[str, Any]:
+    """
+    Run update_item/delete_item only if the item exists
+
+    A failed existence condition becomes ItemNotFoundError(not_found), which
+    main.py turns into a 404; any other error propagates unchanged.
+    """
+    from botocore.exceptions import ClientError
+
+    try:
+        return await run_blocking(operation, ConditionExpression=ITEM_EXISTS, **kwargs)
+    except ClientError as e:
+        if not is_condition_failure(e):
+            raise
+        raise ItemNotFoundError(not_found, kwargs.get('Key')) from None
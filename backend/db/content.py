@@ -0,0 +1,53 @@
+"""
+Editable JSON content documents in the meta table
+Each document (pk = 'content#<name>') holds the JSON text plus a revision that every
+publish bumps, so instances can poll the revision cheaply and pick up new content
+without a redeploy. scripts/publish_content.py uploads a document from a file.
+"""
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional
+from db.executor import run_blocking
+from db.ids import get_meta_table
+
+
+def content_key(name: str) -> Dict[str, str]:
+    return {'pk': f'content#{name}'}
+
+
+async def get_content_revision(name: str) -> Optional[int]:
+    """Revision of the published document, or None if it was never published"""
+    response = await run_blocking(
+        get_meta_table().get_item,
+        Key=content_key(name),
+        ProjectionExpression='#revision',
+        ExpressionAttributeNames={'#revision': 'revision'}
+    )
+    item = response.get('Item')
+    return int(item['revision']) if item else None
+
+
+async def get_content(name: str) -> Optional[Dict[str, Any]]:
+    """{'data': parsed document, 'revision', 'updated_at'}, or None if never published"""
+    response = await run_blocking(get_meta_table().get_item, Key=content_key(name), ConsistentRead=True)
+    item = response.get('Item')
+    if item is None:
+        return None
+    return {'data': json.loads(item['data']), 'revision': int(item['revision']), 'updated_at': item['updated_at']}
+
+
+async def put_content(name: str, data: Dict[str, Any]) -> int:
+    """Publish a document (stored as JSON text, so numbers keep their type) and return its new revision"""
+    response = await run_blocking(
+        get_meta_table().update_item,
+        Key=content_key(name),
+        UpdateExpression='SET #data = :data, updated_at = :now ADD #revision :one',
+        ExpressionAttributeNames={'#data': 'data', '#revision': 'revision'},
+        ExpressionAttributeValues={
+            ':data': json.dumps(data, ensure_ascii=False),
+            ':now': datetime.utcnow().isoformat(),
+            ':one': 1,
+        },
+        ReturnValues='UPDATED_NEW'
+    )
+    return int(response['Attributes']['revision'])
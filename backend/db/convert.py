@@ -0,0 +1,124 @@
+"""
+Attribute conversion shared by all adapters
+DynamoDB Decimals <-> plain Python numbers, plus decoding straight from the low-level wire format
+
+Conversion dispatches on the exact type of each value (one dict lookup) rather
+than walking an isinstance chain, and never re-enters through a bound method.
+Strings, the bulk of every item, fall straight through.
+"""
+from decimal import Decimal
+from typing import Any, Callable, Dict, List
+
+_EXACT = 2 ** 53
+
+
+def _decimal_to_number(value: Decimal):
+    """Whole Decimals become int, others float (Decimal('2.0') -> 2)"""
+    # float() is the cheapest Decimal operation; fall back to exact int() past 2**53
+    number = float(value)
+    if number.is_integer():
+        return int(number) if -_EXACT < number < _EXACT else int(value)
+    return number
+
+
+def _map_to_python(value: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: (convert(v) if (convert := _get_to_python(type(v))) else v) for k, v in value.items()}
+
+
+def _list_to_python(value: List[Any]) -> List[Any]:
+    return [convert(v) if (convert := _get_to_python(type(v))) else v for v in value]
+
+
+def _set_to_python(value: set) -> set:
+    return {convert(v) if (convert := _get_to_python(type(v))) else v for v in value}
+
+
+_TO_PYTHON: Dict[type, Callable[[Any], Any]] = {
+    dict: _map_to_python,
+    list: _list_to_python,
+    set: _set_to_python,
+    Decimal: _decimal_to_number,
+}
+_get_to_python = _TO_PYTHON.get
+
+
+def to_python(obj: Any) -> Any:
+    """Convert a boto3 resource item (or any value in one) to plain Python types"""
+    convert = _get_to_python(type(obj))
+    return convert(obj) if convert else obj
+
+
+def _float_to_decimal(value: float) -> Decimal:
+    return Decimal(str(value))
+
+
+def _map_to_dynamodb(value: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: (convert(v) if (convert := _get_to_dynamodb(type(v))) else v) for k, v in value.items()}
+
+
+def _list_to_dynamodb(value: List[Any]) -> List[Any]:
+    return [convert(v) if (convert := _get_to_dynamodb(type(v))) else v for v in value]
+
+
+def _set_to_dynamodb(value: set) -> set:
+    return {convert(v) if (convert := _get_to_dynamodb(type(v))) else v for v in value}
+
+
+# int and bool are left alone: boto3 serializes them natively, and converting
+# bool through str() would fail
+_TO_DYNAMODB: Dict[type, Callable[[Any], Any]] = {
+    dict: _map_to_dynamodb,
+    list: _list_to_dynamodb,
+    set: _set_to_dynamodb,
+    float: _float_to_decimal,
+}
+_get_to_dynamodb = _TO_DYNAMODB.get
+
+
+def to_dynamodb(obj: Any) -> Any:
+    """Convert Python values for the boto3 resource API (float -> Decimal)"""
+    convert = _get_to_dynamodb(type(obj))
+    return convert(obj) if convert else obj
+
+
+def parse_number(raw: str):
+    """Wire-format N string to int/float, matching _decimal_to_number"""
+    try:
+        return int(raw)
+    except ValueError:
+        value = float(raw)
+        if value.is_integer():
+            return int(value) if -_EXACT < value < _EXACT else int(Decimal(raw))
+        return value
+
+
+def _wire_map(raw: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    return {k: _FROM_WIRE[tag](v) for k, attr in raw.items() for tag, v in attr.items()}
+
+
+def _wire_list(raw: List[Dict[str, Any]]) -> List[Any]:
+    return [_FROM_WIRE[tag](v) for attr in raw for tag, v in attr.items()]
+
+
+_FROM_WIRE: Dict[str, Callable[[Any], Any]] = {
+    'S': str,
+    'N': parse_number,
+    'BOOL': bool,
+    'NULL': lambda raw: None,
+    'M': _wire_map,
+    'L': _wire_list,
+    'SS': set,
+    'NS': lambda raw: {parse_number(n) for n in raw},
+    'B': bytes,
+    'BS': set,
+}
+
+
+def from_wire(item: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Decode a low-level client item ({'name': {'S': 'x'}, ...}) directly to Python types
+
+    Equivalent to boto3's TypeDeserializer followed by to_python, without
+    building the intermediate Decimals.
+    """
+    return _wire_map(item)
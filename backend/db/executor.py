@@ -0,0 +1,92 @@
+"""
+Bounded executor for blocking DynamoDB calls
+Keeps boto3 round trips off the event loop and applies backpressure when saturated
+"""
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+from weakref import WeakKeyDictionary
+
+_lock = threading.Lock()
+_executor = None
+_semaphores: "WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = WeakKeyDictionary()
+
+
+class StorageBusyError(Exception):
+    """Raised when a DynamoDB call waits longer than DYNAMODB_QUEUE_TIMEOUT for a slot"""
+
+
+def max_workers() -> int:
+    """Number of threads issuing DynamoDB calls concurrently"""
+    return int(os.environ.get('DYNAMODB_MAX_WORKERS', '32'))
+
+
+def max_in_flight() -> int:
+    """Calls admitted at once (running + queued on the executor); the rest wait on the loop"""
+    return int(os.environ.get('DYNAMODB_MAX_IN_FLIGHT', str(max_workers() * 2)))
+
+
+def queue_timeout() -> float:
+    """Seconds a call may wait for admission before StorageBusyError (0 waits forever)"""
+    return float(os.environ.get('DYNAMODB_QUEUE_TIMEOUT', '10'))
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get the process-wide DynamoDB executor"""
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max_workers(),
+                    thread_name_prefix='dynamodb'
+                )
+    return _executor
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """Admission semaphore for the running event loop"""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max_in_flight())
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+async def run_blocking(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking boto3 call on the DynamoDB executor without stalling the event loop
+
+    Usage:
+        response = await run_blocking(self.table.get_item, Key={'id': item_id})
+    """
+    semaphore = _get_semaphore()
+    timeout = queue_timeout()
+    try:
+        if timeout > 0 and semaphore.locked():
+            await asyncio.wait_for(semaphore.acquire(), timeout)
+        else:
+            # A free slot is taken without suspending, so the call is submitted
+            # before the caller's task yields (the paginator relies on this)
+            await semaphore.acquire()
+    except asyncio.TimeoutError as exc:
+        raise StorageBusyError(f"DynamoDB executor saturated for {timeout}s") from exc
+
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_executor(), functools.partial(fn, *args, **kwargs))
+    finally:
+        semaphore.release()
+
+
+def shutdown():
+    """Stop the executor (called on application shutdown)"""
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
@@ -0,0 +1,168 @@
+"""
+Atomic ID allocation backed by counter items in the meta table
+Reserves blocks of IDs with a single UpdateItem ADD and hands them out locally
+
+Rows written with explicit ids behind the allocator (seed scripts, imports) can leave
+a counter behind the table; put_new_item never overwrites such a row, and moves the
+counter past it instead (scripts should call resync() after writing rows).
+"""
+import asyncio
+import logging
+import os
+from typing import Any, Dict
+from db.conditions import is_condition_failure
+from db.executor import run_blocking
+from db.scan import parallel_scan
+from db.session import get_table
+
+logger = logging.getLogger(__name__)
+
+_allocators: Dict[str, "IdAllocator"] = {}
+
+# Fresh ids tried by put_new_item before giving up
+ID_ATTEMPTS = 3
+
+
+def get_meta_table():
+    """Table holding counters and other per-table metadata items (pk = '<kind>#<name>')"""
+    return get_table('META_TABLE', 'turbotech-dev-meta')
+
+
+class IdAllocator:
+    """Hands out unique, increasing integer IDs for one table"""
+
+    def __init__(self, name: str, source_table, block_size: int = None):
+        """
+        name: counter name, stored as pk 'counter#<name>'
+        source_table: table whose max id seeds the counter the first time it is used
+        """
+        self.name = name
+        self.source_table = source_table
+        self.block_size = block_size or int(os.environ.get('ID_BLOCK_SIZE', '20'))
+        self._next = 1
+        self._last = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def key(self) -> Dict[str, str]:
+        return {'pk': f'counter#{self.name}'}
+
+    async def next_id(self) -> int:
+        """Return the next ID, reserving a new block when the local one is used up"""
+        async with self._lock:
+            if self._next > self._last:
+                await self._reserve_block()
+            next_id = self._next
+            self._next += 1
+            return next_id
+
+    async def _reserve_block(self):
+        """Atomically advance the counter by block_size and keep the reserved range"""
+        from botocore.exceptions import ClientError
+
+        try:
+            response = await run_blocking(
+                get_meta_table().update_item,
+                Key=self.key,
+                UpdateExpression="ADD last_id :n",
+                ConditionExpression="attribute_exists(pk)",
+                ExpressionAttributeValues={':n': self.block_size},
+                ReturnValues="UPDATED_NEW"
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            await self._seed_counter()
+            return await self._reserve_block()
+
+        last = int(response['Attributes']['last_id'])
+        self._next = last - self.block_size + 1
+        self._last = last
+
+    async def _max_id(self) -> int:
+        items = await parallel_scan(
+            self.source_table,
+            ProjectionExpression='#id',
+            ExpressionAttributeNames={'#id': 'id'}
+        )
+        return max((int(item.get('id', 0)) for item in items), default=0)
+
+    async def _seed_counter(self):
+        """Create the counter from the current max id (one-time scan per table)"""
+        from botocore.exceptions import ClientError
+
+        max_id = await self._max_id()
+
+        logger.info(f"Seeding ID counter '{self.name}' at {max_id}")
+        try:
+            await run_blocking(
+                get_meta_table().put_item,
+                Item={**self.key, 'last_id': max_id},
+                ConditionExpression="attribute_not_exists(pk)"
+            )
+        except ClientError as e:
+            # Another process seeded it first; its value is just as good
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+
+    async def resync(self) -> int:
+        """
+        Move the counter up to the table's current max id (never down) and drop the local block
+
+        Returns the max id. Call after writing rows with explicit ids; put_new_item
+        calls it when a fresh id turns out to be taken.
+        """
+        from botocore.exceptions import ClientError
+
+        max_id = await self._max_id()
+        async with self._lock:
+            self._next, self._last = 1, 0
+            try:
+                await run_blocking(
+                    get_meta_table().update_item,
+                    Key=self.key,
+                    UpdateExpression="SET last_id = :max",
+                    ConditionExpression="attribute_not_exists(last_id) OR last_id < :max",
+                    ExpressionAttributeValues={':max': max_id}
+                )
+            except ClientError as e:
+                # Already at or past it
+                if not is_condition_failure(e):
+                    raise
+        logger.info(f"Resynced ID counter '{self.name}' to at least {max_id}")
+        return max_id
+
+
+async def put_new_item(allocator: IdAllocator, item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Put an item under item['id'] only if that id is free
+
+    If the id is taken (the counter fell behind rows written without it), the
+    counter is resynced and the item retried under a fresh id; the item that
+    was stored is returned.
+    """
+    from botocore.exceptions import ClientError
+
+    for _ in range(ID_ATTEMPTS):
+        try:
+            await run_blocking(
+                allocator.source_table.put_item,
+                Item=item,
+                ConditionExpression="attribute_not_exists(id)"
+            )
+            return item
+        except ClientError as e:
+            if not is_condition_failure(e):
+                raise
+        logger.warning(f"ID {item['id']} already exists in '{allocator.name}'; resyncing its counter")
+        await allocator.resync()
+        item = {**item, 'id': await allocator.next_id()}
+    raise RuntimeError(f"Could not find a free ID for '{allocator.name}'; retry")
+
+
+def get_allocator(name: str, source_table) -> IdAllocator:
+    """Get the process-wide allocator for a counter name"""
+    allocator = _allocators.get(name)
+    if allocator is None:
+        allocator = _allocators[name] = IdAllocator(name, source_table)
+    return allocator
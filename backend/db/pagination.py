@@ -0,0 +1,236 @@
+"""
+Cursor-based pagination over DynamoDB Limit/ExclusiveStartKey
+Cursors are opaque, HMAC-signed and bound to the listing they came from
+
+Every instance must sign with the same key (PAGINATION_CURSOR_SECRET; the SAM template
+resolves it from Secrets Manager), or a cursor from one instance is rejected by the next.
+"""
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import os
+from decimal import Decimal
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from db.executor import run_blocking
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+_secret: Optional[bytes] = None
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor is malformed, tampered with, or used on a different listing"""
+
+
+class CursorSecretMissingError(RuntimeError):
+    """Raised when paging is used without PAGINATION_CURSOR_SECRET configured"""
+
+
+def _get_secret() -> bytes:
+    """Signing key from PAGINATION_CURSOR_SECRET; there is no per-process fallback"""
+    global _secret
+    if _secret is None:
+        configured = os.environ.get('PAGINATION_CURSOR_SECRET')
+        if not configured:
+            raise CursorSecretMissingError("PAGINATION_CURSOR_SECRET is not set; refusing to sign cursors")
+        _secret = configured.encode()
+    return _secret
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def _sign(scope: str, payload: str) -> str:
+    digest = hmac.new(_get_secret(), f"{scope}|{payload}".encode(), hashlib.sha256).digest()
+    return _b64encode(digest[:16])
+
+
+def _json_default(obj):
+    if isinstance(obj, Decimal):
+        return int(obj) if obj % 1 == 0 else str(obj)
+    raise TypeError(f"Cannot encode {type(obj).__name__} in cursor")
+
+
+def encode_cursor(last_evaluated_key: Optional[Dict[str, Any]], scope: str) -> Optional[str]:
+    """Turn a LastEvaluatedKey into an opaque cursor (None when there are no more pages)"""
+    if not last_evaluated_key:
+        return None
+    payload = _b64encode(json.dumps(last_evaluated_key, default=_json_default, separators=(',', ':')).encode())
+    return f"{payload}.{_sign(scope, payload)}"
+
+
+def decode_cursor(cursor: str, scope: str) -> Dict[str, Any]:
+    """Verify a cursor and return the ExclusiveStartKey it encodes"""
+    try:
+        payload, signature = cursor.split('.', 1)
+    except ValueError as exc:
+        raise InvalidCursorError("Malformed cursor") from exc
+
+    if not hmac.compare_digest(signature, _sign(scope, payload)):
+        raise InvalidCursorError("Invalid cursor")
+
+    try:
+        return json.loads(_b64decode(payload), parse_float=Decimal, parse_int=Decimal)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursorError("Malformed cursor") from exc
+
+
+async def fetch_page(
+    operation: Callable[..., Dict[str, Any]],
+    scope: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    **kwargs
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Fetch one page from a table scan/query and return (items, next_cursor)
+
+    scope identifies the listing (table, index and filter) so a cursor can't be
+    replayed against a different one. Items come in DynamoDB order (key order for
+    queries, hash order for scans); callers must not sort a page, since that would
+    suggest an order that doesn't hold across pages.
+
+    Usage:
+        items, next_cursor = await fetch_page(self.table.scan, 'meetings', limit, cursor)
+    """
+    kwargs['Limit'] = min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+    if cursor:
+        kwargs['ExclusiveStartKey'] = decode_cursor(cursor, scope)
+
+    response = await run_blocking(operation, **kwargs)
+    return response.get('Items', []), encode_cursor(response.get('LastEvaluatedKey'), scope)
+
+
+class ResultTooLargeError(Exception):
+    """Raised when a read crosses DYNAMODB_MAX_RESULT_ITEMS or DYNAMODB_MAX_RESULT_BYTES"""
+
+
+def prefetch_depth() -> int:
+    """Pages fetched ahead of the consumer (0 = strictly sequential)"""
+    return max(0, int(os.environ.get('DYNAMODB_PREFETCH_PAGES', '1')))
+
+
+class ResultBudget:
+    """
+    Hard item/byte ceiling for one logical read
+
+    Shared by every page (and every Scan segment) of the read. Bytes are the
+    response Content-Length, i.e. what DynamoDB actually sent.
+    """
+
+    def __init__(self, max_items: Optional[int] = None, max_bytes: Optional[int] = None):
+        if max_items is None:
+            max_items = int(os.environ.get('DYNAMODB_MAX_RESULT_ITEMS', '100000'))
+        if max_bytes is None:
+            max_bytes = int(os.environ.get('DYNAMODB_MAX_RESULT_BYTES', str(256 * 1024 * 1024)))
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.items = 0
+        self.bytes = 0
+
+    def charge(self, response: Dict[str, Any]) -> None:
+        self.items += len(response.get('Items', ()))
+        headers = response.get('ResponseMetadata', {}).get('HTTPHeaders', {})
+        self.bytes += int(headers.get('content-length', 0))
+        if self.max_items and self.items > self.max_items:
+            raise ResultTooLargeError(f"Read returned more than {self.max_items} items")
+        if self.max_bytes and self.bytes > self.max_bytes:
+            raise ResultTooLargeError(f"Read returned more than {self.max_bytes} bytes")
+
+
+_DONE = object()
+
+
+async def iter_responses(
+    operation: Callable[..., Dict[str, Any]],
+    prefetch: Optional[int] = None,
+    budget: Optional[ResultBudget] = None,
+    **kwargs
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield every response of a scan/query, following LastEvaluatedKey
+
+    With a prefetch depth above 0, a background task requests page N+1 while
+    the caller is still working on page N, and keeps up to that many pages
+    queued. Every page is charged to budget (a fresh ResultBudget by default).
+    """
+    prefetch = prefetch_depth() if prefetch is None else prefetch
+    budget = budget or ResultBudget()
+
+    if prefetch == 0:
+        response = await run_blocking(operation, **kwargs)
+        budget.charge(response)
+        yield response
+        while 'LastEvaluatedKey' in response:
+            response = await run_blocking(operation, ExclusiveStartKey=response['LastEvaluatedKey'], **kwargs)
+            budget.charge(response)
+            yield response
+        return
+
+    queue: asyncio.Queue = asyncio.Queue(maxsize=prefetch)
+
+    async def produce():
+        try:
+            response = await run_blocking(operation, **kwargs)
+            budget.charge(response)
+            await queue.put(response)
+            while 'LastEvaluatedKey' in response:
+                response = await run_blocking(operation, ExclusiveStartKey=response['LastEvaluatedKey'], **kwargs)
+                budget.charge(response)
+                await queue.put(response)
+            await queue.put(_DONE)
+        except Exception as e:
+            await queue.put(e)
+
+    producer = asyncio.get_running_loop().create_task(produce())
+    try:
+        while True:
+            response = await queue.get()
+            if response is _DONE:
+                return
+            if isinstance(response, Exception):
+                raise response
+            yield response
+    finally:
+        # Consumer stopped early (break, error, closed stream): stop fetching
+        producer.cancel()
+
+
+async def iter_pages(
+    operation: Callable[..., Dict[str, Any]],
+    prefetch: Optional[int] = None,
+    budget: Optional[ResultBudget] = None,
+    **kwargs
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Yield the items of each scan/query page as it arrives
+
+    Only the current page (plus prefetch queued ones) is held at a time, so
+    callers that stream their output keep memory bounded regardless of table size.
+
+    Usage:
+        async for items in iter_pages(self.table.scan):
+            ...
+    """
+    async for response in iter_responses(operation, prefetch, budget, **kwargs):
+        yield response.get('Items', [])
+
+
+async def collect(
+    operation: Callable[..., Dict[str, Any]],
+    budget: Optional[ResultBudget] = None,
+    **kwargs
+) -> List[Dict[str, Any]]:
+    """Read every page of a scan/query into one list"""
+    items: List[Dict[str, Any]] = []
+    async for page in iter_pages(operation, budget=budget, **kwargs):
+        items.extend(page)
+    return items
@@ -0,0 +1,95 @@
+"""
+Query planner for the DynamoDB adapters
+Turns equality filters into a key lookup, a GSI Query, or (last resort) a filtered Scan
+"""
+import logging
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+from db.pagination import collect
+from db.projection import apply_projection
+from db.scan import parallel_scan
+
+logger = logging.getLogger(__name__)
+
+
+class IndexSpec(NamedTuple):
+    """A queryable key: the table's primary key (name=None) or a GSI"""
+    name: Optional[str]
+    hash_key: str
+    range_key: Optional[str] = None
+
+
+class QueryPlan(NamedTuple):
+    """The chosen operation and the keyword arguments to call it with"""
+    table: Any
+    operation: Callable[..., Dict[str, Any]]
+    kwargs: Dict[str, Any]
+    index: Optional[str]
+    scope: str
+
+    @property
+    def is_scan(self) -> bool:
+        return self.index == 'scan'
+
+    def project(self, fields: Optional[List[str]], always: Sequence[str] = ('id',)) -> "QueryPlan":
+        """Same plan, reading only the selected attributes (plus always)"""
+        return self._replace(kwargs=apply_projection(self.kwargs, fields, always))
+
+
+def plan_query(table, indexes: Sequence[IndexSpec], **predicates) -> QueryPlan:
+    """
+    Pick the cheapest way to read items matching the equality predicates
+
+    Prefers an index whose hash and range keys are both constrained, then any index
+    whose hash key is constrained; leftover predicates become a FilterExpression.
+    Falls back to a Scan (and logs a warning) when no key matches.
+
+    Usage:
+        plan = plan_query(self.table, self.INDEXES, month=3)
+        items = await execute(plan)
+    """
+    # Imported here so importing the adapters doesn't pull in boto3 (cold start)
+    from boto3.dynamodb.conditions import Attr, Key
+
+    predicates = {k: v for k, v in predicates.items() if v is not None}
+    scope = ":".join([table.name] + [f"{k}={predicates[k]}" for k in sorted(predicates)])
+
+    best = None
+    for index in indexes:
+        if index.hash_key not in predicates:
+            continue
+        if best is None or (index.range_key in predicates and best.range_key not in predicates):
+            best = index
+
+    kwargs: Dict[str, Any] = {}
+    remaining = dict(predicates)
+
+    if best is not None:
+        key_condition = Key(best.hash_key).eq(remaining.pop(best.hash_key))
+        if best.range_key in remaining:
+            key_condition = key_condition & Key(best.range_key).eq(remaining.pop(best.range_key))
+        kwargs['KeyConditionExpression'] = key_condition
+        if best.name:
+            kwargs['IndexName'] = best.name
+        operation = table.query
+        index_name = best.name or 'table'
+    else:
+        if predicates:
+            logger.warning(f"No index on {table.name} for {sorted(predicates)}; falling back to Scan")
+        operation = table.scan
+        index_name = 'scan'
+
+    filter_expression = None
+    for attr, value in remaining.items():
+        condition = Attr(attr).eq(value)
+        filter_expression = condition if filter_expression is None else filter_expression & condition
+    if filter_expression is not None:
+        kwargs['FilterExpression'] = filter_expression
+
+    return QueryPlan(table, operation, kwargs, index_name, f"{scope}@{index_name}")
+
+
+async def execute(plan: QueryPlan) -> List[Dict[str, Any]]:
+    """Run a plan to completion: scans fan out over segments, queries go through the prefetching paginator"""
+    if plan.is_scan:
+        return await parallel_scan(plan.table, **plan.kwargs)
+    return await collect(plan.operation, **plan.kwargs)
@@ -0,0 +1,79 @@
+"""
+Sparse fieldsets for adapter reads
+Turns a fields=a,b,c selection into a DynamoDB ProjectionExpression with aliased attribute names
+"""
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+FIELD_NAME = re.compile(r'^[A-Za-z_][A-Za-z0-9_]{0,63}$')
+MAX_FIELDS = 50
+
+
+class InvalidFieldsError(ValueError):
+    """Raised when a fields= selection contains an invalid attribute name"""
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Parse a comma-separated fields parameter (None means all attributes)
+
+    Only top-level attribute names are accepted; they are always aliased, so
+    reserved words like 'status' or 'name' are safe.
+    """
+    if not fields:
+        return None
+
+    names = []
+    for name in fields.split(','):
+        name = name.strip()
+        if not name:
+            continue
+        if not FIELD_NAME.match(name):
+            raise InvalidFieldsError(f"Invalid field name: {name!r}")
+        if name not in names:
+            names.append(name)
+
+    if len(names) > MAX_FIELDS:
+        raise InvalidFieldsError(f"At most {MAX_FIELDS} fields may be requested")
+    return names or None
+
+
+def apply_projection(
+    kwargs: Dict[str, Any],
+    fields: Optional[List[str]],
+    always: Iterable[str] = ('id',)
+) -> Dict[str, Any]:
+    """
+    Return a copy of request kwargs with a ProjectionExpression for fields
+
+    always lists attributes the adapter needs regardless of the selection
+    (the key, and whatever it sorts on).
+    """
+    if not fields:
+        return kwargs
+
+    selected = list(fields) + [name for name in always if name not in fields]
+    names = dict(kwargs.get('ExpressionAttributeNames', {}))
+    placeholders = []
+    for i, name in enumerate(selected):
+        placeholder = f"#f{i}"
+        names[placeholder] = name
+        placeholders.append(placeholder)
+
+    return {
+        **kwargs,
+        'ProjectionExpression': ", ".join(placeholders),
+        'ExpressionAttributeNames': names
+    }
+
+
+def select_fields(
+    item: Dict[str, Any],
+    fields: Optional[List[str]],
+    always: Iterable[str] = ('id',)
+) -> Dict[str, Any]:
+    """Apply a fields selection to an item already in memory (e.g. from a cache)"""
+    if not fields:
+        return item
+    wanted = set(fields).union(always)
+    return {k: v for k, v in item.items() if k in wanted}
@@ -0,0 +1,118 @@
+"""
+Parallel segmented Scan for full-table reads
+Splits a Scan into Segment/TotalSegments slices that run concurrently on the DynamoDB executor
+"""
+import asyncio
+import functools
+import logging
+import math
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from db.executor import run_blocking
+from db.pagination import ResultBudget, collect, iter_responses
+from db.session import get_raw_client
+
+logger = logging.getLogger(__name__)
+
+# table name -> (expires_at, segment count)
+_segment_counts: Dict[str, Tuple[float, int]] = {}
+
+
+async def choose_segments(table) -> int:
+    """
+    Pick TotalSegments for a table
+
+    DYNAMODB_SCAN_SEGMENTS forces a fixed count. Otherwise one segment per
+    DYNAMODB_SCAN_SEGMENT_BYTES of table size (from DescribeTable, cached for
+    an hour), capped at DYNAMODB_SCAN_MAX_SEGMENTS.
+    """
+    forced = os.environ.get('DYNAMODB_SCAN_SEGMENTS')
+    if forced:
+        return max(1, int(forced))
+
+    cached = _segment_counts.get(table.name)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    bytes_per_segment = int(os.environ.get('DYNAMODB_SCAN_SEGMENT_BYTES', str(4 * 1024 * 1024)))
+    max_segments = int(os.environ.get('DYNAMODB_SCAN_MAX_SEGMENTS', '8'))
+    try:
+        response = await run_blocking(table.meta.client.describe_table, TableName=table.name)
+        size_bytes = response['Table'].get('TableSizeBytes', 0)
+        segments = min(max_segments, max(1, math.ceil(size_bytes / bytes_per_segment)))
+    except Exception as e:
+        logger.warning(f"DescribeTable failed for {table.name}, scanning with 1 segment: {e}")
+        segments = 1
+
+    _segment_counts[table.name] = (time.monotonic() + 3600, segments)
+    return segments
+
+
+async def _scan_segment(
+    scan,
+    segment: int,
+    total_segments: int,
+    kwargs: Dict[str, Any],
+    budget: ResultBudget
+) -> List[Dict[str, Any]]:
+    """Read every page of one segment (scan is table.scan or a low-level client scan)"""
+    if total_segments > 1:
+        kwargs = {**kwargs, 'Segment': segment, 'TotalSegments': total_segments}
+    return await collect(scan, budget=budget, **kwargs)
+
+
+async def _gather_segments(scan, total_segments: int, kwargs: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # One item/byte budget for the whole table, not per segment
+    budget = ResultBudget()
+    results = await asyncio.gather(*(
+        _scan_segment(scan, segment, total_segments, kwargs, budget)
+        for segment in range(total_segments)
+    ))
+
+    items = []
+    for segment_items in results:
+        items.extend(segment_items)
+    return items
+
+
+async def parallel_scan(table, segments: Optional[int] = None, **kwargs) -> List[Dict[str, Any]]:
+    """
+    Scan a whole table with concurrent segments and merge the results
+
+    Extra keyword arguments (FilterExpression, ProjectionExpression, ...) are passed to every Scan.
+
+    Usage:
+        items = await parallel_scan(self.table)
+    """
+    total_segments = segments or await choose_segments(table)
+    return await _gather_segments(table.scan, total_segments, kwargs)
+
+
+async def parallel_scan_raw(table, segments: Optional[int] = None, **kwargs) -> List[Dict[str, Any]]:
+    """
+    Same as parallel_scan, but through the plain low-level client
+
+    Items come back in DynamoDB wire format ({'title': {'S': '...'}}) without
+    boto3's TypeDeserializer; kwargs must use string expressions, not
+    boto3.dynamodb.conditions objects.
+    """
+    total_segments = segments or await choose_segments(table)
+    scan = functools.partial(get_raw_client().scan, TableName=table.name)
+    return await _gather_segments(scan, total_segments, kwargs)
+
+
+async def count_items(table, segments: Optional[int] = None) -> int:
+    """Count a table's items with a parallel Select=COUNT scan"""
+    total_segments = segments or await choose_segments(table)
+
+    async def count_segment(segment: int) -> int:
+        kwargs: Dict[str, Any] = {'Select': 'COUNT'}
+        if total_segments > 1:
+            kwargs.update(Segment=segment, TotalSegments=total_segments)
+        count = 0
+        async for response in iter_responses(table.scan, **kwargs):
+            count += response.get('Count', 0)
+        return count
+
+    return sum(await asyncio.gather(*(count_segment(s) for s in range(total_segments))))
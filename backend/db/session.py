@@ -0,0 +1,114 @@
+"""
+Shared DynamoDB session and connection pool
+One boto3 session per process; every adapter reuses its resource and table handles
+
+boto3 is imported on first use rather than at import time, so a cold start can
+import the app while the pre-warm hook (services/prewarm.py) opens the connection in parallel.
+"""
+import os
+import threading
+from typing import TYPE_CHECKING, Dict
+
+if TYPE_CHECKING:
+    import boto3
+    from botocore.config import Config
+
+_lock = threading.Lock()
+_session = None
+_resource = None
+_client = None
+_raw_client = None
+_tables: Dict[str, object] = {}
+
+
+def get_config() -> "Config":
+    """Build the botocore client config from environment variables"""
+    from botocore.config import Config
+
+    return Config(
+        max_pool_connections=int(os.environ.get('DYNAMODB_MAX_POOL_CONNECTIONS', '50')),
+        connect_timeout=float(os.environ.get('DYNAMODB_CONNECT_TIMEOUT', '2')),
+        read_timeout=float(os.environ.get('DYNAMODB_READ_TIMEOUT', '5')),
+        tcp_keepalive=os.environ.get('DYNAMODB_TCP_KEEPALIVE', 'true').lower() == 'true',
+        retries={
+            'max_attempts': int(os.environ.get('DYNAMODB_MAX_ATTEMPTS', '3')),
+            'mode': 'standard'
+        }
+    )
+
+
+def get_session() -> "boto3.session.Session":
+    """Get the process-wide boto3 session"""
+    global _session
+    if _session is None:
+        import boto3
+
+        with _lock:
+            if _session is None:
+                _session = boto3.session.Session()
+    return _session
+
+
+def get_resource():
+    """Get the shared DynamoDB service resource"""
+    global _resource
+    if _resource is None:
+        session = get_session()
+        with _lock:
+            if _resource is None:
+                _resource = session.resource('dynamodb', config=get_config())
+    return _resource
+
+
+def get_client():
+    """Get the low-level DynamoDB client (shares the resource's connection pool)"""
+    global _client
+    if _client is None:
+        _client = get_resource().meta.client
+    return _client
+
+
+def get_raw_client():
+    """
+    Get a plain low-level DynamoDB client that returns wire-format items
+
+    The resource's own client deserializes attribute values into Python types,
+    so fast paths that decode the wire format themselves need this one.
+    """
+    global _raw_client
+    if _raw_client is None:
+        session = get_session()
+        with _lock:
+            if _raw_client is None:
+                _raw_client = session.client('dynamodb', config=get_config())
+    return _raw_client
+
+
+def get_table(env_var: str, default: str):
+    """
+    Get a cached Table handle for the table named by env_var (or default)
+
+    Usage:
+        self.table = get_table('DELIVERABLES_TABLE', 'turbotech-dev-deliverables')
+    """
+    table_name = os.environ.get(env_var, default)
+    table = _tables.get(table_name)
+    if table is None:
+        resource = get_resource()
+        with _lock:
+            table = _tables.get(table_name)
+            if table is None:
+                table = resource.Table(table_name)
+                _tables[table_name] = table
+    return table
+
+
+def reset():
+    """Drop the cached session and handles (used by benchmarks and after config changes)"""
+    global _session, _resource, _client, _raw_client
+    with _lock:
+        _session = None
+        _resource = None
+        _client = None
+        _raw_client = None
+        _tables.clear()
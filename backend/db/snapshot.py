@@ -0,0 +1,149 @@
+"""
+Whole-table snapshots for small, read-heavy tables
+Keeps a decoded, pre-sorted copy of the table in memory with a monotonically increasing version
+
+Reads are served from memory. A snapshot older than SNAPSHOT_REFRESH_SECONDS is
+refreshed in the background while the current copy keeps serving; a local write
+marks it dirty so the next read on this instance waits for a fresh copy. Each copy
+also records the table version (db/versions.py) it was loaded at, and is marked
+dirty as soon as this instance sees a newer one, so writes made by other instances
+never sit behind an ETag for that newer version.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[], Awaitable[List[Dict[str, Any]]]]
+
+
+def snapshots_enabled() -> bool:
+    return os.environ.get('SNAPSHOT_ENABLED', 'true').lower() == 'true'
+
+
+class TableSnapshot:
+    """In-memory copy of one table; items are shared, so callers must treat them as read-only"""
+
+    def __init__(self, name: str, loader: Loader, refresh_seconds: float):
+        self.name = name
+        self.loader = loader
+        self.refresh_seconds = refresh_seconds
+        self.version = 0
+        self.table_version = 0
+        self._wanted_version = 0
+        self.items: List[Dict[str, Any]] = []
+        self.loaded_at: Optional[float] = None
+        self._dirty = True
+        self._refreshing: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def age(self) -> Optional[float]:
+        return time.monotonic() - self.loaded_at if self.loaded_at is not None else None
+
+    async def get(self) -> List[Dict[str, Any]]:
+        """Current items, loading synchronously only when missing or dirty"""
+        if self._dirty:
+            await self.refresh()
+        elif self.age > self.refresh_seconds:
+            self.refresh_in_background()
+        return self.items
+
+    async def refresh(self) -> None:
+        """Reload the table (concurrent callers share one load)"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        version = self.version
+        async with self._lock:
+            if self.version != version and not self._dirty:
+                return  # someone else refreshed while we waited
+            self._dirty = False
+            table_version = self._wanted_version
+            try:
+                items = await self.loader()
+            except Exception:
+                self._dirty = self.loaded_at is None
+                raise
+            self.items = items
+            self.table_version = table_version
+            self.loaded_at = time.monotonic()
+            self.version += 1
+
+    def refresh_in_background(self) -> None:
+        """Start a refresh unless one is already running"""
+        if self._refreshing is not None and not self._refreshing.done():
+            return
+        self._refreshing = asyncio.get_running_loop().create_task(self._background_refresh())
+
+    async def _background_refresh(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning(f"Background refresh of {self.name} snapshot failed: {e}")
+
+    def invalidate(self) -> None:
+        """Mark dirty after a local write"""
+        self._dirty = True
+
+    def observe_version(self, version: int) -> None:
+        """The table is now at `version`: reload before the next read if this copy is older"""
+        if version > self._wanted_version:
+            self._wanted_version = version
+        if version > self.table_version:
+            self._dirty = True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'version': self.version,
+            'table_version': self.table_version,
+            'items': len(self.items),
+            'age_seconds': round(self.age, 3) if self.age is not None else None,
+            'dirty': self._dirty
+        }
+
+
+_snapshots: Dict[str, TableSnapshot] = {}
+
+
+def get_snapshot(name: str, loader: Loader) -> Optional[TableSnapshot]:
+    """
+    Get the process-wide snapshot for a table, or None when SNAPSHOT_ENABLED=false
+
+    The loader from the first caller is kept; it should read the whole table and
+    return decoded items in the adapter's default order.
+    """
+    if not snapshots_enabled():
+        return None
+    snapshot = _snapshots.get(name)
+    if snapshot is None:
+        snapshot = _snapshots[name] = TableSnapshot(
+            name,
+            loader,
+            refresh_seconds=float(os.environ.get('SNAPSHOT_REFRESH_SECONDS', '30'))
+        )
+    return snapshot
+
+
+def observe_version(name: str, version: int) -> None:
+    """Tell the snapshot for a table (if this process has one) that the table is at `version`"""
+    snapshot = _snapshots.get(name)
+    if snapshot is not None:
+        snapshot.observe_version(version)
+
+
+async def refresh_loop() -> None:
+    """Periodically refresh every loaded snapshot (started from main.py on startup)"""
+    interval = float(os.environ.get('SNAPSHOT_REFRESH_SECONDS', '30'))
+    while True:
+        await asyncio.sleep(interval)
+        for snapshot in list(_snapshots.values()):
+            if snapshot.loaded_at is not None and snapshot.age >= interval:
+                await snapshot._background_refresh()
+
+
+def snapshot_stats() -> Dict[str, Dict[str, Any]]:
+    """Version and freshness of every snapshot in this process"""
+    return {name: snapshot.stats() for name, snapshot in _snapshots.items()}
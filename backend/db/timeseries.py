@@ -0,0 +1,290 @@
+"""
+Append-only time series with hourly and daily rollups
+Samples are never overwritten; reads over long ranges come from pre-aggregated rollups
+
+Layout in one table (pk / sk, both strings):
+    raw sample     <series>#raw#<YYYY-MM-DD>    <YYYY-MM-DDTHH:MM:SS.ffffff>#<suffix>
+    hourly rollup  <series>#hour#<YYYY-MM>      <YYYY-MM-DDTHH>
+    daily rollup   <series>#day#<YYYY>          <YYYY-MM-DD>
+
+Raw partitions are per series per day, so writes spread across partitions and a range
+read is one Query per day touched; rollup partitions are coarser because they are small.
+Rollups hold count/sum/min/max/first/last and are recomputed (not incremented) from the
+level below as part of each append. Samples are append-only, so a recompute that saw fewer
+samples than the stored rollup is stale and is discarded. An append whose rollup failed
+leaves its buckets behind; reads compute the newest buckets from raw samples when they
+have no rollup, and scripts/downsample_metrics.py repairs the rest.
+
+All timestamps are naive UTC, like the adapters' created_at/updated_at.
+"""
+import asyncio
+import logging
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+from db.conditions import is_condition_failure
+from db.convert import to_dynamodb, to_python
+from db.executor import run_blocking
+from db.pagination import collect
+from db.session import get_table
+
+logger = logging.getLogger(__name__)
+
+RESOLUTIONS = ('raw', 'hour', 'day')
+STEPS = {'hour': timedelta(hours=1), 'day': timedelta(days=1)}
+_SAMPLE_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+# Rollup sort key and partition bucket formats per resolution
+_ROLLUP_FORMATS = {'hour': ('%Y-%m-%dT%H', '%Y-%m'), 'day': ('%Y-%m-%d', '%Y')}
+
+_stores: Dict[str, "TimeSeriesStore"] = {}
+
+
+class InvalidRangeError(ValueError):
+    """Raised for history reads with an empty, reversed or too-wide range, or an unknown resolution"""
+
+
+def utc_naive(value: datetime) -> datetime:
+    """Aware datetimes converted to UTC and made naive; naive ones are taken as UTC already"""
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+def bucket_start(at: datetime, resolution: str) -> datetime:
+    """Start of the hour or day containing `at`"""
+    if resolution == 'hour':
+        return at.replace(minute=0, second=0, microsecond=0)
+    return at.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def choose_resolution(start: datetime, end: datetime) -> str:
+    """
+    Coarsest resolution that still gives METRIC_HISTORY_MIN_POINTS points over the range
+
+    A 90-day chart reads ~90 daily rollups instead of every sample; a 6-hour one falls
+    through to raw samples.
+    """
+    min_points = int(os.environ.get('METRIC_HISTORY_MIN_POINTS', '24'))
+    for resolution in ('day', 'hour'):
+        if (end - start) / STEPS[resolution] >= min_points:
+            return resolution
+    return 'raw'
+
+
+def _partition_starts(start: datetime, end: datetime, resolution: str) -> List[datetime]:
+    """First instant of every partition overlapping [start, end): days, months or years"""
+    last = end - timedelta(microseconds=1)
+    if resolution == 'raw':
+        day = bucket_start(start, 'day')
+        starts = []
+        while day <= last:
+            starts.append(day)
+            day += timedelta(days=1)
+        return starts
+    if resolution == 'hour':
+        months = []
+        year, month = start.year, start.month
+        while (year, month) <= (last.year, last.month):
+            months.append(datetime(year, month, 1))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return months
+    return [datetime(year, 1, 1) for year in range(start.year, last.year + 1)]
+
+
+def _single(value: Decimal) -> Dict[str, Any]:
+    """Rollup stand-in for one sample (as stored, so values are Decimal)"""
+    return {'count': 1, 'sum': value, 'min': value, 'max': value, 'first': value, 'last': value}
+
+
+def _point(timestamp: str, rollup: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'timestamp': timestamp,
+        'count': rollup['count'],
+        'avg': rollup['sum'] / rollup['count'],
+        'min': rollup['min'],
+        'max': rollup['max'],
+        'first': rollup['first'],
+        'last': rollup['last'],
+    }
+
+
+def _combine(rollups: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge rollups (or single-sample stand-ins) given in time order into one; inputs as stored (Decimal)"""
+    return {
+        'count': sum(r['count'] for r in rollups),
+        'sum': sum((r['sum'] for r in rollups), Decimal(0)),
+        'min': min(r['min'] for r in rollups),
+        'max': max(r['max'] for r in rollups),
+        'first': rollups[0]['first'],
+        'last': rollups[-1]['last'],
+    }
+
+
+class TimeSeriesStore:
+    """Append-only samples and rollups for any number of series in one table"""
+
+    def __init__(self, table):
+        self.table = table
+        self.retention_days = int(os.environ.get('METRIC_SAMPLE_RETENTION_DAYS', '90'))
+        self.max_raw_days = int(os.environ.get('METRIC_HISTORY_MAX_RAW_DAYS', '31'))
+
+    @staticmethod
+    def partition_key(series: str, resolution: str, at: datetime) -> str:
+        if resolution == 'raw':
+            return f"{series}#raw#{at:%Y-%m-%d}"
+        return f"{series}#{resolution}#{at.strftime(_ROLLUP_FORMATS[resolution][1])}"
+
+    @staticmethod
+    def sort_key(resolution: str, at: datetime) -> str:
+        if resolution == 'raw':
+            return at.strftime(_SAMPLE_FORMAT)
+        return at.strftime(_ROLLUP_FORMATS[resolution][0])
+
+    async def append(self, series: str, value: Any, at: Optional[datetime] = None, **attrs) -> Dict[str, Any]:
+        """
+        Store one sample, then recompute its hour and day rollups before returning
+
+        The random suffix keeps samples with the same timestamp apart; raw samples
+        expire after METRIC_SAMPLE_RETENTION_DAYS (0 keeps them) while rollups are kept.
+        A failed rollup is logged rather than raised: the sample is already stored.
+        """
+        at = utc_naive(at or datetime.utcnow())
+        sample = {
+            'pk': self.partition_key(series, 'raw', at),
+            'sk': f"{self.sort_key('raw', at)}#{uuid.uuid4().hex[:8]}",
+            'timestamp': at.isoformat(),
+            'value': value,
+            **attrs,
+        }
+        if self.retention_days:
+            sample['expires_at'] = int(time.time()) + self.retention_days * 86400
+        sample = to_dynamodb(sample)
+        await run_blocking(self.table.put_item, Item=sample)
+        try:
+            await self.downsample(series, at)
+        except Exception as e:
+            logger.warning(f"Downsampling {series} at {at.isoformat()} failed: {e}")
+        return to_python(sample)
+
+    async def _query(self, pk: str, low: str, high: str, consistent: bool = False) -> List[Dict[str, Any]]:
+        """Items in one partition with low <= sk <= high, as stored (DynamoDB types)"""
+        from boto3.dynamodb.conditions import Key
+
+        return await collect(
+            self.table.query,
+            KeyConditionExpression=Key('pk').eq(pk) & Key('sk').between(low, high),
+            ConsistentRead=consistent
+        )
+
+    async def _fetch(self, series: str, start: datetime, end: datetime, resolution: str) -> List[Dict[str, Any]]:
+        """Stored items for [start, end) oldest first, one Query per partition touched (run concurrently)"""
+        last = end - timedelta(microseconds=1)
+        if resolution == 'raw':
+            low, high = self.sort_key('raw', start), self.sort_key('raw', end)
+        else:
+            low, high = self.sort_key(resolution, start), self.sort_key(resolution, last)
+        pages = await asyncio.gather(*[
+            self._query(self.partition_key(series, resolution, partition), low, high)
+            for partition in _partition_starts(start, end, resolution)
+        ])
+        return [item for page in pages for item in page]
+
+    async def read(self, series: str, start: datetime, end: datetime, resolution: str) -> List[Dict[str, Any]]:
+        """
+        Points in [start, end) oldest first, one Query per partition touched (run concurrently)
+
+        Raw points are {'timestamp', 'value'}; rollup points are {'timestamp' (bucket start),
+        'count', 'avg', 'min', 'max', 'first', 'last'} for every bucket overlapping the range.
+        Buckets newer than the newest stored rollup, within the last day of the range, are
+        computed from raw samples so a value whose rollup has not landed still shows.
+        """
+        if resolution not in RESOLUTIONS:
+            raise InvalidRangeError(f"resolution must be one of: auto, {', '.join(RESOLUTIONS)}")
+        if start >= end:
+            raise InvalidRangeError("'from' must be before 'to'")
+        if resolution == 'raw' and end - start > timedelta(days=self.max_raw_days):
+            raise InvalidRangeError(
+                f"Raw samples can be read {self.max_raw_days} days at a time; use resolution=hour or day"
+            )
+
+        items = await self._fetch(series, start, end, resolution)
+        if resolution == 'raw':
+            return [to_python({'timestamp': item['timestamp'], 'value': item['value']}) for item in items]
+        points = [to_python(_point(item['timestamp'], item)) for item in items]
+
+        tail = bucket_start(max(start, end - STEPS['day']), resolution)
+        if points:
+            tail = max(tail, datetime.fromisoformat(points[-1]['timestamp']) + STEPS[resolution])
+        if tail < end:
+            points.extend(await self._points_from_raw(series, tail, end, resolution))
+        return points
+
+    async def _points_from_raw(
+        self,
+        series: str,
+        start: datetime,
+        end: datetime,
+        resolution: str
+    ) -> List[Dict[str, Any]]:
+        """Rollup points for [start, end) computed from raw samples, for buckets not rolled up yet"""
+        buckets: Dict[datetime, List[Dict[str, Any]]] = {}
+        for sample in await self._fetch(series, start, end, 'raw'):
+            bucket = bucket_start(datetime.fromisoformat(sample['timestamp']), resolution)
+            buckets.setdefault(bucket, []).append(_single(sample['value']))
+        return [to_python(_point(bucket.isoformat(), _combine(buckets[bucket]))) for bucket in sorted(buckets)]
+
+    async def _put_rollup(self, series: str, resolution: str, at: datetime, rollup: Dict[str, Any]) -> None:
+        """Write a rollup unless the stored one was computed from at least as many samples"""
+        from botocore.exceptions import ClientError
+
+        item = {
+            'pk': self.partition_key(series, resolution, at),
+            'sk': self.sort_key(resolution, at),
+            'timestamp': at.isoformat(),
+            **rollup,
+        }
+        try:
+            await run_blocking(
+                self.table.put_item,
+                Item=to_dynamodb(item),
+                ConditionExpression='attribute_not_exists(pk) OR #count <= :count',
+                ExpressionAttributeNames={'#count': 'count'},
+                ExpressionAttributeValues={':count': rollup['count']},
+            )
+        except ClientError as e:
+            if not is_condition_failure(e):
+                raise
+
+    async def downsample(self, series: str, at: datetime) -> None:
+        """Recompute the hourly rollup for the hour containing `at`, then that day's rollup from its hours"""
+        hour = bucket_start(utc_naive(at), 'hour')
+        day = bucket_start(hour, 'day')
+
+        samples = await self._query(
+            self.partition_key(series, 'raw', hour),
+            self.sort_key('raw', hour),
+            self.sort_key('raw', hour + STEPS['hour']),
+            consistent=True  # must include the sample append() just wrote
+        )
+        if samples:
+            await self._put_rollup(series, 'hour', hour, _combine([_single(s['value']) for s in samples]))
+
+        hours = await self._query(
+            self.partition_key(series, 'hour', day),
+            self.sort_key('hour', day),
+            self.sort_key('hour', day + STEPS['day'] - STEPS['hour']),
+            consistent=True
+        )
+        if hours:
+            await self._put_rollup(series, 'day', day, _combine(hours))
+
+
+def get_timeseries(env_var: str, default: str) -> TimeSeriesStore:
+    """Process-wide store for the table named by env_var (or default)"""
+    table = get_table(env_var, default)
+    store = _stores.get(table.name)
+    if store is None or store.table is not table:
+        store = _stores[table.name] = TimeSeriesStore(table)
+    return store
+
@@ -0,0 +1,84 @@
+"""
+DynamoDB wire format -> HTTP JSON transcoder for read-only list endpoints
+Writes {"S": ...}/{"N": ...} attribute values straight into JSON text, skipping
+TypeDeserializer, Decimal conversion and FastAPI's jsonable_encoder
+
+Opt in with LIST_TRANSCODE=true. Sets are sorted the way FastJSONResponse sorts
+them, so output matches the regular path except that numbers keep DynamoDB's
+canonical text.
+"""
+import base64
+import json
+import os
+import re
+from json.encoder import encode_basestring
+from typing import Any, Callable, Dict, List, Optional
+from db.convert import parse_number
+
+# DynamoDB returns canonical numbers, which are valid JSON as-is
+JSON_NUMBER = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?\Z')
+
+
+def transcoding_enabled() -> bool:
+    return os.environ.get('LIST_TRANSCODE', 'false').lower() == 'true'
+
+
+def _number(raw: str) -> str:
+    return raw if JSON_NUMBER.match(raw) else json.dumps(parse_number(raw))
+
+
+def _map(raw: Dict[str, Dict[str, Any]]) -> str:
+    return "{" + ",".join(
+        encode_basestring(k) + ":" + _ENCODERS[tag](v)
+        for k, attr in raw.items() for tag, v in attr.items()
+    ) + "}"
+
+
+def _list(raw: List[Dict[str, Any]]) -> str:
+    return "[" + ",".join(_ENCODERS[tag](v) for attr in raw for tag, v in attr.items()) + "]"
+
+
+def _binary(raw: bytes) -> str:
+    return '"' + base64.b64encode(raw).decode('ascii') + '"'
+
+
+_ENCODERS: Dict[str, Callable[[Any], str]] = {
+    'S': encode_basestring,
+    'N': _number,
+    'BOOL': lambda raw: 'true' if raw else 'false',
+    'NULL': lambda raw: 'null',
+    'M': _map,
+    'L': _list,
+    # Sets arrive in arbitrary wire order; sort them like api/responses.py does
+    'SS': lambda raw: "[" + ",".join(encode_basestring(s) for s in sorted(raw)) + "]",
+    'NS': lambda raw: "[" + ",".join(_number(n) for n in sorted(raw, key=parse_number)) + "]",
+    'B': _binary,
+    'BS': lambda raw: "[" + ",".join(_binary(b) for b in sorted(raw)) + "]",
+}
+
+
+def encode_item(item: Dict[str, Dict[str, Any]]) -> str:
+    """One wire-format item as a JSON object"""
+    return _map(item)
+
+
+def render_list(
+    collection: str,
+    items: List[Dict[str, Dict[str, Any]]],
+    next_cursor: Optional[str] = None
+) -> bytes:
+    """
+    Encode a list response body: {"<collection>": [...], "total": n, "next_cursor": ...}
+
+    Usage:
+        items = await adapter.get_all_raw(fields=selected)
+        return Response(render_list("meetings", items), media_type="application/json")
+    """
+    parts = [
+        '{', encode_basestring(collection), ':[',
+        ",".join(map(encode_item, items)),
+        '],"total":', str(len(items)),
+        ',"next_cursor":', encode_basestring(next_cursor) if next_cursor else 'null',
+        '}'
+    ]
+    return "".join(parts).encode('utf-8')
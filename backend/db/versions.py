@@ -0,0 +1,98 @@
+"""
+Per-table version counters in the meta table
+Every adapter write bumps its table's counter; conditional GETs derive ETags from them
+
+Counters live in the meta table (pk = 'version#<name>') so all instances agree.
+Reads are cached in-process for TABLE_VERSION_TTL seconds; local writes update
+the cache immediately. Every version read or bumped is passed on to the table's
+item cache and snapshot, which drop what they loaded at an older version, so a
+body served under an ETag is never older than the version the ETag names.
+"""
+import logging
+import os
+import time
+from typing import Dict, Iterable, Tuple
+from db import cache, snapshot
+from db.executor import run_blocking
+from db.ids import get_meta_table
+from db.session import get_resource
+
+logger = logging.getLogger(__name__)
+
+# name -> (expires_at, version)
+_versions: Dict[str, Tuple[float, int]] = {}
+
+
+def _ttl() -> float:
+    return float(os.environ.get('TABLE_VERSION_TTL', '1'))
+
+
+def _key(name: str) -> Dict[str, str]:
+    return {'pk': f'version#{name}'}
+
+
+def _observe(name: str, version: int) -> None:
+    cache.observe_version(name, version)
+    snapshot.observe_version(name, version)
+
+
+async def bump_version(name: str) -> None:
+    """
+    Record a write to a table
+
+    Failures are logged rather than raised: the write itself already succeeded,
+    and failing the request would invite a retry of a non-idempotent create.
+    """
+    try:
+        response = await run_blocking(
+            get_meta_table().update_item,
+            Key=_key(name),
+            UpdateExpression="ADD version :one",
+            ExpressionAttributeValues={':one': 1},
+            ReturnValues="UPDATED_NEW"
+        )
+    except Exception as e:
+        logger.error(f"Failed to bump version for {name}; ETags may be stale until the next write: {e}")
+        _versions.pop(name, None)
+        return
+    version = int(response['Attributes']['version'])
+    _versions[name] = (time.monotonic() + _ttl(), version)
+    _observe(name, version)
+
+
+async def get_versions(names: Iterable[str]) -> Dict[str, int]:
+    """Current version of each table (0 if never written), one BatchGetItem for any not cached"""
+    now = time.monotonic()
+    names = list(dict.fromkeys(names))
+    result = {}
+    missing = []
+    for name in names:
+        cached = _versions.get(name)
+        if cached and cached[0] > now:
+            result[name] = cached[1]
+        else:
+            missing.append(name)
+
+    if missing:
+        table_name = get_meta_table().name
+        response = await run_blocking(
+            get_resource().batch_get_item,
+            RequestItems={table_name: {
+                'Keys': [_key(name) for name in missing],
+                'ProjectionExpression': 'pk, version'
+            }}
+        )
+        if response.get('UnprocessedKeys'):
+            # Guessing 0 here could produce a stale 304; let the caller skip the ETag
+            raise RuntimeError("Table versions unavailable (throttled)")
+        found = {
+            item['pk'].split('#', 1)[1]: int(item.get('version', 0))
+            for item in response.get('Responses', {}).get(table_name, [])
+        }
+        expires = time.monotonic() + _ttl()
+        for name in missing:
+            result[name] = found.get(name, 0)
+            _versions[name] = (expires, result[name])
+            _observe(name, result[name])
+
+    return result
@@ -2,12 +2,22 @@
 TurboTech Portal - FastAPI Backend
 Main application entry point
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+import asyncio
+import importlib
 import logging
 import os
+import threading
 
-from api import health, deliverables, metrics, updates, sample_projects, action_items, meetings, jerry
+from api.compression import CompressionMiddleware
+from api.responses import FastJSONResponse
+from db import executor, snapshot, timeseries
+from db.conditions import ItemNotFoundError
+from db.pagination import CursorSecretMissingError, InvalidCursorError, ResultTooLargeError
+from db.projection import InvalidFieldsError
+from services import prewarm
 
 # Configure logging
 logging.basicConfig(
@@ -16,13 +26,33 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+class PortalAPI(FastAPI):
+    """
+    FastAPI app whose routers are mounted during startup (see ROUTERS)
+
+    Clients that skip the lifespan (a plain TestClient(app), or a tool that only
+    builds the OpenAPI schema) get them mounted on first use instead.
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "lifespan" and not getattr(self.state, "routers_included", False):
+            await asyncio.to_thread(include_routers)
+        await super().__call__(scope, receive, send)
+
+    def openapi(self):
+        include_routers()
+        return super().openapi()
+
+
 # Create FastAPI app
-app = FastAPI(
+app = PortalAPI(
     title="TurboTech Portal API",
     description="Real-time project tracking and transparency portal for TurboTech",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=FastJSONResponse
 )
 
 # CORS configuration
@@ -46,15 +76,100 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include routers
-app.include_router(health.router, prefix="/api", tags=["Health"])
-app.include_router(deliverables.router, prefix="/api/deliverables", tags=["Deliverables"])
-app.include_router(metrics.router, prefix="/api/metrics", tags=["Metrics"])
-app.include_router(updates.router, prefix="/api/updates", tags=["Updates"])
-app.include_router(sample_projects.router, prefix="/api/sample-projects", tags=["Sample Projects"])
-app.include_router(action_items.router, prefix="/api/action-items", tags=["Action Items"])
-app.include_router(meetings.router, prefix="/api/meetings", tags=["Meetings"])
-app.include_router(jerry.router, prefix="/api/jerry", tags=["Jerry AI"])
+# Added last so it wraps CORS and sees final headers
+if os.environ.get('COMPRESSION_ENABLED', 'true').lower() == 'true':
+    app.add_middleware(CompressionMiddleware)
+
+
+@app.exception_handler(executor.StorageBusyError)
+async def storage_busy_handler(request: Request, exc: executor.StorageBusyError):
+    """Shed load with 503 when the DynamoDB executor is saturated"""
+    logger.warning(f"Storage busy: {request.method} {request.url.path}: {exc}")
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Service busy, please retry"},
+        headers={"Retry-After": "1"}
+    )
+
+
+@app.exception_handler(ItemNotFoundError)
+async def item_not_found_handler(request: Request, exc: ItemNotFoundError):
+    """Conditional update/delete hit a missing item"""
+    return JSONResponse(status_code=404, content={"detail": str(exc)})
+
+
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    """Reject cursors that fail signature or scope checks"""
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+@app.exception_handler(CursorSecretMissingError)
+async def cursor_secret_missing_handler(request: Request, exc: CursorSecretMissingError):
+    """Paging without a shared signing key would hand out cursors other instances reject"""
+    logger.error(f"{request.method} {request.url.path}: {exc}")
+    return JSONResponse(status_code=500, content={"detail": "Paging is not configured"})
+
+
+@app.exception_handler(ResultTooLargeError)
+async def result_too_large_handler(request: Request, exc: ResultTooLargeError):
+    """A single read crossed the configured item/byte ceiling; the client should page"""
+    logger.warning(f"Result too large: {request.method} {request.url.path}: {exc}")
+    return JSONResponse(
+        status_code=413,
+        content={"detail": "Result too large, use limit/cursor to page through it"}
+    )
+
+
+@app.exception_handler(timeseries.InvalidRangeError)
+async def invalid_range_handler(request: Request, exc: timeseries.InvalidRangeError):
+    """Reject history reads with an unusable from/to/resolution"""
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+@app.exception_handler(InvalidFieldsError)
+async def invalid_fields_handler(request: Request, exc: InvalidFieldsError):
+    """Reject fields= selections that aren't plain attribute names"""
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+# Routers: (module, prefix, tag). Imported and mounted during startup, in a worker
+# thread, so building them overlaps with the pre-warm's network round trips
+ROUTERS = [
+    ("api.health", "/api", "Health"),
+    ("api.dashboard", "/api/dashboard", "Dashboard"),
+    ("api.deliverables", "/api/deliverables", "Deliverables"),
+    ("api.metrics", "/api/metrics", "Metrics"),
+    ("api.updates", "/api/updates", "Updates"),
+    ("api.sample_projects", "/api/sample-projects", "Sample Projects"),
+    ("api.action_items", "/api/action-items", "Action Items"),
+    ("api.meetings", "/api/meetings", "Meetings"),
+    ("api.jerry", "/api/jerry", "Jerry AI"),
+]
+
+
+_routers_lock = threading.Lock()
+
+
+def include_routers():
+    """
+    Import and mount every router (idempotent and thread-safe)
+
+    Runs on startup, or on first request/openapi() when there was no startup;
+    tools that read app.routes directly should call it first.
+    """
+    with _routers_lock:
+        if getattr(app.state, "routers_included", False):
+            return
+        for module_name, prefix, tag in ROUTERS:
+            module = importlib.import_module(module_name)
+            app.include_router(module.router, prefix=prefix, tags=[tag])
+        app.state.routers_included = True
+
+
+def _build_routes():
+    include_routers()
+    importlib.import_module("api.jerry").payloads.load()
 
 
 @app.on_event("startup")
@@ -62,12 +177,22 @@ async def startup_event():
     """Initialize services on startup"""
     logger.info("Portal API starting up...")
     logger.info("API Documentation: /docs")
+    warming = prewarm.start() if prewarm.prewarm_enabled() else []
+    await asyncio.to_thread(_build_routes)
+    if snapshot.snapshots_enabled():
+        app.state.snapshot_refresher = asyncio.create_task(snapshot.refresh_loop())
+    if warming:
+        await prewarm.wait(warming)
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Portal API shutting down...")
+    refresher = getattr(app.state, 'snapshot_refresher', None)
+    if refresher:
+        refresher.cancel()
+    executor.shutdown()
 
 
 @app.get("/")
@@ -0,0 +1,439 @@
+"""
+Micro-benchmarks for the DynamoDB data layer.
+
+Usage:
+    python scripts/benchmark.py session --iterations 200
+    python scripts/benchmark.py session --table turbotech-dev-metrics --key 0
+    python scripts/benchmark.py concurrency --requests 200 --latency-ms 20
+    python scripts/benchmark.py convert --items 10000
+    python scripts/benchmark.py transcode --items 10000
+    python scripts/benchmark.py paginator --pages 20 --latency-ms 20 --decode-ms 15
+    python scripts/benchmark.py serialize --items 500
+    python scripts/benchmark.py compress --items 500 --mbps 20
+    python scripts/benchmark.py auth --iterations 2000
+
+Point boto3 at DynamoDB Local with AWS_ENDPOINT_URL_DYNAMODB=http://localhost:8000
+to include real round trips without touching AWS.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-2')
+
+
+def _report(label, samples):
+    """Print mean/p50/p99 for a list of per-iteration timings in seconds"""
+    samples = sorted(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(f"  {label:<28} mean={statistics.mean(samples) * 1000:8.3f}ms "
+          f"p50={statistics.median(samples) * 1000:8.3f}ms p99={p99 * 1000:8.3f}ms")
+    return statistics.mean(samples)
+
+
+def bench_session(args):
+    """Per-request cost of a fresh boto3 resource vs the shared session in db.session"""
+    import boto3
+    from db import session
+
+    def per_request_fresh():
+        table = boto3.resource('dynamodb').Table(args.table)
+        if args.key is not None:
+            table.get_item(Key={'id': args.key})
+
+    def per_request_shared():
+        table = session.get_table('BENCHMARK_TABLE', args.table)
+        if args.key is not None:
+            table.get_item(Key={'id': args.key})
+
+    print(f"Adapter construction{' + GetItem' if args.key is not None else ''} "
+          f"({args.iterations} iterations)")
+    results = {}
+    for label, fn in [('fresh boto3.resource', per_request_fresh),
+                      ('shared db.session', per_request_shared)]:
+        fn()  # warm up
+        samples = []
+        for _ in range(args.iterations):
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+        results[label] = _report(label, samples)
+
+    saved = results['fresh boto3.resource'] - results['shared db.session']
+    print(f"  saved per request: {saved * 1000:.3f}ms")
+
+
+def bench_concurrency(args):
+    """Throughput of N parallel requests: boto3 called inline vs through db.executor"""
+    from db.executor import run_blocking
+
+    def dynamodb_call():
+        # Stand-in for a boto3 round trip: blocks the calling thread
+        time.sleep(args.latency_ms / 1000)
+        return {'Item': {'id': 1}}
+
+    async def inline_request():
+        return dynamodb_call()
+
+    async def executor_request():
+        return await run_blocking(dynamodb_call)
+
+    async def run(request):
+        # Measure event-loop responsiveness alongside throughput
+        lags = []
+
+        async def probe():
+            while True:
+                start = time.perf_counter()
+                await asyncio.sleep(0.001)
+                lags.append(time.perf_counter() - start - 0.001)
+
+        probe_task = asyncio.create_task(probe())
+        start = time.perf_counter()
+        await asyncio.gather(*(request() for _ in range(args.requests)))
+        elapsed = time.perf_counter() - start
+        probe_task.cancel()
+        return elapsed, max(lags) if lags else elapsed
+
+    print(f"{args.requests} parallel requests, {args.latency_ms}ms per DynamoDB call "
+          f"(DYNAMODB_MAX_WORKERS={os.environ.get('DYNAMODB_MAX_WORKERS', '32')})")
+    for label, request in [('inline boto3', inline_request),
+                           ('db.executor', executor_request)]:
+        elapsed, max_lag = asyncio.run(run(request))
+        print(f"  {label:<28} total={elapsed * 1000:8.1f}ms "
+              f"throughput={args.requests / elapsed:8.1f} req/s max_loop_lag={max_lag * 1000:8.1f}ms")
+
+
+def _sample_items(count):
+    """Realistic action-item/meeting-shaped items as the boto3 resource API returns them"""
+    from decimal import Decimal
+
+    items = []
+    for i in range(count):
+        items.append({
+            'id': Decimal(i),
+            'title': f"Review estimate package {i}",
+            'description': "Compare parsed quantities against the estimator's takeoff " * 2,
+            'responsible_party': 'TurboTech' if i % 2 else 'Customer',
+            'status': ['open', 'in_progress', 'completed'][i % 3],
+            'priority': ['low', 'medium', 'high'][i % 3],
+            'target_date': '2025-03-01',
+            'meeting_id': Decimal(i // 10),
+            'completion_percentage': Decimal(i % 100) + Decimal('0.5'),
+            'attendees': ['alice', 'bob', 'carol'],
+            'action_item_ids': [Decimal(i), Decimal(i + 1), Decimal(i + 2)],
+            'document_counts': {'drawings': Decimal(12), 'specs': Decimal(3), 'estimates': Decimal(1)},
+            'read_by': {Decimal(1), Decimal(2)},
+            'notes': '',
+            'created_at': '2025-01-15T10:00:00',
+            'updated_at': '2025-01-16T11:30:00',
+        })
+    return items
+
+
+def bench_convert(args):
+    """Per-adapter recursive converters vs the shared dispatch tables in db.convert"""
+    from decimal import Decimal
+    from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+    from db.convert import from_wire, to_dynamodb, to_python
+
+    # The converters every adapter used to carry
+    def legacy_to_python(obj):
+        if isinstance(obj, list):
+            return [legacy_to_python(i) for i in obj]
+        elif isinstance(obj, dict):
+            return {k: legacy_to_python(v) for k, v in obj.items()}
+        elif isinstance(obj, Decimal):
+            return int(obj) if obj % 1 == 0 else float(obj)
+        return obj
+
+    def legacy_to_dynamodb(obj):
+        if isinstance(obj, float):
+            return Decimal(str(obj))
+        elif isinstance(obj, dict):
+            return {k: legacy_to_dynamodb(v) for k, v in obj.items()}
+        elif isinstance(obj, list):
+            return [legacy_to_dynamodb(i) for i in obj]
+        return obj
+
+    items = _sample_items(args.items)
+    python_items = [to_python(item) for item in items]
+    serializer = TypeSerializer()
+    wire_items = [{k: serializer.serialize(v) for k, v in item.items()} for item in items]
+    deserializer = TypeDeserializer()
+
+    def legacy_wire(item):
+        return legacy_to_python({k: deserializer.deserialize(v) for k, v in item.items()})
+
+    assert [from_wire(item) for item in wire_items[:50]] == python_items[:50]
+
+    cases = [
+        ('Decimal -> Python', [
+            ('legacy isinstance chain', lambda: [legacy_to_python(i) for i in items]),
+            ('db.convert.to_python', lambda: [to_python(i) for i in items]),
+        ]),
+        ('Python -> DynamoDB', [
+            ('legacy isinstance chain', lambda: [legacy_to_dynamodb(i) for i in python_items]),
+            ('db.convert.to_dynamodb', lambda: [to_dynamodb(i) for i in python_items]),
+        ]),
+        ('wire format -> Python', [
+            ('TypeDeserializer + legacy', lambda: [legacy_wire(i) for i in wire_items]),
+            ('db.convert.from_wire', lambda: [from_wire(i) for i in wire_items]),
+        ]),
+    ]
+
+    for title, variants in cases:
+        print(f"{title} ({args.items} items, {args.iterations} iterations)")
+        results = []
+        for label, fn in variants:
+            fn()  # warm up
+            samples = []
+            for _ in range(args.iterations):
+                start = time.perf_counter()
+                fn()
+                samples.append(time.perf_counter() - start)
+            results.append(_report(label, samples))
+        print(f"  speedup: {results[0] / results[1]:.2f}x")
+
+
+def bench_transcode(args):
+    """List response body from wire-format items: the regular decode/encode chain vs db.transcode"""
+    import json
+    import tracemalloc
+    from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+    from fastapi.encoders import jsonable_encoder
+    from db.convert import to_python
+    from db.transcode import render_list
+
+    serializer = TypeSerializer()
+    wire_items = [{k: serializer.serialize(v) for k, v in item.items()} for item in _sample_items(args.items)]
+    deserializer = TypeDeserializer()
+
+    def regular():
+        # What boto3 + the adapter + FastAPI's JSONResponse do today
+        items = [to_python({k: deserializer.deserialize(v) for k, v in item.items()}) for item in wire_items]
+        content = jsonable_encoder({"action_items": items, "total": len(items), "next_cursor": None})
+        return json.dumps(content, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def transcoded():
+        return render_list("action_items", wire_items)
+
+    assert json.loads(regular()) == json.loads(transcoded())
+
+    print(f"List response body ({args.items} items, {args.iterations} iterations)")
+    results = []
+    for label, fn in [('deserialize + jsonable_encoder', regular), ('db.transcode.render_list', transcoded)]:
+        fn()  # warm up
+        samples = []
+        for _ in range(args.iterations):
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+        results.append(_report(label, samples))
+
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  {'':<28} peak allocations={peak / 1024 / 1024:.1f}MB")
+    print(f"  speedup: {results[0] / results[1]:.2f}x")
+
+
+def bench_paginator(args):
+    """Multi-page read with a decode step per page: sequential vs prefetching db.pagination"""
+    from db.pagination import iter_pages
+
+    def scan(ExclusiveStartKey=None, **kwargs):
+        # Stand-in for a DynamoDB Scan page
+        time.sleep(args.latency_ms / 1000)
+        page = (ExclusiveStartKey or {}).get('page', 0)
+        response = {'Items': [{'id': page}]}
+        if page + 1 < args.pages:
+            response['LastEvaluatedKey'] = {'page': page + 1}
+        return response
+
+    def decode(items):
+        # Stand-in for converting a page on the event loop
+        end = time.perf_counter() + args.decode_ms / 1000
+        while time.perf_counter() < end:
+            pass
+        return items
+
+    async def read(prefetch):
+        items = []
+        async for page in iter_pages(scan, prefetch=prefetch):
+            items.extend(decode(page))
+        return items
+
+    print(f"{args.pages} pages, {args.latency_ms}ms per page fetch, {args.decode_ms}ms to decode each")
+    for prefetch in (0, 1, 2):
+        samples = []
+        for _ in range(args.iterations):
+            start = time.perf_counter()
+            assert len(asyncio.run(read(prefetch))) == args.pages
+            samples.append(time.perf_counter() - start)
+        _report(f"prefetch={prefetch}", samples)
+
+
+def _endpoint_payloads(items):
+    """Response bodies shaped like each list endpoint's, built from converted sample items"""
+    by_month = {f"month{m}": [i for i in items if i['id'] % 4 == m - 1] for m in range(1, 5)}
+    return {
+        '/api/action-items/': {"action_items": items, "total": len(items), "next_cursor": None},
+        '/api/meetings/': {"meetings": items, "total": len(items), "next_cursor": None},
+        '/api/updates/': {"updates": items, "total": len(items), "next_cursor": None},
+        '/api/deliverables/': by_month,
+        '/api/metrics/': {f"metric{i['id']}": {"id": i['id'], "current": i['completion_percentage']}
+                          for i in items[:50]},
+    }
+
+
+def bench_serialize(args):
+    """Response serialization per endpoint: FastAPI's default path vs api.responses.FastJSONResponse"""
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from api.responses import FastJSONResponse
+    from db.convert import to_python
+
+    payloads = _endpoint_payloads([to_python(item) for item in _sample_items(args.items)])
+
+    def default_path(content):
+        # What FastAPI does for a route without response_model
+        return JSONResponse(jsonable_encoder(content)).body
+
+    def fast_path(content):
+        return FastJSONResponse(content).body
+
+    print(f"Response serialization ({args.items} items per list, {args.iterations} iterations)")
+    for endpoint, content in payloads.items():
+        print(endpoint)
+        results = []
+        for label, fn in [('jsonable_encoder + json', default_path), ('FastJSONResponse', fast_path)]:
+            fn(content)  # warm up
+            samples = []
+            for _ in range(args.iterations):
+                start = time.perf_counter()
+                fn(content)
+                samples.append(time.perf_counter() - start)
+            results.append(_report(label, samples))
+        print(f"  speedup: {results[0] / results[1]:.2f}x")
+
+
+def bench_compress(args):
+    """Bytes and estimated transfer time saved per endpoint by each available encoding"""
+    from api.compression import available_codecs
+    from api.responses import dumps
+    from db.convert import to_python
+
+    payloads = _endpoint_payloads([to_python(item) for item in _sample_items(args.items)])
+    codecs = available_codecs()
+    bytes_per_ms = args.mbps * 1_000_000 / 8 / 1000
+
+    print(f"Response compression ({args.items} items per list, {args.iterations} iterations, "
+          f"{args.mbps} Mbit/s link; encodings: {', '.join(codecs)})")
+    for endpoint, content in payloads.items():
+        body = dumps(content)
+        print(f"{endpoint} ({len(body)} bytes, {len(body) / bytes_per_ms:.1f}ms to transfer)")
+        for encoding, (compress, _) in codecs.items():
+            compressed = compress(body)
+            samples = []
+            for _ in range(args.iterations):
+                start = time.perf_counter()
+                compress(body)
+                samples.append(time.perf_counter() - start)
+            cost = _report(encoding, samples) * 1000
+            saved = (len(body) - len(compressed)) / bytes_per_ms - cost
+            print(f"    {len(compressed)} bytes ({len(compressed) / len(body):.1%}), "
+                  f"net latency saved ~{saved:.1f}ms (uncached), "
+                  f"~{saved + cost:.1f}ms (cached)")
+
+
+def bench_auth(args):
+    """Per-request verify_token cost against a local JWKS, with and without the verified-token cache"""
+    os.environ.setdefault('AUTH0_DOMAIN', 'localhost')
+    os.environ.setdefault('AUTH0_AUDIENCE', 'local')
+    from fastapi.security import HTTPAuthorizationCredentials
+    from scripts.jwks_server import JWKSStandIn
+    from services import auth
+
+    with JWKSStandIn(domain=auth.auth0_domain(), audience=auth.auth0_audience()) as server:
+        auth._jwks_manager = auth.JWKSManager(server.url, ttl=3600, timeout=2, min_refresh_interval=30)
+        credentials = HTTPAuthorizationCredentials(scheme='Bearer', credentials=server.issue_token())
+
+        async def run(size):
+            auth._token_cache = auth.TokenCache(maxsize=size, skew=30, max_ttl=300)
+            await auth.verify_token(credentials)  # warm up (JWKS fetch)
+            samples = []
+            for _ in range(args.iterations):
+                start = time.perf_counter()
+                await auth.verify_token(credentials)
+                samples.append(time.perf_counter() - start)
+            return samples
+
+        print(f"verify_token on a repeated bearer token ({args.iterations} iterations)")
+        results = [_report(label, asyncio.run(run(size)))
+                   for label, size in [('no token cache', 0), ('token cache', 1024)]]
+        print(f"  speedup: {results[0] / results[1]:.2f}x")
+
+
+def main():
+    """Parse arguments and run the selected benchmark"""
+    parser = argparse.ArgumentParser(description='Benchmark the DynamoDB data layer')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    session_parser = subparsers.add_parser('session', help='Shared session vs per-request resource')
+    session_parser.add_argument('--iterations', type=int, default=200)
+    session_parser.add_argument('--table', default='turbotech-dev-metrics')
+    session_parser.add_argument('--key', type=int, default=None,
+                                help='Also issue a GetItem for this id on every iteration')
+    session_parser.set_defaults(func=bench_session)
+
+    concurrency_parser = subparsers.add_parser('concurrency', help='Inline boto3 vs bounded executor')
+    concurrency_parser.add_argument('--requests', type=int, default=200)
+    concurrency_parser.add_argument('--latency-ms', type=float, default=20)
+    concurrency_parser.set_defaults(func=bench_concurrency)
+
+    convert_parser = subparsers.add_parser('convert', help='Legacy vs shared attribute conversion')
+    convert_parser.add_argument('--items', type=int, default=10000)
+    convert_parser.add_argument('--iterations', type=int, default=10)
+    convert_parser.set_defaults(func=bench_convert)
+
+    transcode_parser = subparsers.add_parser('transcode', help='Regular list encoding vs wire-format transcoder')
+    transcode_parser.add_argument('--items', type=int, default=10000)
+    transcode_parser.add_argument('--iterations', type=int, default=10)
+    transcode_parser.set_defaults(func=bench_transcode)
+
+    paginator_parser = subparsers.add_parser('paginator', help='Sequential vs prefetching page reads')
+    paginator_parser.add_argument('--pages', type=int, default=20)
+    paginator_parser.add_argument('--latency-ms', type=float, default=20)
+    paginator_parser.add_argument('--decode-ms', type=float, default=15)
+    paginator_parser.add_argument('--iterations', type=int, default=5)
+    paginator_parser.set_defaults(func=bench_paginator)
+
+    serialize_parser = subparsers.add_parser('serialize', help='Default JSONResponse vs FastJSONResponse')
+    serialize_parser.add_argument('--items', type=int, default=500)
+    serialize_parser.add_argument('--iterations', type=int, default=50)
+    serialize_parser.set_defaults(func=bench_serialize)
+
+    compress_parser = subparsers.add_parser('compress', help='Response size and latency per encoding')
+    compress_parser.add_argument('--items', type=int, default=500)
+    compress_parser.add_argument('--iterations', type=int, default=20)
+    compress_parser.add_argument('--mbps', type=float, default=20,
+                                 help='Client link speed used to turn saved bytes into milliseconds')
+    compress_parser.set_defaults(func=bench_compress)
+
+    auth_parser = subparsers.add_parser('auth', help='verify_token with and without the token cache')
+    auth_parser.add_argument('--iterations', type=int, default=2000)
+    auth_parser.set_defaults(func=bench_auth)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Recompute hourly and daily metric rollups from raw samples.
+The API recomputes a value's rollups as part of recording it; run this on a schedule
+or after bulk-loading samples to repair rollups whose update failed (logged by the API).
+Rollups only ever move forward (see db/timeseries.py), so it is safe to run anytime.
+
+Usage:
+    python scripts/downsample_metrics.py --env dev
+    python scripts/downsample_metrics.py --env dev --days 30 --metric 3
+"""
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+async def downsample(days: int, metric_ids):
+    from db.adapters.metrics import MetricAdapter
+    from db.timeseries import bucket_start
+
+    adapter = MetricAdapter()
+    if not metric_ids:
+        metric_ids = [metric['id'] for metric in await adapter.get_all()]
+
+    now = datetime.utcnow()
+    hours = int(timedelta(days=days) / timedelta(hours=1)) + 1
+    latest = bucket_start(now, 'hour')
+    for metric_id in metric_ids:
+        for i in range(hours):
+            await adapter.samples.downsample(str(metric_id), latest - timedelta(hours=i))
+        print(f"  metric {metric_id}: {hours} hours")
+
+
+def main():
+    """Downsample the last --days of every (or the selected) metric"""
+    parser = argparse.ArgumentParser(description='Recompute metric history rollups')
+    parser.add_argument('--env', default='dev', choices=['dev', 'staging', 'prod'],
+                        help='Environment (dev, staging, prod)')
+    parser.add_argument('--days', type=int, default=7, help='How far back to recompute')
+    parser.add_argument('--metric', type=int, action='append',
+                        help='Metric id (repeatable; default: all)')
+    args = parser.parse_args()
+
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-2')
+    os.environ.setdefault('METRICS_TABLE', f"turbotech-{args.env}-metrics")
+    os.environ.setdefault('METRIC_SAMPLES_TABLE', f"turbotech-{args.env}-metric-samples")
+    os.environ.setdefault('SNAPSHOT_ENABLED', 'false')
+
+    print(f"Downsampling the last {args.days} days...")
+    asyncio.run(downsample(args.days, args.metric))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Local stand-in for Auth0's JWKS endpoint, for exercising services/auth.py without Auth0.
+
+Serves /.well-known/jwks.json from freshly generated RSA keys and prints a signed
+access token. POST /rotate adds a new signing key (the previous one stays published
+until the next rotation), mimicking an Auth0 key rotation.
+
+Usage:
+    python scripts/jwks_server.py --port 8765
+    # then run the API with
+    AUTH0_JWKS_URL=http://localhost:8765/.well-known/jwks.json uvicorn main:app
+
+It can also be used from Python:
+    with JWKSStandIn() as server:
+        manager = JWKSManager(server.url, ttl=60, timeout=1, min_refresh_interval=0)
+        token = server.issue_token()
+"""
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+
+class JWKSStandIn:
+    """
+    JWKS server on localhost with rotatable keys and a request counter
+
+    Set delay (seconds before each JWKS response) or failing (answer 503) to
+    simulate a slow or unavailable Auth0.
+    """
+
+    def __init__(self, port: int = 0, domain: Optional[str] = None, audience: Optional[str] = None):
+        self.domain = domain or os.environ.get('AUTH0_DOMAIN', 'localhost')
+        self.audience = audience or os.environ.get('AUTH0_AUDIENCE', 'local')
+        self.keys: List[Dict[str, Any]] = []
+        self.requests = 0
+        self.delay = 0.0
+        self.failing = False
+        self.rotate()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/.well-known/jwks.json"
+
+    def rotate(self) -> str:
+        """Publish a new signing key and keep only the previous one alongside it"""
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        )
+        kid = uuid.uuid4().hex
+        public = jwk.construct(pem, 'RS256').public_key().to_dict()
+        public.update(kid=kid, use='sig')
+        self.keys = self.keys[-1:] + [{'kid': kid, 'pem': pem, 'public': public}]
+        return kid
+
+    def jwks(self) -> Dict[str, Any]:
+        return {'keys': [key['public'] for key in self.keys]}
+
+    def issue_token(self, ttl: int = 3600, **claims) -> str:
+        """Access token signed with the newest key"""
+        key = self.keys[-1]
+        now = int(time.time())
+        payload = {
+            'iss': f"https://{self.domain}/",
+            'aud': self.audience,
+            'sub': 'auth0|local-user',
+            'iat': now,
+            'exp': now + ttl,
+            **claims
+        }
+        return jwt.encode(payload, key['pem'], algorithm='RS256', headers={'kid': key['kid']})
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != '/.well-known/jwks.json':
+                    self.send_error(404)
+                    return
+                server.requests += 1
+                if server.delay:
+                    time.sleep(server.delay)
+                if server.failing:
+                    self.send_error(503)
+                    return
+                body = json.dumps(server.jwks()).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                if self.path != '/rotate':
+                    self.send_error(404)
+                    return
+                kid = server.rotate()
+                print(f"Rotated; new kid {kid}\n{server.issue_token()}")
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> 'JWKSStandIn':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'JWKSStandIn':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main():
+    """Run the stand-in until interrupted"""
+    parser = argparse.ArgumentParser(description='Serve a local JWKS and issue matching tokens')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--domain', default=None, help='Issuer domain (default: AUTH0_DOMAIN or localhost)')
+    parser.add_argument('--audience', default=None, help='Token audience (default: AUTH0_AUDIENCE or local)')
+    parser.add_argument('--token-ttl', type=int, default=3600)
+    args = parser.parse_args()
+
+    server = JWKSStandIn(args.port, args.domain, args.audience)
+    print(f"JWKS at {server.url}")
+    print(f"Run the API with AUTH0_JWKS_URL={server.url} AUTH0_DOMAIN={server.domain} "
+          f"AUTH0_AUDIENCE={server.audience}")
+    print(f"Bearer token:\n{server.issue_token(ttl=args.token_ttl)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Profile cold-start import time and check it against a budget.
+
+Each run starts a fresh interpreter (as a Lambda cold start does), imports main with
+-X importtime and then mounts the routers, which is the work done before uvicorn
+can answer the readiness check (the pre-warm's network time is not included).
+
+Usage:
+    python scripts/profile_startup.py
+    python scripts/profile_startup.py --runs 5 --top 20
+    python scripts/profile_startup.py --budget-ms 800    # exits 1 if over budget (CI)
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = (
+    "import time; started = time.perf_counter(); import main; imported = time.perf_counter(); "
+    "main.include_routers(); mounted = time.perf_counter(); "
+    "print(f'{imported - started} {mounted - imported}')"
+)
+
+
+def _run_once():
+    """(import seconds, router seconds, {module: cumulative import us}) for one fresh process"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-2')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE],
+        cwd=BACKEND, env=env, capture_output=True, text=True, check=True
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(cumulative)
+    imported, mounted = (float(value) for value in result.stdout.split())
+    return imported, mounted, modules
+
+
+def main():
+    """Run the probe several times and report medians"""
+    parser = argparse.ArgumentParser(description='Profile cold-start imports')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--top', type=int, default=15, help='Slowest modules to list')
+    parser.add_argument('--budget-ms', type=float, default=None,
+                        help='Fail when median import + router time exceeds this')
+    args = parser.parse_args()
+
+    imports, routers = [], []
+    cumulative = defaultdict(list)
+    for _ in range(args.runs):
+        imported, mounted, modules = _run_once()
+        imports.append(imported)
+        routers.append(mounted)
+        for name, micros in modules.items():
+            cumulative[name].append(micros)
+
+    import_ms = statistics.median(imports) * 1000
+    router_ms = statistics.median(routers) * 1000
+    print(f"Cold start over {args.runs} fresh interpreters (median)")
+    print(f"  import main                  {import_ms:8.1f}ms")
+    print(f"  include_routers              {router_ms:8.1f}ms")
+    print(f"  total                        {import_ms + router_ms:8.1f}ms")
+
+    print("\nSlowest imports (cumulative, top-level packages and our modules)")
+    ranked = sorted(
+        ((statistics.median(values), name) for name, values in cumulative.items()
+         if '.' not in name or name.split('.')[0] in ('api', 'db', 'services')),
+        reverse=True
+    )
+    for micros, name in ranked[:args.top]:
+        print(f"  {name:<28} {micros / 1000:8.1f}ms")
+
+    for heavy in ('boto3', 'botocore', 'jose', 'httpx'):
+        if heavy in cumulative:
+            print(f"\nWarning: {heavy} is imported by 'import main'; keep it behind first use")
+
+    if args.budget_ms is not None:
+        total = import_ms + router_ms
+        if total > args.budget_ms:
+            print(f"\nFAIL: {total:.1f}ms exceeds the {args.budget_ms:.0f}ms startup budget")
+            sys.exit(1)
+        print(f"\nOK: {total:.1f}ms within the {args.budget_ms:.0f}ms startup budget")
+
+
+if __name__ == "__main__":
+    main()
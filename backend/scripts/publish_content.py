@@ -0,0 +1,57 @@
+"""
+Publish an editable content document to the meta table.
+Running instances pick up the new revision within their reload interval (e.g.
+JERRY_RELOAD_SECONDS), so content changes need no redeploy. The document is
+compiled the way the API compiles it before it is published, so a broken edit
+is rejected here instead of being skipped by every instance.
+
+Usage:
+    python scripts/publish_content.py --env dev --name jerry
+    python scripts/publish_content.py --env prod --name jerry --file /tmp/jerry.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def jerry_payloads():
+    from api.jerry import payloads
+
+    return payloads
+
+
+CONTENT = {
+    'jerry': jerry_payloads,
+}
+
+
+def main():
+    """Validate and publish one content document"""
+    parser = argparse.ArgumentParser(description='Publish a content document to the meta table')
+    parser.add_argument('--env', default='dev', choices=['dev', 'staging', 'prod'],
+                        help='Environment (dev, staging, prod)')
+    parser.add_argument('--name', required=True, choices=sorted(CONTENT), help='Content document to publish')
+    parser.add_argument('--file', help='JSON file to publish (default: the packaged one)')
+    args = parser.parse_args()
+
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-2')
+    os.environ.setdefault('META_TABLE', f"turbotech-{args.env}-meta")
+
+    payloads = CONTENT[args.name]()
+    path = args.file or payloads.path
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    compiled = payloads.compile(data, '')
+
+    from db.content import put_content
+
+    revision = asyncio.run(put_content(args.name, data))
+    print(f"Published {path} as '{args.name}' revision {revision} ({', '.join(sorted(compiled))})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Rebuild incrementally maintained aggregate items from their base tables.
+Run as a deploy step on environments not seeded with seed_dynamodb.py (which runs
+these), after bulk loads or manual edits that bypassed the adapters, or whenever an
+aggregate is suspected to have drifted. Stop sample project writers before rebuilding
+its stats: deltas applied while it is scanning are overwritten. Deliverables views are
+replaced under a revision check and can be rebuilt while the API is writing.
+
+Usage:
+    python scripts/rebuild_aggregates.py --env dev
+    python scripts/rebuild_aggregates.py --env dev --only sample-project-stats
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+async def rebuild_sample_project_stats():
+    from db.adapters.sample_projects import SampleProjectAdapter
+
+    return await SampleProjectAdapter().rebuild_stats()
+
+
+async def rebuild_deliverables_by_month():
+    from db.adapters.deliverables import DeliverableAdapter
+
+    return await DeliverableAdapter().rebuild_view()
+
+
+AGGREGATES = {
+    'deliverables-by-month': rebuild_deliverables_by_month,
+    'sample-project-stats': rebuild_sample_project_stats,
+}
+
+
+def main():
+    """Rebuild the selected aggregates and print what they now hold"""
+    parser = argparse.ArgumentParser(description='Rebuild aggregate items from base tables')
+    parser.add_argument('--env', default='dev', choices=['dev', 'staging', 'prod'],
+                        help='Environment (dev, staging, prod)')
+    parser.add_argument('--only', choices=sorted(AGGREGATES), action='append',
+                        help='Aggregate to rebuild (repeatable; default: all)')
+    args = parser.parse_args()
+
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-2')
+    os.environ.setdefault('META_TABLE', f"turbotech-{args.env}-meta")
+    os.environ.setdefault('DELIVERABLES_TABLE', f"turbotech-{args.env}-deliverables")
+    os.environ.setdefault('SAMPLE_PROJECTS_TABLE', f"turbotech-{args.env}-sample-projects")
+
+    for name in args.only or sorted(AGGREGATES):
+        print(f"Rebuilding {name}...")
+        print(f"  {asyncio.run(AGGREGATES[name]())}")
+
+
+if __name__ == "__main__":
+    main()
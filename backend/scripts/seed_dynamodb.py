@@ -5,12 +5,22 @@ Run this after deploying the SAM stack to populate initial deliverables and metr
 Usage:
     python scripts/seed_dynamodb.py --env dev
     python scripts/seed_dynamodb.py --env dev --deliverables-only
+    python scripts/seed_dynamodb.py --env dev --verify-only
 """
+import asyncio
 import boto3
+import os
 import sys
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.ids import get_allocator
+from db.scan import count_items
+from db.versions import bump_version
+from scripts.rebuild_aggregates import AGGREGATES
+
 
 def seed_deliverables(table_name, region='us-east-2'):
     """Seed deliverables table with sample project deliverables."""
@@ -272,6 +282,46 @@ def seed_action_items(table_name, region='us-east-2'):
     print(f"Done: {len(action_items)} action items seeded.\n")
 
 
+def verify_counts(table_names, region='us-east-2'):
+    """Print item counts for each table using the shared parallel scan."""
+    dynamodb = boto3.resource('dynamodb', region_name=region)
+    print("Table item counts:")
+    for table_name in table_names:
+        count = asyncio.run(count_items(dynamodb.Table(table_name)))
+        print(f"  - {table_name}: {count}")
+    print()
+
+
+def bump_versions(names):
+    """Bump table versions so API ETags change (seeding writes behind the adapters)."""
+    async def bump_all():
+        for name in names:
+            await bump_version(name)
+    asyncio.run(bump_all())
+
+
+def sync_id_counters(tables, region='us-east-2'):
+    """Move the ID counters past the fixed ids just written, so the API never reuses them."""
+    dynamodb = boto3.resource('dynamodb', region_name=region)
+
+    async def sync_all():
+        for name, table_name in tables.items():
+            max_id = await get_allocator(name, dynamodb.Table(table_name)).resync()
+            print(f"  - counter#{name}: at least {max_id}")
+
+    print("Syncing ID counters:")
+    asyncio.run(sync_all())
+    print()
+
+
+def rebuild_aggregates():
+    """Build the aggregate items (deliverables month views, sample project stats) the API reads."""
+    for name in sorted(AGGREGATES):
+        print(f"Rebuilding {name}...")
+        print(f"  {asyncio.run(AGGREGATES[name]())}")
+    print()
+
+
 def main():
     """Main seed function."""
     import argparse
@@ -289,6 +339,8 @@ def main():
                         help='Only seed meetings')
     parser.add_argument('--action-items-only', action='store_true',
                         help='Only seed action items')
+    parser.add_argument('--verify-only', action='store_true',
+                        help='Only print item counts, do not seed')
 
     args = parser.parse_args()
 
@@ -298,6 +350,11 @@ def main():
     meetings_table = f"turbotech-{args.env}-meetings"
     action_items_table = f"turbotech-{args.env}-action-items"
 
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-2')
+    os.environ.setdefault('META_TABLE', f"turbotech-{args.env}-meta")
+    os.environ.setdefault('DELIVERABLES_TABLE', deliverables_table)
+    os.environ.setdefault('SAMPLE_PROJECTS_TABLE', f"turbotech-{args.env}-sample-projects")
+
     print(f"\nSeeding DynamoDB tables for environment: {args.env}\n")
 
     only_flags = [
@@ -306,7 +363,16 @@ def main():
     ]
     seed_all = not any(only_flags)
 
+    all_tables = [
+        deliverables_table, metrics_table, updates_table,
+        meetings_table, action_items_table,
+    ]
+
     try:
+        if args.verify_only:
+            verify_counts(all_tables)
+            return
+
         if seed_all or args.deliverables_only:
             seed_deliverables(deliverables_table)
         if seed_all or args.metrics_only:
@@ -317,6 +383,13 @@ def main():
             seed_meetings(meetings_table)
         if seed_all or args.action_items_only:
             seed_action_items(action_items_table)
+        bump_versions(['deliverables', 'metrics', 'updates', 'meetings', 'action-items'])
+        sync_id_counters({
+            'updates': updates_table,
+            'meetings': meetings_table,
+            'action-items': action_items_table,
+        })
+        rebuild_aggregates()
 
         print("Seeding complete!")
         print("\nData Summary:")
@@ -325,6 +398,8 @@ def main():
         print("  - 3 updates (kickoff, MVP, feedback)")
         print("  - 2 meetings (status, planning)")
         print("  - 2 action items")
+        print()
+        verify_counts(all_tables)
 
     except Exception as e:
         print(f"Error seeding database: {str(e)}")
@@ -4,57 +4,240 @@ Validates JWT tokens from Auth0 for API endpoint protection
 """
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt, JWTError
-import requests
-from functools import lru_cache
+import asyncio
+import hashlib
+import logging
 import os
-from typing import Dict, Optional
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+# jose (cryptography) and httpx are imported on first use to keep cold-start imports light
+if TYPE_CHECKING:
+    from jose.backends.base import Key
+
+logger = logging.getLogger(__name__)
 
-# Auth0 configuration — must be set via environment variables
-AUTH0_DOMAIN = os.environ["AUTH0_DOMAIN"]
-AUTH0_AUDIENCE = os.environ["AUTH0_AUDIENCE"]
 ALGORITHMS = ["RS256"]
 
+
+# Auth0 configuration — must be set via environment variables (read when first
+# needed, so importing the app doesn't depend on them)
+def auth0_domain() -> str:
+    return os.environ["AUTH0_DOMAIN"]
+
+
+def auth0_audience() -> str:
+    return os.environ["AUTH0_AUDIENCE"]
+
+
 security = HTTPBearer()
 
 
-@lru_cache()
-def get_jwks() -> Dict:
+class JWKSManager:
     """
-    Fetch Auth0 JSON Web Key Set (JWKS) - cached to avoid repeated requests
+    Auth0 signing keys, fetched asynchronously and kept as parsed RSA keys per kid
+
+    Keys older than ttl keep serving while a background refresh runs. A token
+    whose kid isn't known (Auth0 rotated keys) triggers one refetch, at most
+    every min_refresh_interval seconds so garbage kids can't hammer Auth0. A failed
+    fetch keeps the previous keys.
+
+    Point url at a local JWKS server (scripts/jwks_server.py) to test without Auth0.
     """
-    jwks_url = f"https://{AUTH0_DOMAIN}/.well-known/jwks.json"
-    response = requests.get(jwks_url)
-    response.raise_for_status()
-    return response.json()
 
+    def __init__(self, url: str, ttl: float, timeout: float, min_refresh_interval: float):
+        self.url = url
+        self.ttl = ttl
+        self.timeout = timeout
+        self.min_refresh_interval = min_refresh_interval
+        self.keys: Dict[str, "Key"] = {}
+        self.fetched_at: Optional[float] = None
+        self.version = 0
+        self._last_miss_refresh: Optional[float] = None
+        self._refreshing: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def age(self) -> Optional[float]:
+        return time.monotonic() - self.fetched_at if self.fetched_at is not None else None
+
+    @staticmethod
+    def parse(jwks: Dict) -> Dict[str, "Key"]:
+        """RS256 signing keys from a JWKS document, by kid"""
+        from jose import jwk
 
-def get_rsa_key(token: str) -> Optional[Dict]:
+        keys = {}
+        for key in jwks.get("keys", []):
+            if key.get("kty") != "RSA" or key.get("use", "sig") != "sig" or "kid" not in key:
+                continue
+            try:
+                keys[key["kid"]] = jwk.construct(key, "RS256")
+            except Exception as e:
+                logger.warning(f"Skipping unusable JWKS key {key.get('kid')}: {e}")
+        return keys
+
+    async def refresh(self) -> None:
+        """Fetch the JWKS (concurrent callers share one fetch)"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        version = self.version
+        async with self._lock:
+            if self.version != version:
+                return  # someone else refreshed while we waited
+            import httpx
+
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                response = await client.get(self.url)
+                response.raise_for_status()
+                keys = self.parse(response.json())
+            if not keys:
+                raise ValueError(f"No RS256 signing keys in JWKS from {self.url}")
+            self.keys = keys
+            self.fetched_at = time.monotonic()
+            self.version += 1
+
+    def refresh_in_background(self) -> None:
+        """Start a refresh unless one is already running"""
+        if self._refreshing is not None and not self._refreshing.done():
+            return
+        self._refreshing = asyncio.get_running_loop().create_task(self._background_refresh())
+
+    async def _background_refresh(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning(f"Background JWKS refresh failed; keeping previous keys: {e}")
+
+    async def get_key(self, kid: str) -> Optional["Key"]:
+        """Parsed public key for kid, or None if Auth0 doesn't publish it"""
+        try:
+            if not self.keys:
+                await self.refresh()
+            elif self.age > self.ttl:
+                self.refresh_in_background()
+
+            key = self.keys.get(kid)
+            now = time.monotonic()
+            if key is None and (
+                self._last_miss_refresh is None
+                or now - self._last_miss_refresh >= self.min_refresh_interval
+            ):
+                self._last_miss_refresh = now
+                await self.refresh()
+                key = self.keys.get(kid)
+            return key
+        except Exception as e:
+            logger.error(f"JWKS fetch from {self.url} failed: {e}")
+            return self.keys.get(kid)
+
+
+_jwks_manager: Optional[JWKSManager] = None
+
+
+def get_jwks_manager() -> JWKSManager:
+    """Get the process-wide JWKS manager"""
+    global _jwks_manager
+    if _jwks_manager is None:
+        _jwks_manager = JWKSManager(
+            os.environ.get("AUTH0_JWKS_URL", f"https://{auth0_domain()}/.well-known/jwks.json"),
+            ttl=float(os.environ.get("JWKS_TTL", "3600")),
+            timeout=float(os.environ.get("JWKS_TIMEOUT", "3")),
+            min_refresh_interval=float(os.environ.get("JWKS_MIN_REFRESH_INTERVAL", "30"))
+        )
+    return _jwks_manager
+
+
+class TokenCache:
     """
-    Extract the RSA key from JWKS that matches the token's key ID
+    Claims of already-verified tokens, keyed by the token's SHA-256 digest
+
+    An entry lives until the token's exp minus skew (capped at max_ttl, so a
+    revoked signing key stops being honoured soon after it leaves the JWKS) and
+    the least recently used entry is evicted beyond maxsize. Only touched from
+    the event loop, so no lock.
     """
+
+    def __init__(self, maxsize: int, skew: float, max_ttl: float):
+        self.maxsize = maxsize
+        self.skew = skew
+        self.max_ttl = max_ttl
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Copy of the cached claims, or None if unknown or expired"""
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.time():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(entry[1])
+
+    def set(self, token: str, claims: Dict[str, Any]) -> None:
+        """Remember verified claims; tokens without a numeric exp aren't cached"""
+        if self.maxsize <= 0 or not isinstance(claims.get("exp"), (int, float)):
+            return
+        expires = min(claims["exp"] - self.skew, time.time() + self.max_ttl)
+        if expires <= time.time():
+            return
+        key = self._key(token)
+        self._entries[key] = (expires, dict(claims))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+_token_cache: Optional[TokenCache] = None
+
+
+def get_token_cache() -> TokenCache:
+    """Get the process-wide verified-token cache (TOKEN_CACHE_SIZE=0 disables it)"""
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = TokenCache(
+            maxsize=int(os.environ.get("TOKEN_CACHE_SIZE", "1024")),
+            skew=float(os.environ.get("TOKEN_CACHE_SKEW", "30")),
+            max_ttl=float(os.environ.get("TOKEN_CACHE_MAX_TTL", "300"))
+        )
+    return _token_cache
+
+
+async def get_rsa_key(token: str) -> Optional["Key"]:
+    """
+    Get the parsed RSA key from JWKS that matches the token's key ID
+    """
+    from jose import jwt
+
     try:
         unverified_header = jwt.get_unverified_header(token)
-        jwks = get_jwks()
-
-        rsa_key = {}
-        for key in jwks["keys"]:
-            if key["kid"] == unverified_header["kid"]:
-                rsa_key = {
-                    "kty": key["kty"],
-                    "kid": key["kid"],
-                    "use": key["use"],
-                    "n": key["n"],
-                    "e": key["e"]
-                }
-                break
-
-        return rsa_key if rsa_key else None
+        return await get_jwks_manager().get_key(unverified_header["kid"])
     except Exception:
         return None
 
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict:
+async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict:
     """
     Verify and decode Auth0 JWT token
 
@@ -66,8 +249,16 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security))
     """
     token = credentials.credentials
 
+    # Repeat tokens skip the header parse, key lookup and RS256 check
+    token_cache = get_token_cache()
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+
+    from jose import jwt, JWTError
+
     # Get the RSA key for this token
-    rsa_key = get_rsa_key(token)
+    rsa_key = await get_rsa_key(token)
 
     if not rsa_key:
         raise HTTPException(
@@ -82,9 +273,10 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security))
             token,
             rsa_key,
             algorithms=ALGORITHMS,
-            audience=AUTH0_AUDIENCE,
-            issuer=f"https://{AUTH0_DOMAIN}/"
+            audience=auth0_audience(),
+            issuer=f"https://{auth0_domain()}/"
         )
+        token_cache.set(token, payload)
         return payload
 
     except jwt.ExpiredSignatureError:
@@ -126,7 +318,7 @@ def get_current_user(token: Dict = Depends(verify_token)) -> str:
 
 
 # Optional: Create a dependency for optional authentication
-def optional_verify_token(credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))) -> Optional[Dict]:
+async def optional_verify_token(credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))) -> Optional[Dict]:
     """
     Optional authentication - returns None if no token provided
     Useful for endpoints that work both authenticated and unauthenticated
@@ -135,6 +327,6 @@ def optional_verify_token(credentials: Optional[HTTPAuthorizationCredentials] =
         return None
 
     try:
-        return verify_token(credentials)
+        return await verify_token(credentials)
     except HTTPException:
         return None
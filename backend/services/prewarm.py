@@ -0,0 +1,58 @@
+"""
+Cold-start pre-warm
+Fetches the Auth0 JWKS and opens the DynamoDB connection during startup (the Lambda
+init phase) so the first request after an idle period doesn't pay for either
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Awaitable, Callable, List
+
+logger = logging.getLogger(__name__)
+
+
+def prewarm_enabled() -> bool:
+    return os.environ.get('PREWARM_ENABLED', 'true').lower() == 'true'
+
+
+async def _warm_jwks() -> None:
+    from services.auth import get_jwks_manager
+
+    await get_jwks_manager().refresh()
+
+
+async def _warm_dynamodb() -> None:
+    from db.executor import run_blocking
+    from db.ids import get_meta_table
+
+    # Imports boto3, builds the shared resource and completes the TLS handshake
+    # on a pooled connection; the key doesn't need to exist
+    await run_blocking(get_meta_table().get_item, Key={'pk': 'prewarm'})
+
+
+async def _run(name: str, warm: Callable[[], Awaitable[None]]) -> None:
+    started = time.perf_counter()
+    try:
+        await warm()
+    except Exception as e:
+        logger.warning(f"Pre-warm of {name} failed; the first request will retry: {e}")
+        return
+    logger.info(f"Pre-warmed {name} in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+
+def start() -> List[asyncio.Task]:
+    """Start warming JWKS and DynamoDB concurrently; returns the tasks to wait on"""
+    loop = asyncio.get_running_loop()
+    return [
+        loop.create_task(_run('jwks', _warm_jwks)),
+        loop.create_task(_run('dynamodb', _warm_dynamodb)),
+    ]
+
+
+async def wait(tasks: List[asyncio.Task]) -> None:
+    """Wait up to PREWARM_TIMEOUT seconds; anything slower finishes in the background"""
+    timeout = float(os.environ.get('PREWARM_TIMEOUT', '3'))
+    _, pending = await asyncio.wait(tasks, timeout=timeout)
+    if pending:
+        logger.warning(f"Pre-warm still running after {timeout}s; continuing startup")
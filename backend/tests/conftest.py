@@ -0,0 +1,48 @@
+"""
+Shared test setup: run from backend/ with `python -m pytest tests`
+"""
+import os
+import sys
+
+import pytest
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+sys.path.insert(0, os.path.join(BACKEND, 'scripts'))
+
+os.environ.setdefault('AUTH0_DOMAIN', 'tests.example.com')
+os.environ.setdefault('AUTH0_AUDIENCE', 'https://api.tests.example.com')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-2')
+
+
+@pytest.fixture
+def aws():
+    """
+    moto's DynamoDB with fresh process-wide state; yields create_table(name, hash_key, range_key=None)
+
+    Key attributes are strings unless named 'id' (numbers), as in template-fastapi.yaml.
+    """
+    from moto import mock_aws
+
+    from db import cache, ids, session, snapshot, timeseries, versions
+
+    def reset():
+        session.reset()
+        for registry in (cache._caches, ids._allocators, snapshot._snapshots, timeseries._stores, versions._versions):
+            registry.clear()
+
+    def create_table(name, hash_key, range_key=None):
+        keys = [(hash_key, 'HASH')] + ([(range_key, 'RANGE')] if range_key else [])
+        return session.get_resource().create_table(
+            TableName=name,
+            KeySchema=[{'AttributeName': key, 'KeyType': kind} for key, kind in keys],
+            AttributeDefinitions=[
+                {'AttributeName': key, 'AttributeType': 'N' if key == 'id' else 'S'} for key, _ in keys
+            ],
+            BillingMode='PAY_PER_REQUEST',
+        )
+
+    with mock_aws():
+        reset()
+        yield create_table
+        reset()
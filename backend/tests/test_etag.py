@@ -0,0 +1,89 @@
+"""
+ETags never label a body older than the version they name, when another instance writes
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from services.auth import verify_token
+
+
+@pytest.fixture
+def tables(aws, monkeypatch):
+    monkeypatch.setenv('META_TABLE', 'tests-meta')
+    monkeypatch.setenv('METRICS_TABLE', 'tests-metrics')
+    monkeypatch.setenv('ACTION_ITEMS_TABLE', 'tests-action-items')
+    # Every request re-reads the shared counters, as after TABLE_VERSION_TTL on a busy instance
+    monkeypatch.setenv('TABLE_VERSION_TTL', '0')
+    return {
+        'meta': aws('tests-meta', 'pk'),
+        'metrics': aws('tests-metrics', 'id'),
+        'action-items': aws('tests-action-items', 'id'),
+    }
+
+
+@pytest.fixture
+def client(tables):
+    main.app.dependency_overrides[verify_token] = lambda: {'sub': 'auth0|tests'}
+    yield TestClient(main.app)
+    main.app.dependency_overrides.clear()
+
+
+def _remote_write(tables, name, item):
+    """A write and version bump made by another instance (nothing local is invalidated)"""
+    tables[name].put_item(Item=item)
+    tables['meta'].update_item(
+        Key={'pk': f'version#{name}'},
+        UpdateExpression='ADD version :one',
+        ExpressionAttributeValues={':one': 1}
+    )
+
+
+@pytest.mark.parametrize('encoding', ['identity', 'gzip'])
+def test_snapshot_reloads_for_newer_version(tables, client, encoding):
+    headers = {'Accept-Encoding': encoding}
+    metric = {'id': 1, 'name': 'Accuracy', 'current': 10, 'target': 80, 'unit': '%', 'notes': 'x' * 2048}
+    _remote_write(tables, 'metrics', metric)
+    first = client.get('/api/metrics/', headers=headers)
+    assert first.json()['accuracy']['current'] == 10
+
+    _remote_write(tables, 'metrics', {**metric, 'current': 55})
+    second = client.get('/api/metrics/', headers={**headers, 'If-None-Match': first.headers['etag']})
+    assert second.status_code == 200
+    assert second.json()['accuracy']['current'] == 55
+    assert second.headers['etag'] != first.headers['etag']
+
+    again = client.get('/api/metrics/', headers={**headers, 'If-None-Match': second.headers['etag']})
+    assert again.status_code == 304
+
+
+def test_item_cache_drops_entries_older_than_version(tables, client):
+    item = {'id': 7, 'title': 'Review', 'status': 'pending', 'priority': 'high'}
+    _remote_write(tables, 'action-items', item)
+    first = client.get('/api/action-items/7')
+    assert first.json()['status'] == 'pending'
+
+    _remote_write(tables, 'action-items', {**item, 'status': 'completed'})
+    second = client.get('/api/action-items/7', headers={'If-None-Match': first.headers['etag']})
+    assert second.status_code == 200
+    assert second.json()['status'] == 'completed'
+
+
+def test_compressed_bytes_follow_the_body_not_just_the_etag():
+    from fastapi import FastAPI
+    from fastapi.responses import JSONResponse
+
+    from api.compression import CompressionMiddleware
+
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+    bodies = iter(['stale', 'fresh'])
+
+    @app.get('/')
+    async def endpoint():
+        # One ETag labelling two bodies, as while instances catch up to a version
+        return JSONResponse({'value': next(bodies) * 1024}, headers={'ETag': '"v1"'})
+
+    client = TestClient(app)
+    assert client.get('/', headers={'Accept-Encoding': 'gzip'}).json()['value'].startswith('stale')
+    assert client.get('/', headers={'Accept-Encoding': 'gzip'}).json()['value'].startswith('fresh')
@@ -0,0 +1,49 @@
+"""
+ID allocation never overwrites rows written behind the counter
+"""
+import asyncio
+
+import pytest
+
+from db.adapters.action_items import ActionItemAdapter
+from db.ids import get_allocator, get_meta_table
+
+
+@pytest.fixture
+def adapter(aws, monkeypatch):
+    monkeypatch.setenv('META_TABLE', 'tests-meta')
+    monkeypatch.setenv('ACTION_ITEMS_TABLE', 'tests-action-items')
+    aws('tests-meta', 'pk')
+    aws('tests-action-items', 'id')
+    return ActionItemAdapter()
+
+
+def _counter():
+    return int(get_meta_table().get_item(Key={'pk': 'counter#action-items'})['Item']['last_id'])
+
+
+def test_taken_id_resyncs_counter_and_retries(adapter):
+    async def run():
+        first = await adapter.next_id()
+        # Seeded behind the counter, which already handed out its first block
+        for i in range(1, 26):
+            adapter.table.put_item(Item={'id': i, 'title': f'seeded {i}'})
+        return first, await adapter.create({'id': await adapter.next_id(), 'title': 'new'})
+
+    first, created = asyncio.run(run())
+    assert first == 1
+    assert created['id'] == 26
+    assert adapter.table.get_item(Key={'id': 2})['Item']['title'] == 'seeded 2'
+    assert adapter.table.get_item(Key={'id': 26})['Item']['title'] == 'new'
+
+
+def test_resync_never_moves_counter_back(adapter):
+    allocator = get_allocator('action-items', adapter.table)
+    adapter.table.put_item(Item={'id': 5, 'title': 'seeded'})
+    assert asyncio.run(allocator.resync()) == 5
+    assert _counter() == 5
+    assert asyncio.run(allocator.next_id()) == 6
+
+    adapter.table.delete_item(Key={'id': 5})
+    asyncio.run(allocator.resync())
+    assert _counter() >= 25
@@ -0,0 +1,116 @@
+"""
+JWKSManager against the local JWKS stand-in (scripts/jwks_server.py)
+"""
+import asyncio
+import time
+
+import pytest
+from jose import jwt
+
+from jwks_server import JWKSStandIn
+from services.auth import JWKSManager
+
+
+@pytest.fixture
+def server():
+    with JWKSStandIn(domain='tests.example.com', audience='tests') as server:
+        yield server
+
+
+def _manager(server, **overrides):
+    options = dict(ttl=3600, timeout=1, min_refresh_interval=0)
+    options.update(overrides)
+    return JWKSManager(server.url, **options)
+
+
+def _kid(token):
+    return jwt.get_unverified_header(token)['kid']
+
+
+def test_rotated_key_is_fetched_on_kid_miss(server):
+    manager = _manager(server)
+    before = server.issue_token()
+    server.rotate()
+    after = server.issue_token()
+
+    async def run():
+        old_key = await manager.get_key(_kid(before))
+        new_key = await manager.get_key(_kid(after))
+        return old_key, new_key
+
+    # Both keys are published after one rotation, so the first fetch covers both
+    old_key, new_key = asyncio.run(run())
+    assert old_key is not None and new_key is not None
+    assert server.requests == 1
+
+    server.rotate()
+    newest = server.issue_token()
+    key = asyncio.run(manager.get_key(_kid(newest)))
+    assert key is not None
+    assert server.requests == 2
+    claims = jwt.decode(newest, key.to_dict(), algorithms=['RS256'], audience='tests')
+    assert claims['sub'] == 'auth0|local-user'
+
+
+def test_kid_misses_refetch_at_most_once_per_interval(server):
+    manager = _manager(server, min_refresh_interval=60)
+
+    async def run():
+        await manager.get_key(_kid(server.issue_token()))
+        return [await manager.get_key('unknown-kid') for _ in range(5)]
+
+    assert asyncio.run(run()) == [None] * 5
+    # Initial fetch plus a single refetch for the first miss
+    assert server.requests == 2
+
+    # A real rotation inside the interval waits for it to pass
+    server.rotate()
+    rotated = _kid(server.issue_token())
+    assert asyncio.run(manager.get_key(rotated)) is None
+    assert server.requests == 2
+
+    manager._last_miss_refresh = time.monotonic() - 61
+    assert asyncio.run(manager.get_key(rotated)) is not None
+    assert server.requests == 3
+
+
+def test_slow_jwks_times_out_and_keeps_cached_keys(server):
+    manager = _manager(server, timeout=0.2)
+    kid = _kid(server.issue_token())
+    cached = asyncio.run(manager.get_key(kid))
+    assert cached is not None
+
+    server.delay = 1.0
+
+    async def run():
+        # Expired keys: served as-is while the background refresh times out
+        manager.fetched_at -= manager.ttl + 1
+        key = await manager.get_key(kid)
+        await manager._refreshing
+        started = time.monotonic()
+        missing = await manager.get_key('unknown-kid')
+        return key, missing, time.monotonic() - started
+
+    key, missing, elapsed = asyncio.run(run())
+    assert key is cached
+    assert missing is None
+    assert elapsed < 0.9
+    assert manager.keys.get(kid) is cached
+
+
+def test_unavailable_jwks_keeps_cached_keys(server):
+    manager = _manager(server)
+    kid = _kid(server.issue_token())
+    assert asyncio.run(manager.get_key(kid)) is not None
+
+    server.failing = True
+    server.rotate()
+    assert asyncio.run(manager.get_key(_kid(server.issue_token()))) is None
+    assert asyncio.run(manager.get_key(kid)) is not None
+
+
+def test_unavailable_jwks_without_cached_keys_rejects(server):
+    server.failing = True
+    manager = _manager(server)
+    assert asyncio.run(manager.get_key(_kid(server.issue_token()))) is None
+    assert manager.keys == {}
@@ -0,0 +1,54 @@
+"""
+Precompiled payloads follow content published to the meta table, without a redeploy
+"""
+import asyncio
+import json
+
+import pytest
+
+from api.precompiled import PayloadFile
+from db.content import put_content
+
+
+def _build(data, updated_at):
+    return {'status': {'name': data['name'], 'lastUpdated': updated_at}}
+
+
+@pytest.fixture
+def payloads(aws, monkeypatch, tmp_path):
+    monkeypatch.setenv('META_TABLE', 'tests-meta')
+    aws('tests-meta', 'pk')
+    path = tmp_path / 'content.json'
+    path.write_text(json.dumps({'name': 'packaged'}))
+    payloads = PayloadFile(str(path), _build, check_seconds=30, shared='tests')
+    payloads.load()
+    return payloads
+
+
+def _status(payloads):
+    return json.loads(asyncio.run(payloads.get('status')).body)
+
+
+def test_packaged_file_until_content_is_published(payloads):
+    assert _status(payloads)['name'] == 'packaged'
+    assert payloads.revision is None
+
+
+def test_published_revisions_replace_the_payloads(payloads):
+    asyncio.run(put_content('tests', {'name': 'first'}))
+    first = asyncio.run(payloads.get('status'))
+    assert json.loads(first.body)['name'] == 'first'
+
+    # Within the interval the published revision isn't polled again
+    asyncio.run(put_content('tests', {'name': 'second'}))
+    assert _status(payloads)['name'] == 'first'
+
+    payloads.checked_at -= 31
+    second = asyncio.run(payloads.get('status'))
+    assert json.loads(second.body)['name'] == 'second'
+    assert second.etag != first.etag
+
+
+def test_unusable_content_keeps_previous_payloads(payloads):
+    asyncio.run(put_content('tests', {'title': 'no name'}))
+    assert _status(payloads)['name'] == 'packaged'
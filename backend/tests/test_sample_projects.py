@@ -0,0 +1,51 @@
+"""
+The sample project stats aggregate is never left holding only deltas
+"""
+import asyncio
+
+import pytest
+
+from db.adapters.sample_projects import SampleProjectAdapter
+from db.aggregates import get_aggregate
+
+
+@pytest.fixture
+def adapter(aws, monkeypatch):
+    monkeypatch.setenv('META_TABLE', 'tests-meta')
+    monkeypatch.setenv('SAMPLE_PROJECTS_TABLE', 'tests-sample-projects')
+    aws('tests-meta', 'pk')
+    aws('tests-sample-projects', 'id')
+    return SampleProjectAdapter()
+
+
+def _project(project_id, method='EMAIL', size_mb=10):
+    return {'id': project_id, 'delivery_method': method, 'size_mb': size_mb, 'document_counts': {'pdf': 2}}
+
+
+def test_first_write_builds_aggregate_from_table(adapter):
+    # Written behind the adapter before the aggregate existed
+    adapter.table.put_item(Item=_project(1, 'PORTAL', 5))
+
+    async def run():
+        await adapter.create(_project(2))
+        return await adapter.get_stats()
+
+    stats = asyncio.run(run())
+    assert stats['total_projects'] == 2
+    assert stats['total_documents'] == 4
+    assert stats['total_size_mb'] == 15
+    assert stats['delivery_methods'] == {'EMAIL': 1, 'PORTAL': 1}
+
+
+def test_deltas_apply_once_aggregate_is_built(adapter):
+    async def run():
+        await adapter.create(_project(1))
+        await adapter.update(1, {'delivery_method': 'PORTAL', 'size_mb': 12})
+        await adapter.create(_project(2))
+        return await get_aggregate('sample-projects', consistent=True), await adapter.get_stats()
+
+    stored, stats = asyncio.run(run())
+    assert stored is not None
+    assert stats['total_projects'] == 2
+    assert stats['total_size_mb'] == 22
+    assert stats['delivery_methods'] == {'EMAIL': 1, 'PORTAL': 1}
@@ -0,0 +1,29 @@
+"""
+Cold start stays within budget and routes are served without the lifespan
+"""
+import os
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+
+import main
+from conftest import BACKEND
+
+
+def test_cold_start_within_budget():
+    budget = os.environ.get('STARTUP_BUDGET_MS', '1000')
+    result = subprocess.run(
+        [sys.executable, os.path.join(BACKEND, 'scripts', 'profile_startup.py'), '--budget-ms', budget],
+        cwd=BACKEND, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    # boto3/botocore/jose/httpx must stay behind first use
+    assert 'Warning:' not in result.stdout, result.stdout
+
+
+def test_routes_mounted_without_lifespan():
+    # No `with`: startup never runs, as for OpenAPI export or a bare TestClient
+    client = TestClient(main.app)
+    assert client.get('/api/health').status_code == 200
+    assert '/api/deliverables/' in main.app.openapi()['paths']
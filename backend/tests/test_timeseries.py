@@ -0,0 +1,53 @@
+"""
+Metric time series rollups and the raw-sample fallback, against moto's DynamoDB
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from db.timeseries import get_timeseries
+
+TABLE = 'tests-metric-samples'
+
+
+@pytest.fixture
+def store(aws, monkeypatch):
+    monkeypatch.setenv('METRIC_SAMPLES_TABLE', TABLE)
+    aws(TABLE, 'pk', 'sk')
+    return get_timeseries('METRIC_SAMPLES_TABLE', TABLE)
+
+
+def _record(store, values, at):
+    async def run():
+        for i, value in enumerate(values):
+            await store.append('m', value, at + timedelta(seconds=i))
+    asyncio.run(run())
+
+
+def _summary(points):
+    return [(p['count'], p['avg'], p['min'], p['max'], p['first'], p['last']) for p in points]
+
+
+def test_rollups_written_on_append(store):
+    at = datetime(2026, 3, 1, 10, 15)
+    _record(store, [72.5, 73.25, 71], at)
+
+    hours = asyncio.run(store.read('m', at - timedelta(days=2), at + timedelta(hours=1), 'hour'))
+    days = asyncio.run(store.read('m', at - timedelta(days=30), at + timedelta(days=1), 'day'))
+    assert _summary(hours) == _summary(days) == [(3, 72.25, 71, 73.25, 72.5, 71)]
+    assert hours[0]['timestamp'] == '2026-03-01T10:00:00'
+    assert isinstance(hours[0]['avg'], float)
+
+
+def test_missing_rollups_fall_back_to_raw_samples(store):
+    at = datetime(2026, 3, 1, 10, 15)
+    _record(store, [72.5, 73.25], at)
+    for item in store.table.scan()['Items']:
+        if '#raw#' not in item['pk']:
+            store.table.delete_item(Key={'pk': item['pk'], 'sk': item['sk']})
+
+    hours = asyncio.run(store.read('m', at - timedelta(days=2), at + timedelta(hours=1), 'hour'))
+    days = asyncio.run(store.read('m', at - timedelta(days=30), at + timedelta(hours=1), 'day'))
+    assert _summary(hours) == _summary(days) == [(2, 72.875, 72.5, 73.25, 72.5, 73.25)]
+    assert days[0]['timestamp'] == '2026-03-01T00:00:00'